@@ -0,0 +1,34 @@
+import { NextResponse } from "next/server";
+
+export const runtime = "nodejs";
+
+function getServerBaseUrl() {
+  // Should point to the FastAPI base, including /api
+  // Example: http://localhost:8000/api
+  return process.env.RAG_HEALTHBOT_SERVER_URL ?? "http://localhost:8000/api";
+}
+
+export async function POST(req: Request) {
+  try {
+    const { reportIds } = await req.json();
+    if (!Array.isArray(reportIds) || reportIds.length === 0) {
+      return NextResponse.json({ error: "reportIds required" }, { status: 400 });
+    }
+
+    const baseUrl = getServerBaseUrl();
+    const upstream = await fetch(`${baseUrl}/conversations/from-reports`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ reportIds: reportIds.map(String) }),
+    });
+
+    const text = await upstream.text();
+    return new NextResponse(text, {
+      status: upstream.status,
+      headers: { "Content-Type": "application/json" },
+    });
+  } catch (e) {
+    console.error(e);
+    return NextResponse.json({ error: "server" }, { status: 500 });
+  }
+}
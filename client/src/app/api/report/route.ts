@@ -10,7 +10,13 @@ type UploadItem = {
 };
 
 type UploadResponse = {
-    jobs: Array<{ job_id: string; file_name: string }>;
+    jobs: Array<{
+        job_id: string | null;
+        file_name: string;
+        status?: string; // "queued" | "coalesced" | "duplicate"
+        report_id?: number | null;
+        result?: OrchestratorResult | null;
+    }>;
 };
 
 type OrchestratorMedication = {
@@ -117,6 +123,166 @@ async function pollJob(
     }
 }
 
+// Relays the job's summary tokens from the FastAPI SSE endpoint to *emit*.
+// Best-effort: the final summary always comes from the job result.
+async function relaySummaryTokens(
+    baseUrl: string,
+    jobId: string,
+    emit: (event: object) => void,
+    signal: AbortSignal
+) {
+    try {
+        const res = await fetch(`${baseUrl}/report/jobs/${jobId}/summary/stream`, {
+            signal,
+        });
+        if (!res.ok || !res.body) return;
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            buffer = buffer.replace(/\r\n/g, "\n");
+
+            let sepIndex: number;
+            while ((sepIndex = buffer.indexOf("\n\n")) !== -1) {
+                const rawEvent = buffer.slice(0, sepIndex);
+                buffer = buffer.slice(sepIndex + 2);
+                const dataLine = rawEvent.split("\n").find((l) => l.startsWith("data: "));
+                if (!dataLine) continue;
+                let evt: { type?: string; token?: string };
+                try {
+                    evt = JSON.parse(dataLine.slice("data: ".length));
+                } catch {
+                    continue;
+                }
+                if (evt.type === "token" && typeof evt.token === "string") {
+                    emit({ type: "token", job_id: jobId, token: evt.token });
+                } else if (evt.type === "end" || evt.type === "error") {
+                    return;
+                }
+            }
+        }
+    } catch (e) {
+        if (!signal.aborted) console.warn(`Summary stream for job ${jobId} failed:`, e);
+    }
+}
+
+function toReportSummary(file_name: string, status: JobStatusResponse): ReportSummary {
+    const orchestratorResult = status.result;
+    const output = orchestratorResult?.output;
+    const reportId = output?.report_id;
+    const summary = output?.summary ?? "";
+    const medsRaw = output?.medications ?? [];
+    const diseasesRaw = output?.diseases ?? [];
+    const proceduresRaw = output?.procedures ?? [];
+
+    return {
+        reportId: reportId != null ? String(reportId) : undefined,
+        filename: file_name,
+        summary,
+        medications: medsRaw.map((m: any) => ({
+            id: m.id ?? null,
+            link_id: m.link_id ?? null,
+            name: String(m.name ?? m.text ?? ""),
+            purpose: String(m.purpose ?? ""),
+            cui: m.cui ?? null,
+            confidence: m.confidence ?? null,
+            review_status: m.review_status ?? "pending_review",
+            is_drug_class: m.is_drug_class ?? false,
+        })),
+        diseases: diseasesRaw.map((d: any) => ({
+            id: d.id ?? null,
+            link_id: d.link_id ?? null,
+            name: String(d.name ?? ""),
+            cui: d.cui ?? null,
+            icd10_code: d.icd10_code ?? null,
+            severity: d.severity ?? null,
+            status: d.status ?? null,
+            confidence: d.confidence ?? null,
+            review_status: d.review_status ?? "pending_review",
+        })),
+        procedures: proceduresRaw.map((p: any) => ({
+            id: p.id ?? null,
+            link_id: p.link_id ?? null,
+            name: String(p.name ?? ""),
+            cui: p.cui ?? null,
+            cpt_code: p.cpt_code ?? null,
+            date_performed: p.date_performed ?? null,
+            body_site: p.body_site ?? null,
+            outcome: p.outcome ?? null,
+            confidence: p.confidence ?? null,
+            review_status: p.review_status ?? "pending_review",
+        })),
+    };
+}
+
+async function collectSummaries(
+    baseUrl: string,
+    jobs: UploadResponse["jobs"]
+): Promise<ReportSummary[]> {
+    return Promise.all(
+        jobs.map(async (j) => {
+            // Duplicates of an existing report come back without a job.
+            const status: JobStatusResponse = j.job_id
+                ? await pollJob(baseUrl, j.job_id)
+                : { job_id: "", status: "finished", result: j.result ?? undefined };
+            return toReportSummary(j.file_name, status);
+        })
+    );
+}
+
+// `POST /api/report?stream=1` answers with server-sent events instead of
+// JSON: `jobs` (file name → job id) as soon as the upload is queued, `token`
+// events of each summary while it is generated, then `summaries` (or `error`).
+function streamSummaries(baseUrl: string, jobs: UploadResponse["jobs"]) {
+    const encoder = new TextEncoder();
+    const relays = new AbortController();
+    let closed = false;
+
+    const body = new ReadableStream({
+        async start(controller) {
+            const emit = (event: object) => {
+                if (closed) return;
+                controller.enqueue(encoder.encode(`data: ${JSON.stringify(event)}\n\n`));
+            };
+
+            emit({
+                type: "jobs",
+                jobs: jobs.map((j) => ({ file_name: j.file_name, job_id: j.job_id })),
+            });
+            for (const j of jobs) {
+                if (j.job_id) relaySummaryTokens(baseUrl, j.job_id, emit, relays.signal);
+            }
+            try {
+                emit({ type: "summaries", summaries: await collectSummaries(baseUrl, jobs) });
+            } catch (err) {
+                const message = err instanceof Error ? err.message : "Failed to summarize reports";
+                console.error("/api/report failed:", err);
+                emit({ type: "error", error: message });
+            } finally {
+                closed = true;
+                relays.abort();
+                controller.close();
+            }
+        },
+        cancel() {
+            closed = true;
+            relays.abort();
+        },
+    });
+
+    return new Response(body, {
+        headers: {
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            Connection: "keep-alive",
+        },
+    });
+}
+
 
 export async function POST(req: Request) {
     try {
@@ -159,62 +325,11 @@ export async function POST(req: Request) {
         const uploadData = (await uploadRes.json()) as UploadResponse;
         const jobs = uploadData.jobs ?? [];
 
-        const jobResults = await Promise.all(
-            jobs.map(async (j) => {
-                const status = await pollJob(baseUrl, j.job_id);
-                return { file_name: j.file_name, job_id: j.job_id, status };
-            })
-        );
-
-        const summaries: ReportSummary[] = jobResults.map(({ file_name, status }) => {
-            const orchestratorResult = status.result;
-            const output = orchestratorResult?.output;
-            const reportId = output?.report_id;
-            const summary = output?.summary ?? "";
-            const medsRaw = output?.medications ?? [];
-            const diseasesRaw = output?.diseases ?? [];
-            const proceduresRaw = output?.procedures ?? [];
-
-            return {
-                reportId: reportId != null ? String(reportId) : undefined,
-                filename: file_name,
-                summary,
-                medications: medsRaw.map((m: any) => ({
-                    id: m.id ?? null,
-                    link_id: m.link_id ?? null,
-                    name: String(m.name ?? m.text ?? ""),
-                    purpose: String(m.purpose ?? ""),
-                    cui: m.cui ?? null,
-                    confidence: m.confidence ?? null,
-                    review_status: m.review_status ?? "pending_review",
-                    is_drug_class: m.is_drug_class ?? false,
-                })),
-                diseases: diseasesRaw.map((d: any) => ({
-                    id: d.id ?? null,
-                    link_id: d.link_id ?? null,
-                    name: String(d.name ?? ""),
-                    cui: d.cui ?? null,
-                    icd10_code: d.icd10_code ?? null,
-                    severity: d.severity ?? null,
-                    status: d.status ?? null,
-                    confidence: d.confidence ?? null,
-                    review_status: d.review_status ?? "pending_review",
-                })),
-                procedures: proceduresRaw.map((p: any) => ({
-                    id: p.id ?? null,
-                    link_id: p.link_id ?? null,
-                    name: String(p.name ?? ""),
-                    cui: p.cui ?? null,
-                    cpt_code: p.cpt_code ?? null,
-                    date_performed: p.date_performed ?? null,
-                    body_site: p.body_site ?? null,
-                    outcome: p.outcome ?? null,
-                    confidence: p.confidence ?? null,
-                    review_status: p.review_status ?? "pending_review",
-                })),
-            };
-        });
+        if (new URL(req.url).searchParams.get("stream") === "1") {
+            return streamSummaries(baseUrl, jobs);
+        }
 
+        const summaries = await collectSummaries(baseUrl, jobs);
         return NextResponse.json({ summaries });
     } catch (err) {
         const message = err instanceof Error ? err.message : "Failed to summarize reports";
@@ -34,6 +34,8 @@ export default function Home() {
   const [currentChatId, setCurrentChatId] = useState<string>('');
   const [isSending, setIsSending] = useState(false);
   const [conversationLoading, setConversationLoading] = useState(false);
+  // The list endpoint only returns headers; messages are fetched per chat.
+  const [loadedChatIds, setLoadedChatIds] = useState<Set<string>>(new Set());
 
   const searchParams = useSearchParams();
 
@@ -55,18 +57,17 @@ export default function Home() {
         .map((chat) => {
           const id = getConversationId(chat);
           if (!id) return null;
-          return {
-            id,
-            title: chat.title,
-            messages: (chat.messages || []).map((msg) => ({
-              userContent: msg.userContent || '',
-              aiContent: msg.aiContent || '',
-            })),
-          };
+          return { id, title: chat.title, messages: [] };
         })
         .filter((c): c is Conversation => Boolean(c));
 
-      setConversations(formatted);
+      // Keep messages already loaded for chats that are still listed.
+      setConversations((prev) =>
+        formatted.map((c) => ({
+          ...c,
+          messages: prev.find((p) => p.id === c.id)?.messages ?? [],
+        }))
+      );
 
       const queryId = searchParams.get('id');
       if (queryId && formatted.some((c) => c.id === queryId)) {
@@ -84,6 +85,24 @@ export default function Home() {
     }
   }, [searchParams]);
 
+  const fetchMessages = useCallback(async (id: string) => {
+    try {
+      const res = await fetch(`/api/conversations/${id}`);
+      if (!res.ok) return;
+      const chat = (await res.json()) as ApiConversation;
+      const messages = (chat.messages || []).map((msg) => ({
+        userContent: msg.userContent || '',
+        aiContent: msg.aiContent || '',
+      }));
+      setConversations((prev) =>
+        prev.map((c) => (c.id === id ? { ...c, messages } : c))
+      );
+      setLoadedChatIds((prev) => new Set(prev).add(id));
+    } catch (err) {
+      console.error('Failed to fetch messages:', err);
+    }
+  }, []);
+
   const streamChat = async (conversationId: string, message: string) => {
     const res = await fetch('/api/chat', {
       method: 'POST',
@@ -153,6 +172,13 @@ export default function Home() {
     fetchChats();
   }, [fetchChats]);
 
+  // Load the selected conversation's history the first time it is opened
+  useEffect(() => {
+    if (currentChatId && !loadedChatIds.has(currentChatId)) {
+      fetchMessages(currentChatId);
+    }
+  }, [currentChatId, loadedChatIds, fetchMessages]);
+
   const currentChat: Message[] =
     conversations.find((c) => c.id === currentChatId)?.messages ?? [];
 
@@ -1,10 +1,18 @@
 'use client'
 import React, { useState } from "react";
-import axios from "axios";
 import { toast } from "react-toastify";
 import ReportModal from "@/modals/ReportModal";
 import { ReportSummary, UploadedFile } from "@/types/types";
 
+// Events of `POST /api/report?stream=1`.
+type UploadStreamEvent =
+  | { type: "jobs"; jobs: { file_name: string; job_id: string | null }[] }
+  | { type: "token"; job_id: string; token: string }
+  | { type: "summaries"; summaries: ReportSummary[] }
+  | { type: "error"; error: string };
+
+type LiveSummary = { jobId: string | null; fileName: string; text: string };
+
 const UploadCloudIcon = () => (
   <svg xmlns="http://www.w3.org/2000/svg" className="h-8 w-8" fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>
     <path strokeLinecap="round" strokeLinejoin="round" d="M7 16a4 4 0 01-.885 2.162M18.885 18.162A4 4 0 0017 16m-7-5l3-3m0 0l3 3m-3-3v12" />
@@ -47,6 +55,7 @@ const LandingPage: React.FC = () => {
   const [isUploading, setIsUploading] = useState(false);
   const [modalOpen, setModalOpen] = useState(false);
   const [reportSummaries, setReportSummaries] = useState<ReportSummary[]>([]);
+  const [liveSummaries, setLiveSummaries] = useState<LiveSummary[]>([]);
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const selected = e.target.files;
     if (!selected) return;
@@ -87,30 +96,74 @@ const LandingPage: React.FC = () => {
     if (files.length === 0) return;
 
     setIsUploading(true);
+    setLiveSummaries([]);
 
     try {
       const formData = new FormData();
       files.forEach((item) => formData.append("file", item.file));
 
-      const response = await axios.post("api/report", formData);
+      // Streamed, so each summary shows up token by token while the reports
+      // are still being processed.
+      const res = await fetch("api/report?stream=1", { method: "POST", body: formData });
+      if (!res.ok || !res.body) {
+        const data = (await res.json().catch(() => null)) as { error?: string } | null;
+        throw new Error(data?.error || `Upload failed (${res.status})`);
+      }
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let summaries: ReportSummary[] | null = null;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        buffer = buffer.replace(/\r\n/g, "\n");
+
+        let sepIndex: number;
+        while ((sepIndex = buffer.indexOf("\n\n")) !== -1) {
+          const rawEvent = buffer.slice(0, sepIndex);
+          buffer = buffer.slice(sepIndex + 2);
+
+          const dataLine = rawEvent.split("\n").find((l) => l.startsWith("data: "));
+          if (!dataLine) continue;
+
+          let evt: UploadStreamEvent;
+          try {
+            evt = JSON.parse(dataLine.slice("data: ".length));
+          } catch {
+            continue;
+          }
+
+          if (evt.type === "jobs") {
+            setLiveSummaries(
+              evt.jobs.map((j) => ({ jobId: j.job_id, fileName: j.file_name, text: "" }))
+            );
+          } else if (evt.type === "token") {
+            const { job_id, token } = evt;
+            setLiveSummaries((prev) =>
+              prev.map((s) => (s.jobId === job_id ? { ...s, text: s.text + token } : s))
+            );
+          } else if (evt.type === "summaries") {
+            summaries = evt.summaries;
+          } else if (evt.type === "error") {
+            throw new Error(evt.error);
+          }
+        }
+      }
+      if (!summaries) throw new Error("Upload failed.");
 
-      console.log("Uploaded:", response.data);
-      setReportSummaries(response.data.summaries || []);
+      console.log("Uploaded:", summaries);
+      setReportSummaries(summaries);
       setModalOpen(true);
       setFiles([]);
     } catch (err) {
       console.error(err);
-      if (axios.isAxiosError(err)) {
-        const message =
-          (err.response?.data as { error?: string } | undefined)?.error ||
-          err.message ||
-          "Upload failed.";
-        toast.error(message);
-      } else {
-        toast.error("Upload failed.");
-      }
+      toast.error(err instanceof Error && err.message ? err.message : "Upload failed.");
     } finally {
       setIsUploading(false);
+      setLiveSummaries([]);
     }
   };
 
@@ -208,6 +261,22 @@ const LandingPage: React.FC = () => {
           >
             {isUploading ? "Generating Report..." : `Generate ${files.length} Reports`}
           </button>
+
+          {isUploading && liveSummaries.some((s) => s.text) && (
+            <div className="mt-6 overflow-y-auto max-h-60 space-y-3">
+              {liveSummaries
+                .filter((s) => s.text)
+                .map((s) => (
+                  <div
+                    key={s.jobId ?? s.fileName}
+                    className="bg-white/5 border border-white/10 p-3 rounded-lg"
+                  >
+                    <p className="truncate text-xs font-semibold text-white/60 mb-1">{s.fileName}</p>
+                    <p className="text-sm text-white/80 whitespace-pre-wrap">{s.text}</p>
+                  </div>
+                ))}
+            </div>
+          )}
         </div>
         <ReportModal open={modalOpen} onClose={() => setModalOpen(false)} contents={reportSummaries} />
       </div>
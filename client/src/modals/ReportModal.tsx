@@ -358,6 +358,9 @@ const ReportModal: React.FC<ModalProps> = ({ open, onClose, contents }) => {
 
   const total = contents.length;
   const current = contents[currentPage] ?? null;
+  const allReportIds = Array.from(
+    new Set(contents.map((c) => c.reportId).filter((id): id is string => !!id))
+  );
 
   // ── Fetch per-report review queue whenever the visible report changes ──
   useEffect(() => {
@@ -1040,6 +1043,32 @@ const ReportModal: React.FC<ModalProps> = ({ open, onClose, contents }) => {
                 </>
               )}
             </button>
+            {allReportIds.length > 1 && (
+              <button
+                onClick={async () => {
+                  setIsCreating(true);
+                  try {
+                    const res = await fetch("/api/conversations/from-reports", {
+                      method: "POST",
+                      headers: { "Content-Type": "application/json" },
+                      body: JSON.stringify({ reportIds: allReportIds }),
+                    });
+                    if (!res.ok) throw new Error("Failed to create chat");
+                    const data = await res.json();
+                    onClose();
+                    router.push(`/chat?id=${data.id}`);
+                  } catch (e) {
+                    console.error(e);
+                  } finally {
+                    setIsCreating(false);
+                  }
+                }}
+                disabled={isCreating}
+                className="mt-3 w-full bg-white/10 text-white px-6 py-3 rounded-xl font-semibold shadow hover:bg-white/20 transition-all duration-300 flex items-center justify-center gap-3 disabled:opacity-50 disabled:cursor-not-allowed"
+              >
+                Chat About All {allReportIds.length} Reports
+              </button>
+            )}
           </div>
         </div>
       </div>
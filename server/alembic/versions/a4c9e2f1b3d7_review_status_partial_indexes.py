@@ -0,0 +1,35 @@
+"""Add partial indexes backing the review queue
+
+The review queue filters each entity table on ``review_status`` and orders by
+``confidence ASC NULLS FIRST``.  Only a small fraction of rows is ever
+``pending_review``, so a partial index per table keeps the queue query (and
+the pending counts on the stats endpoint) off a sequential scan while staying
+tiny.
+
+Revision ID: a4c9e2f1b3d7
+Revises: e7f3a2b1c8d9
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "a4c9e2f1b3d7"
+down_revision = "e7f3a2b1c8d9"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("disease", "procedure", "medication")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS ix_{table}_pending_review_confidence
+            ON {table} (confidence ASC NULLS FIRST)
+            WHERE review_status = 'pending_review'
+            """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_pending_review_confidence")
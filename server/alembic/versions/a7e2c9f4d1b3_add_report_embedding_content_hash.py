@@ -0,0 +1,55 @@
+"""Add per-chunk content hash to report_embedding
+
+Re-embedding a report only sends new or changed chunks to the embedding
+model, and identical chunk text in other reports (headers, footers,
+disclaimers) reuses the stored vector.  ``content_hash`` is
+``utilities.hashing.chunk_content_hash``: md5 of the UTF-8 bytes of
+``<embedding model> NUL <text>``.
+
+Existing rows do not record which model embedded them, so the backfill
+needs it passed explicitly:
+
+    alembic -x embed_model=mxbai-embed-large upgrade head
+
+Without it, existing rows keep ``content_hash`` NULL and each report is
+re-embedded in full once, the next time its embeddings are rebuilt.
+
+Revision ID: a7e2c9f4d1b3
+Revises: f3c7d1e8a2b5
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = "a7e2c9f4d1b3"
+down_revision = "f3c7d1e8a2b5"
+branch_labels = None
+depends_on = None
+
+# text cannot hold NUL, so the bytes are hashed; matches chunk_content_hash.
+_BACKFILL_CONTENT_HASH = sa.text("""
+    UPDATE report_embedding
+    SET content_hash = md5(
+        convert_to(:model, 'UTF8') || decode('00', 'hex') || convert_to(text, 'UTF8')
+    )
+    WHERE content_hash IS NULL
+    """)
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE report_embedding ADD COLUMN IF NOT EXISTS content_hash varchar(32)"
+    )
+    embed_model = context.get_x_argument(as_dictionary=True).get("embed_model")
+    if embed_model:
+        op.execute(_BACKFILL_CONTENT_HASH.bindparams(model=embed_model))
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_report_embedding_content_hash
+        ON report_embedding (content_hash)
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_report_embedding_content_hash")
+    op.execute("ALTER TABLE report_embedding DROP COLUMN IF EXISTS content_hash")
@@ -0,0 +1,74 @@
+"""Keep a single HNSW embedding index per table (VECTOR_STORAGE=float32)
+
+``report_embedding`` and ``code_embedding`` keep their full-precision
+columns; only the index form can change (see ``utilities/vector_storage.py``):
+
+- ``float32``: the existing ``vector_cosine_ops`` index.
+- ``halfvec``: ``(embedding::halfvec(dim)) halfvec_cosine_ops`` — about half
+  the size of the float index.
+- ``binary``: ``(binary_quantize(embedding)::bit(dim)) bit_hamming_ops`` —
+  about 1/32 of the size; results are re-ranked on the float vectors.
+
+Only one form is kept, so index size and write cost do not grow.  The mode
+and dimension are pinned here, so the revision yields the same schema
+everywhere: ``float32``, matching the ``VECTOR_STORAGE`` default.  Any
+compact index is dropped.  To switch modes, add a revision that copies this
+one with another ``MODE`` (the compact modes need pgvector >= 0.7) and set
+``VECTOR_STORAGE`` to match.
+
+Revision ID: b4d8e1f6a9c2
+Revises: a7e2c9f4d1b3
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "b4d8e1f6a9c2"
+down_revision = "a7e2c9f4d1b3"
+branch_labels = None
+depends_on = None
+
+MODE = "float32"
+DIM = 1024
+
+# HNSW index name of each mode, per embedding table.
+INDEXES = {
+    "report_embedding": {
+        "float32": "idx_embedding_hnsw",
+        "halfvec": "idx_embedding_hnsw_halfvec",
+        "binary": "idx_embedding_hnsw_bit",
+    },
+    "code_embedding": {
+        "float32": "idx_code_embedding_hnsw",
+        "halfvec": "idx_code_embedding_hnsw_halfvec",
+        "binary": "idx_code_embedding_hnsw_bit",
+    },
+}
+
+EXPRESSIONS = {
+    "float32": "embedding vector_cosine_ops",
+    "halfvec": f"(embedding::halfvec({DIM})) halfvec_cosine_ops",
+    "binary": f"(binary_quantize(embedding)::bit({DIM})) bit_hamming_ops",
+}
+
+
+def _keep_only(mode: str) -> None:
+    # Build the kept index before dropping the others, so searches are never
+    # left without one.
+    for table, indexes in INDEXES.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {indexes[mode]} ON {table} "
+            f"USING hnsw ({EXPRESSIONS[mode]})"
+        )
+        for other, name in indexes.items():
+            if other != mode:
+                op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    _keep_only(MODE)
+
+
+def downgrade() -> None:
+    # The previous revision has only the float32 indexes.
+    _keep_only("float32")
@@ -0,0 +1,34 @@
+"""Add lower(name) indexes for case-insensitive entity lookups
+
+``get_<entity>_by_name`` filters on ``lower(name) = :name`` and
+``find_medications_name_startswith`` on ``lower(name) LIKE 'x%'``; neither can
+use the plain unique index on ``name``.  A ``text_pattern_ops`` btree on
+``lower(name)`` serves both the equality and the left-anchored LIKE lookups
+independently of the database collation.
+
+Revision ID: b8d3f6a2c4e9
+Revises: a4c9e2f1b3d7
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "b8d3f6a2c4e9"
+down_revision = "a4c9e2f1b3d7"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("medication", "disease", "procedure")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS ix_{table}_lower_name
+            ON {table} (lower(name) text_pattern_ops)
+            """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_lower_name")
@@ -0,0 +1,82 @@
+"""Move conversation messages into an append-only conversation_message table
+
+Appending to the ``conversation.messages`` JSONB array rewrote (and
+re-TOASTed) the whole history on every chat turn.  Each exchange is now its
+own row; existing arrays are copied over in order and the column is dropped.
+
+Revision ID: c2e7a9d4f1b6
+Revises: b8d3f6a2c4e9
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "c2e7a9d4f1b6"
+down_revision = "b8d3f6a2c4e9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_message",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("conversation_id", sa.Integer(), nullable=False),
+        sa.Column("user_content", sa.Text(), nullable=True),
+        sa.Column("ai_content", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["conversation_id"], ["conversation.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_conversation_message_conversation_id_id",
+        "conversation_message",
+        ["conversation_id", "id"],
+    )
+
+    op.execute("""
+        INSERT INTO conversation_message
+            (conversation_id, user_content, ai_content, created_at)
+        SELECT c.id, m.value ->> 'userContent', m.value ->> 'aiContent', c.updated_at
+        FROM conversation c
+        CROSS JOIN LATERAL jsonb_array_elements(c.messages)
+            WITH ORDINALITY AS m(value, ord)
+        ORDER BY c.id, m.ord
+        """)
+    op.drop_column("conversation", "messages")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "conversation",
+        sa.Column(
+            "messages",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+    )
+    op.execute("""
+        UPDATE conversation c
+        SET messages = agg.messages
+        FROM (
+            SELECT conversation_id,
+                   jsonb_agg(
+                       jsonb_build_object(
+                           'userContent', user_content, 'aiContent', ai_content
+                       )
+                       ORDER BY id
+                   ) AS messages
+            FROM conversation_message
+            GROUP BY conversation_id
+        ) agg
+        WHERE agg.conversation_id = c.id
+        """)
+    op.drop_index(
+        "ix_conversation_message_conversation_id_id", table_name="conversation_message"
+    )
+    op.drop_table("conversation_message")
@@ -0,0 +1,35 @@
+"""Add MinHash fingerprints to report for near-duplicate detection
+
+``minhash_signature`` holds the MinHash signature of the extracted text and
+``minhash_bands`` its LSH band hashes (see ``utilities/minhash.py``).  The
+GIN index serves the ``minhash_bands && :bands`` candidate lookup.
+
+Existing reports get fingerprints from ``uv run backfill-fingerprints``; the
+signature cannot be computed in SQL.
+
+Revision ID: c6e1a9d3f7b5
+Revises: b4d8e1f6a9c2
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "c6e1a9d3f7b5"
+down_revision = "b4d8e1f6a9c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE report ADD COLUMN IF NOT EXISTS minhash_signature bigint[]")
+    op.execute("ALTER TABLE report ADD COLUMN IF NOT EXISTS minhash_bands bigint[]")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_report_minhash_bands
+        ON report USING gin (minhash_bands)
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_report_minhash_bands")
+    op.execute("ALTER TABLE report DROP COLUMN IF EXISTS minhash_bands")
+    op.execute("ALTER TABLE report DROP COLUMN IF EXISTS minhash_signature")
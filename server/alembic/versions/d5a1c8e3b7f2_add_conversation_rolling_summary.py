@@ -0,0 +1,32 @@
+"""Add rolling summary columns to conversation
+
+Chat prompts replay only the most recent turns verbatim; everything older is
+folded into ``conversation.summary``.  ``summary_through_message_id`` records
+the last ``conversation_message`` covered so the summary can be extended
+incrementally.
+
+Revision ID: d5a1c8e3b7f2
+Revises: c2e7a9d4f1b6
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d5a1c8e3b7f2"
+down_revision = "c2e7a9d4f1b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("conversation", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "conversation",
+        sa.Column("summary_through_message_id", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("conversation", "summary_through_message_id")
+    op.drop_column("conversation", "summary")
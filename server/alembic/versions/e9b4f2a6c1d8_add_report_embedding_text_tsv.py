@@ -0,0 +1,35 @@
+"""Add full-text search column to report_embedding
+
+Hybrid chat retrieval fuses the cosine ranking with a Postgres full-text
+ranking so exact lab names, drug names and numeric values are not missed.
+``text_tsv`` is a stored generated column, so existing rows are populated by
+the ALTER and new rows need no application changes.
+
+Revision ID: e9b4f2a6c1d8
+Revises: d5a1c8e3b7f2
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "e9b4f2a6c1d8"
+down_revision = "d5a1c8e3b7f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE report_embedding
+        ADD COLUMN IF NOT EXISTS text_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', text)) STORED
+        """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_report_embedding_text_tsv
+        ON report_embedding USING gin (text_tsv)
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_report_embedding_text_tsv")
+    op.execute("ALTER TABLE report_embedding DROP COLUMN IF EXISTS text_tsv")
@@ -0,0 +1,49 @@
+"""Add chat_response_cache table
+
+Semantic cache of chat answers per report, keyed by the normalised question
+and its embedding.  Lookups are always scoped to one report, so a btree on
+(report_id, question_norm) is enough; the similarity ordering runs over that
+report's handful of cached questions.
+
+Revision ID: f3c7d1e8a2b5
+Revises: e9b4f2a6c1d8
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+revision = "f3c7d1e8a2b5"
+down_revision = "e9b4f2a6c1d8"
+branch_labels = None
+depends_on = None
+
+# Same dimension as report_embedding.embedding (see b7a2d9b9c0f1).
+EMBEDDING_DIM = 1024
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_response_cache",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("report_id", sa.Integer(), nullable=False),
+        sa.Column("question_norm", sa.Text(), nullable=False),
+        sa.Column("embedding", Vector(EMBEDDING_DIM), nullable=False),
+        sa.Column("answer", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["report_id"], ["report.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_chat_response_cache_report_question",
+        "chat_response_cache",
+        ["report_id", "question_norm"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_chat_response_cache_report_question", table_name="chat_response_cache"
+    )
+    op.drop_table("chat_response_cache")
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import DateTime, ForeignKey, Index, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..config import settings
+from ..db import Base
+
+
+class ChatResponseCache(Base):
+    """Answer previously generated for the opening question of a chat about
+    one report (later turns depend on the conversation and are not cached).
+
+    Looked up by exact normalised question first, then by question-embedding
+    similarity.  Rows are dropped when the report's embeddings are rebuilt.
+    """
+
+    __tablename__ = "chat_response_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    report_id: Mapped[int] = mapped_column(
+        ForeignKey("report.id", ondelete="CASCADE"), nullable=False
+    )
+
+    question_norm: Mapped[str] = mapped_column(Text, nullable=False)
+    embedding: Mapped[Vector] = mapped_column(
+        Vector(settings.vector_dimension), nullable=False
+    )
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now
+    )
+
+    __table_args__ = (
+        Index("ix_chat_response_cache_report_question", "report_id", "question_norm"),
+    )
@@ -41,10 +41,18 @@ class CodeEmbedding(Base):
     __table_args__ = (
         Index("uq_code_system_code", "code_system", "code", unique=True),
         Index("idx_code_system", "code_system"),
-        Index(
-            "idx_code_embedding_hnsw",
-            "embedding",
-            postgresql_using="hnsw",
-            postgresql_ops={"embedding": "vector_cosine_ops"},
+        # The halfvec / binary HNSW expression indexes are managed by
+        # utilities/vector_storage.py; only the float32 form is declared here.
+        *(
+            [
+                Index(
+                    "idx_code_embedding_hnsw",
+                    "embedding",
+                    postgresql_using="hnsw",
+                    postgresql_ops={"embedding": "vector_cosine_ops"},
+                )
+            ]
+            if settings.vector_storage == "float32"
+            else []
         ),
     )
@@ -3,11 +3,12 @@ from __future__ import annotations
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Integer, Text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db import Base
+from .ConversationMessage import ConversationMessage
 
 
 class IMessage(BaseModel):
@@ -32,9 +33,22 @@ class Conversation(Base):
 
     title: Mapped[str] = mapped_column(nullable=False)
 
-    # Store the message list as JSON to match the existing client shape.
-    # Each element is typically { userContent?: string, aiContent?: string }.
-    messages: Mapped[list[dict]] = mapped_column(JSONB, nullable=False, default=list)
+    # One row per exchange in ``conversation_message``.  ``lazy="raise"`` keeps
+    # header queries from pulling whole histories by accident; read messages
+    # through ``list_conversation_messages`` instead.
+    messages: Mapped[list[ConversationMessage]] = relationship(
+        order_by=ConversationMessage.id,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
+    # Rolling summary of every message up to and including
+    # ``summary_through_message_id``; newer turns are replayed verbatim.
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_through_message_id: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
 
     # Arbitrary per-conversation metadata (e.g. reportId, embeddingDim).
     metadata_: Mapped[dict] = mapped_column(
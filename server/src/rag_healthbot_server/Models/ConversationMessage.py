@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import DateTime, ForeignKey, Index, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db import Base
+
+
+class IConversationMessage(BaseModel):
+    conversation_id: int
+    user_content: str | None = None
+    ai_content: str | None = None
+
+
+class ConversationMessage(Base):
+    """One user/assistant exchange, appended as its own row.
+
+    Replaces the ``conversation.messages`` JSONB array so a new turn is a
+    single-row INSERT instead of rewriting the whole history.
+    """
+
+    __tablename__ = "conversation_message"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    conversation_id: Mapped[int] = mapped_column(
+        ForeignKey("conversation.id", ondelete="CASCADE"), nullable=False
+    )
+
+    user_content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    ai_content: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now
+    )
+
+    __table_args__ = (
+        Index("ix_conversation_message_conversation_id_id", "conversation_id", "id"),
+    )
@@ -1,5 +1,15 @@
 from ..db import Base
-from sqlalchemy import Boolean, DateTime, Float, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    Index,
+    String,
+    Text,
+    func,
+    literal_column,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from pydantic import BaseModel
@@ -18,6 +28,20 @@ class IMedication(BaseModel):
 
 class Medication(Base):
     __tablename__ = "medication"
+    __table_args__ = (
+        # Review queue: pending rows ordered by confidence (partial index).
+        Index(
+            "ix_medication_pending_review_confidence",
+            literal_column("confidence").asc().nulls_first(),
+            postgresql_where=text("review_status = 'pending_review'"),
+        ),
+        # Case-insensitive equality and prefix (LIKE 'x%') name lookups.
+        Index(
+            "ix_medication_lower_name",
+            func.lower(literal_column("name")).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
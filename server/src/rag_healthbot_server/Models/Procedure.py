@@ -1,5 +1,5 @@
 from ..db import Base
-from sqlalchemy import DateTime, Float, String, Text
+from sqlalchemy import DateTime, Float, Index, String, Text, func, literal_column, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from pydantic import BaseModel
@@ -17,6 +17,20 @@ class IProcedure(BaseModel):
 
 class Procedure(Base):
     __tablename__ = "procedure"
+    __table_args__ = (
+        # Review queue: pending rows ordered by confidence (partial index).
+        Index(
+            "ix_procedure_pending_review_confidence",
+            literal_column("confidence").asc().nulls_first(),
+            postgresql_where=text("review_status = 'pending_review'"),
+        ),
+        # Case-insensitive equality and prefix (LIKE 'x%') name lookups.
+        Index(
+            "ix_procedure_lower_name",
+            func.lower(literal_column("name")).label("lower_name"),
+            postgresql_ops={"lower_name": "text_pattern_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
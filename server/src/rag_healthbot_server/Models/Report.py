@@ -1,5 +1,6 @@
 from ..db import Base
-from sqlalchemy import DateTime, Text
+from sqlalchemy import BigInteger, DateTime, Index, Text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from pydantic import BaseModel
@@ -13,11 +14,18 @@ class IReport(BaseModel):
     # `extracted_text_hash` should be based on OCR/extracted text.
     content_hash: str | None = None
     extracted_text_hash: str | None = None
+    # MinHash signature of the extracted text and its LSH band hashes, for
+    # near-duplicate detection (see utilities/minhash.py).
+    minhash_signature: list[int] | None = None
+    minhash_bands: list[int] | None = None
     medications: list[int] = []
 
 
 class Report(Base):
     __tablename__ = "report"
+    __table_args__ = (
+        Index("idx_report_minhash_bands", "minhash_bands", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     file_name: Mapped[str] = mapped_column(nullable=False)
@@ -26,6 +34,12 @@ class Report(Base):
 
     content_hash: Mapped[str | None] = mapped_column(nullable=True, unique=True)
     extracted_text_hash: Mapped[str | None] = mapped_column(nullable=True)
+    minhash_signature: Mapped[list[int] | None] = mapped_column(
+        ARRAY(BigInteger), nullable=True
+    )
+    minhash_bands: Mapped[list[int] | None] = mapped_column(
+        ARRAY(BigInteger), nullable=True
+    )
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime, nullable=False, default=datetime.now()
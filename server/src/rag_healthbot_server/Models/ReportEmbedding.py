@@ -1,5 +1,14 @@
 from ..db import Base
-from sqlalchemy import DateTime, ForeignKey, Text, UniqueConstraint, Index
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from pydantic import BaseModel
@@ -33,9 +42,20 @@ class ReportEmbedding(Base):
 
     chunk_index: Mapped[int] = mapped_column(nullable=False)
     text: Mapped[Text] = mapped_column(Text, nullable=False)
+    # md5 of the embedding model and ``text`` (``chunk_content_hash``); lets
+    # re-embedding skip unchanged chunks and reuse vectors for identical text
+    # in other reports embedded with the same model.  NULL on rows from
+    # before the column existed, which are re-embedded on the next rebuild.
+    content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
     embedding: Mapped[Vector] = mapped_column(
         Vector(settings.vector_dimension), nullable=False
     )
+    # Lexical side of hybrid retrieval; maintained by Postgres.
+    text_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', text)", persisted=True),
+        deferred=True,
+    )
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime, nullable=False, default=datetime.now()
@@ -47,10 +67,20 @@ class ReportEmbedding(Base):
     __table_args__ = (
         UniqueConstraint("report_id", "chunk_index", name="uq_report_chunk"),
         Index("idx_report_id", "report_id"),
-        Index(
-            "idx_embedding_hnsw",
-            "embedding",
-            postgresql_using="hnsw",
-            postgresql_ops={"embedding": "vector_cosine_ops"},
+        Index("idx_report_embedding_text_tsv", "text_tsv", postgresql_using="gin"),
+        Index("idx_report_embedding_content_hash", "content_hash"),
+        # The halfvec / binary HNSW expression indexes are managed by
+        # utilities/vector_storage.py; only the float32 form is declared here.
+        *(
+            [
+                Index(
+                    "idx_embedding_hnsw",
+                    "embedding",
+                    postgresql_using="hnsw",
+                    postgresql_ops={"embedding": "vector_cosine_ops"},
+                )
+            ]
+            if settings.vector_storage == "float32"
+            else []
         ),
     )
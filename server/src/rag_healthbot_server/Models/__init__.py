@@ -8,3 +8,5 @@ from .ReportProcedure import ReportProcedure  # noqa: F401
 from .ReportEmbedding import ReportEmbedding  # noqa: F401
 from .CodeEmbedding import CodeEmbedding  # noqa: F401
 from .Conversation import Conversation  # noqa: F401
+from .ConversationMessage import ConversationMessage  # noqa: F401
+from .ChatResponseCache import ChatResponseCache  # noqa: F401
@@ -1,14 +1,50 @@
 from rq import Queue, Worker
-from rq.job import Job
+from rq.job import Job, JobStatus
+import logging
 import time
 
+from ..metrics import JOB_DURATION_SECONDS, JOBS_TOTAL
+from ..utilities.job_timing import store_job_timings
+
+logger = logging.getLogger(__name__)
+
+
+def _job_outcome(job: Job) -> str:
+    """Final job status, preferring the agent's own status when it returned one.
+
+    Agents report failures through ``IAgentOutput.status`` rather than by
+    raising, so an RQ "finished" job can still be a failed pipeline run.
+    """
+    try:
+        status = job.get_status(refresh=True)
+    except Exception:
+        return "unknown"
+    if status == JobStatus.FINISHED:
+        try:
+            agent_status = getattr(job.return_value(), "status", None)
+        except Exception:
+            agent_status = None
+        if agent_status is not None:
+            return str(getattr(agent_status, "value", agent_status))
+    return str(getattr(status, "value", status))
+
 
 class MetricsWorker(Worker):
     def execute_job(self, job: Job, queue: Queue):
+        start = time.perf_counter()
         try:
             result = super().execute_job(job, queue)
             return result
         except Exception as e:
             raise
         finally:
-            pass
+            outcome = _job_outcome(job)
+            func = job.func_name or "unknown"
+            JOB_DURATION_SECONDS.labels(func=func, outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+            JOBS_TOTAL.labels(func=func, outcome=outcome).inc()
+            try:
+                store_job_timings(self.connection, queue.name, job)
+            except Exception as e:
+                logger.warning("Failed to store timings of job %s: %s", job.id, e)
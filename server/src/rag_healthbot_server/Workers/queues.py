@@ -0,0 +1,66 @@
+"""Named RQ queues, one per pipeline stage.
+
+Interactive uploads go to ``ingest`` so they never wait behind long-running
+coding, embedding or backfill jobs.  Workers drain the queues they listen to
+in the order given, so ``QUEUE_PRIORITY`` doubles as the default priority.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from redis import Redis
+from rq import Queue
+
+from ..config import settings
+
+QUEUE_INGEST = "ingest"
+QUEUE_CODING = "coding"
+QUEUE_EMBEDDINGS = "embeddings"
+QUEUE_BACKFILL = "backfill"
+
+# Highest priority first.
+QUEUE_PRIORITY: tuple[str, ...] = (
+    QUEUE_INGEST,
+    QUEUE_CODING,
+    QUEUE_EMBEDDINGS,
+    QUEUE_BACKFILL,
+)
+
+# RQ's default queue, used before the split into per-stage queues.  Workers
+# keep draining it at the lowest priority so jobs enqueued by an older
+# release are not orphaned; nothing enqueues to it any more.
+LEGACY_QUEUES: tuple[str, ...] = ("default",)
+
+redis = Redis.from_url(settings.redis_url)
+
+
+@lru_cache()
+def get_queue(name: str) -> Queue:
+    """Return the shared :class:`Queue` for *name*."""
+    if name not in QUEUE_PRIORITY:
+        raise ValueError(f"Unknown queue: {name}")
+    return Queue(name, connection=redis)
+
+
+def parse_queue_names(raw: str) -> list[str]:
+    """Parse a comma-separated queue list, sorted by :data:`QUEUE_PRIORITY`."""
+    names = {n.strip() for n in (raw or "").split(",") if n.strip()}
+    unknown = names - set(QUEUE_PRIORITY)
+    if unknown:
+        raise ValueError(f"Unknown queue(s): {', '.join(sorted(unknown))}")
+    return [n for n in QUEUE_PRIORITY if n in names]
+
+
+def parse_concurrency(raw: str) -> dict[str, int]:
+    """Parse ``"ingest=2,coding=1"`` into ``{"ingest": 2, "coding": 1}``."""
+    concurrency: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        if not item.strip():
+            continue
+        name, _, count = item.partition("=")
+        name = name.strip()
+        if name not in QUEUE_PRIORITY:
+            raise ValueError(f"Unknown queue in concurrency setting: {name}")
+        concurrency[name] = max(1, int(count or 1))
+    return concurrency
@@ -1,12 +1,14 @@
 from rq import Queue
 from .metrics_worker import MetricsWorker
+from .queues import LEGACY_QUEUES, parse_queue_names, parse_concurrency
 from redis import Redis
+from multiprocessing import Process
+from ..clients import close_clients
 from ..config import settings
+from ..metrics import clear_stale_metrics, mark_process_dead
 from ..utilities.icd10_lookup import set_icd10_file
 from ..utilities.cpt_lookup import set_cpt_file
-import logging, signal
-
-redis_conn = Redis.from_url(settings.redis_url)
+import logging, os, signal, sys
 
 # Load local code files for ICD-10 / CPT validation
 if settings.icd10_file:
@@ -18,9 +20,12 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
-def run_worker():
-    queue = Queue(connection=redis_conn)
-    worker = MetricsWorker([queue])
+def _work(queue_names: list[str]) -> None:
+    """Run a single worker listening to *queue_names* in priority order."""
+    # Each process opens its own connection; sockets must not cross a fork.
+    redis_conn = Redis.from_url(settings.redis_url)
+    queues = [Queue(name, connection=redis_conn) for name in queue_names]
+    worker = MetricsWorker(queues, connection=redis_conn)
 
     def _graceful(signum, frame):
         logger.info("Received signal %s, shutting down gracefully...", signum)
@@ -29,8 +34,65 @@ def run_worker():
     signal.signal(signal.SIGTERM, _graceful)
     signal.signal(signal.SIGINT, _graceful)
 
-    worker.work(with_scheduler=True)
+    try:
+        worker.work(with_scheduler=True)
+    finally:
+        # Jobs run in forked work horses with their own (emptied) registry, so
+        # this only closes clients the worker process itself created.
+        close_clients()
+        mark_process_dead(os.getpid())
+
+
+def run_worker(queue_names: list[str] | None = None):
+    """Start worker processes for *queue_names* (defaults to ``WORKER_QUEUES``).
+
+    Queues listed in ``WORKER_CONCURRENCY`` get their own pool of that many
+    processes, so a burst on one stage cannot starve another.  The remaining
+    queues share a single process that drains them in priority order — with
+    the default (empty) setting that is one worker for everything, running
+    in the foreground.  The legacy ``default`` queue is drained last.
+    """
+    names = queue_names or parse_queue_names(settings.worker_queues)
+    if not names:
+        raise ValueError("No queues configured for worker")
+    concurrency = parse_concurrency(settings.worker_concurrency)
+    clear_stale_metrics()
+
+    groups: list[tuple[list[str], int]] = [
+        ([name], concurrency[name]) for name in names if name in concurrency
+    ]
+    shared = [name for name in names if name not in concurrency]
+    if shared:
+        groups.append((shared, 1))
+    last_queues, last_count = groups[-1]
+    groups[-1] = (last_queues + list(LEGACY_QUEUES), last_count)
+
+    if sum(count for _, count in groups) == 1:
+        _work(groups[0][0])
+        return
+
+    processes = [
+        Process(target=_work, args=(queues,), name=f"rq-{'+'.join(queues)}-{i}")
+        for queues, count in groups
+        for i in range(count)
+    ]
+    for p in processes:
+        p.start()
+        logger.info("Started worker %s (pid=%s)", p.name, p.pid)
+
+    def _graceful(signum, frame):
+        logger.info("Received signal %s, stopping %d workers...", signum, len(processes))
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+
+    signal.signal(signal.SIGTERM, _graceful)
+    signal.signal(signal.SIGINT, _graceful)
+
+    for p in processes:
+        p.join()
+        mark_process_dead(p.pid)
 
 
 if __name__ == "__main__":
-    run_worker()
+    run_worker(parse_queue_names(",".join(sys.argv[1:])) or None)
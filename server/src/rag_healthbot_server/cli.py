@@ -14,11 +14,24 @@ def backfill():
     diseases, procedures and medications already in the database.
 
     Pass ``--force`` to re-resolve ALL records, overwriting existing codes.
+    Pass ``--enqueue`` to run the backfill on the ``backfill`` RQ queue
+    instead of in this process.
     """
     import logging
 
     force = "--force" in sys.argv
 
+    if "--enqueue" in sys.argv:
+        from rag_healthbot_server.Workers.queues import QUEUE_BACKFILL, get_queue
+
+        job = get_queue(QUEUE_BACKFILL).enqueue(
+            "rag_healthbot_server.utilities.backfill_codes.backfill_all",
+            force=force,
+            job_timeout=-1,
+        )
+        print(f"Enqueued backfill job {job.id} on queue '{QUEUE_BACKFILL}'")
+        sys.exit(0)
+
     logging.basicConfig(
         level=logging.INFO, format="%(levelname)s %(name)s: %(message)s"
     )
@@ -50,3 +63,20 @@ def backfill():
         print(f"  {entity}: {counts}")
 
     sys.exit(1 if total_failed else 0)
+
+
+def backfill_fingerprints():
+    """CLI entry-point: compute MinHash near-duplicate fingerprints for
+    reports stored before they existed."""
+    import logging
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)s %(name)s: %(message)s"
+    )
+
+    from rag_healthbot_server.utilities.report_dedup import (
+        backfill_report_fingerprints,
+    )
+
+    updated = backfill_report_fingerprints()
+    print(f"Fingerprinted {updated} reports")
@@ -0,0 +1,143 @@
+"""Process-wide registry of LLM and embedding clients.
+
+Building a ``ChatGroq`` or ``OllamaEmbeddings`` instance also builds a new
+HTTP connection pool, so creating one per call paid TCP/TLS setup on every
+chat turn and agent call.  Clients are created once per
+``(provider, model, parameters)`` key and reused; every Groq model shares
+one pair of keep-alive ``httpx`` clients.
+
+Scope of the reuse:
+
+* API — one long-lived process, so connections are reused across requests.
+  :func:`aclose_clients` runs from the FastAPI ``lifespan`` on shutdown.
+* Worker — RQ forks a fresh work horse for every job and the registry is
+  emptied in each forked child (inherited sockets must not be shared with
+  the parent).  Reuse therefore only happens *within* a job, across its
+  agent and embedding calls; every job pays connection setup once.
+  Building clients in the worker parent would not change that: the parent
+  never runs a job, so its pools hold no connections to inherit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+import httpx
+from langchain_groq import ChatGroq
+from langchain_ollama import OllamaEmbeddings
+
+from .config import settings
+from .metrics import LLMMetricsCallback
+
+_lock = threading.Lock()
+_clients: dict[tuple, Any] = {}
+_groq_http: httpx.Client | None = None
+_groq_async_http: httpx.AsyncClient | None = None
+
+
+def _groq_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    # Called with _lock held.
+    global _groq_http, _groq_async_http
+    if _groq_http is None:
+        _groq_http = httpx.Client()
+    if _groq_async_http is None:
+        _groq_async_http = httpx.AsyncClient()
+    return _groq_http, _groq_async_http
+
+
+def get_chat_model(
+    *,
+    model: str,
+    operation: str,
+    temperature: float = 0.2,
+    timeout: float = 30,
+    max_tokens: int | None = None,
+    streaming: bool = False,
+) -> ChatGroq:
+    """Shared ``ChatGroq`` client; *operation* labels its metrics."""
+    key = ("groq", model, operation, temperature, timeout, max_tokens, streaming)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is None:
+            http_client, http_async_client = _groq_http_clients()
+            kwargs: dict[str, Any] = {}
+            if max_tokens is not None:
+                kwargs["max_tokens"] = max_tokens
+            llm = ChatGroq(
+                api_key=settings.groq_api_key,
+                model=model,
+                temperature=temperature,
+                timeout=timeout,
+                streaming=streaming,
+                callbacks=[LLMMetricsCallback(operation)],
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **kwargs,
+            )
+            _clients[key] = llm
+        return llm
+
+
+def ollama_hosts() -> list[str]:
+    """Embedding servers from ``OLLAMA_HOST`` (comma-separated)."""
+    return [h.strip() for h in (settings.ollama_host or "").split(",") if h.strip()]
+
+
+def get_embedder(
+    *,
+    base_url: str | None = None,
+    model: str | None = None,
+    timeout: float | None = None,
+) -> OllamaEmbeddings:
+    """Shared ``OllamaEmbeddings`` client (defaults from settings)."""
+    hosts = ollama_hosts()
+    base_url = base_url or (hosts[0] if hosts else "")
+    model = model or settings.ollama_embed_model
+    if not base_url or not model:
+        raise ValueError("OLLAMA_HOST and OLLAMA_MODEL must be set")
+
+    key = ("ollama", base_url, model, timeout)
+    with _lock:
+        embedder = _clients.get(key)
+        if embedder is None:
+            kwargs: dict[str, Any] = {}
+            if timeout is not None:
+                kwargs["client_kwargs"] = {"timeout": timeout}
+            embedder = OllamaEmbeddings(base_url=base_url, model=model, **kwargs)
+            _clients[key] = embedder
+        return embedder
+
+
+def _reset() -> tuple[httpx.Client | None, httpx.AsyncClient | None]:
+    global _groq_http, _groq_async_http
+    with _lock:
+        _clients.clear()
+        http, async_http = _groq_http, _groq_async_http
+        _groq_http = _groq_async_http = None
+    return http, async_http
+
+
+def close_clients() -> None:
+    """Drop every cached client and close the shared sync HTTP pool."""
+    http, _ = _reset()
+    if http is not None:
+        http.close()
+
+
+async def aclose_clients() -> None:
+    """Drop every cached client and close both shared HTTP pools."""
+    http, async_http = _reset()
+    if http is not None:
+        http.close()
+    if async_http is not None:
+        await async_http.aclose()
+
+
+def _forget_after_fork() -> None:
+    # Don't close: the sockets are shared with the parent process.
+    _reset()
+
+
+os.register_at_fork(after_in_child=_forget_after_fork)
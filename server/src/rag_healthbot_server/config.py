@@ -8,6 +8,22 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="", validation_alias="REDIS_URL")
     database_url: str = Field(default="", validation_alias="DATABASE_CONNECTION_MAIN")
 
+    # ── Database engine / pool settings ───────────────────────────
+    # Pool sizes apply per process (API worker, RQ worker, work horse).
+    db_echo: bool = Field(default=False, validation_alias="DB_ECHO")
+    db_pool_size: int = Field(default=5, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: int = Field(default=30, validation_alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, validation_alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, validation_alias="DB_POOL_PRE_PING")
+    # 0 disables the server-side statement timeout.
+    db_statement_timeout_ms: int = Field(
+        default=0, validation_alias="DB_STATEMENT_TIMEOUT_MS"
+    )
+    # PgBouncer (transaction pooling) compatibility: no client-side pool and
+    # no named prepared statements.
+    db_pgbouncer: bool = Field(default=False, validation_alias="DB_PGBOUNCER")
+
     groq_api_key: str = Field(default="", validation_alias="GROQ_API_KEY")
 
     llm_model: str = Field(default="openai/gpt-oss-120b", validation_alias="LLM_MODEL")
@@ -16,8 +32,38 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("OLLAMA_HOST", "OLLAMA_EMBED_HOST"),
     )
     ollama_embed_model: str = Field(default="", validation_alias="OLLAMA_MODEL")
+    # OLLAMA_HOST may list several comma-separated embedding servers; batch
+    # embedding (services/embedding_service.py) round-robins across them.
+    embed_batch_tokens: int = Field(default=8192, validation_alias="EMBED_BATCH_TOKENS")
+    embed_batch_max_texts: int = Field(
+        default=64, validation_alias="EMBED_BATCH_MAX_TEXTS"
+    )
+    # Concurrent embedding requests allowed per Ollama host, across every API
+    # and worker process (slots are shared through Redis).
+    embed_max_in_flight: int = Field(default=2, validation_alias="EMBED_MAX_IN_FLIGHT")
+    embed_timeout_seconds: float = Field(
+        default=120.0, validation_alias="EMBED_TIMEOUT_SECONDS"
+    )
+    embed_max_retries: int = Field(default=3, validation_alias="EMBED_MAX_RETRIES")
     groq_ocr_model: str = Field(default="", validation_alias="GROQ_OCR_MODEL")
+    # Concurrent LLM calls per map-reduce summary level; keep the total under
+    # the Groq rate limit (calls beyond it queue rather than get a 429).
+    summary_max_concurrency: int = Field(
+        default=4, validation_alias="SUMMARY_MAX_CONCURRENCY"
+    )
     vector_dimension: int = Field(default=0, validation_alias="VECTOR_DIMENSION")
+    # HNSW index used for vector search: "float32", "halfvec" or "binary"
+    # (hamming shortlist of limit × VECTOR_RERANK_FACTOR, re-ranked by exact
+    # cosine).  Must match the index the migrations built (float32 unless a
+    # later revision switched it).  See utilities/vector_storage.py.
+    vector_storage: str = Field(default="float32", validation_alias="VECTOR_STORAGE")
+    vector_rerank_factor: int = Field(
+        default=4, validation_alias="VECTOR_RERANK_FACTOR"
+    )
+    # Report chunk size in embedding-model tokens, per model, e.g.
+    # "mxbai-embed-large=400,bge-m3=800".  Unlisted models get a default
+    # sized to their context window (utilities/report_chunking.py).
+    embed_chunk_tokens: str = Field(default="", validation_alias="EMBED_CHUNK_TOKENS")
 
     # ── scispaCy / UMLS settings ──────────────────────────────────
     scispacy_model: str = Field(
@@ -44,6 +90,81 @@ class Settings(BaseSettings):
         default=0.85, validation_alias="AUTO_ACCEPT_THRESHOLD"
     )
 
+    # ── Report deduplication ──────────────────────────────────────
+    # Estimated Jaccard similarity (MinHash over extracted text) at or above
+    # which an upload is treated as a copy of an existing report, e.g. a
+    # re-scan or re-export.  The texts must also contain the same numbers
+    # (dates, values), so a later report on the same template is still
+    # processed.  0 disables near-duplicate matching.
+    near_duplicate_threshold: float = Field(
+        default=0.9, validation_alias="NEAR_DUPLICATE_THRESHOLD"
+    )
+
+    # ── Entity extraction cache ───────────────────────────────────
+    # Per-chunk LLM extraction results in Redis (utilities/extraction_cache.py).
+    entity_cache_enabled: bool = Field(
+        default=True, validation_alias="ENTITY_CACHE_ENABLED"
+    )
+    entity_cache_ttl_seconds: int = Field(
+        default=7 * 86400, validation_alias="ENTITY_CACHE_TTL_SECONDS"
+    )
+
+    # ── RQ queues / worker pools ──────────────────────────────────
+    # Comma-separated queue names a worker listens to, highest priority first.
+    worker_queues: str = Field(
+        default="ingest,coding,embeddings,backfill", validation_alias="WORKER_QUEUES"
+    )
+    # Per-queue worker process count, e.g. "ingest=2,coding=1".  Queues that
+    # are not listed share a single process, drained in priority order.
+    worker_concurrency: str = Field(default="", validation_alias="WORKER_CONCURRENCY")
+
+    # ── Chat retrieval (hybrid vector + full-text, RRF-fused) ─────
+    rag_top_k: int = Field(default=4, validation_alias="RAG_TOP_K")
+    # Candidates taken from each ranking before fusion.
+    rag_candidate_k: int = Field(default=20, validation_alias="RAG_CANDIDATE_K")
+    rag_rrf_k: int = Field(default=60, validation_alias="RAG_RRF_K")
+    rag_vector_weight: float = Field(default=1.0, validation_alias="RAG_VECTOR_WEIGHT")
+    rag_lexical_weight: float = Field(
+        default=1.0, validation_alias="RAG_LEXICAL_WEIGHT"
+    )
+
+    # Cross-report search: HNSW candidate list size, and optional iterative
+    # index scans ("relaxed_order" / "strict_order") so filtered queries keep
+    # scanning the index until enough rows pass the filter.  Iterative scans
+    # need pgvector >= 0.8 (older versions reject the setting), hence "off".
+    rag_hnsw_ef_search: int = Field(default=100, validation_alias="RAG_HNSW_EF_SEARCH")
+    rag_hnsw_iterative_scan: str = Field(
+        default="off", validation_alias="RAG_HNSW_ITERATIVE_SCAN"
+    )
+    rag_per_report_cap: int = Field(default=3, validation_alias="RAG_PER_REPORT_CAP")
+
+    # ── Chat semantic response cache ──────────────────────────────
+    chat_cache_enabled: bool = Field(
+        default=True, validation_alias="CHAT_CACHE_ENABLED"
+    )
+    # Minimum cosine similarity between question embeddings for a hit.
+    chat_cache_similarity: float = Field(
+        default=0.95, validation_alias="CHAT_CACHE_SIMILARITY"
+    )
+    chat_cache_ttl_seconds: int = Field(
+        default=86400, validation_alias="CHAT_CACHE_TTL_SECONDS"
+    )
+
+    # ── Chat context budget ───────────────────────────────────────
+    # Most recent turns replayed verbatim; older turns are folded into a
+    # rolling summary stored on the conversation.
+    chat_history_turns: int = Field(default=6, validation_alias="CHAT_HISTORY_TURNS")
+    # Approximate token budgets (≈4 chars/token) for each prompt section.
+    chat_history_token_budget: int = Field(
+        default=2000, validation_alias="CHAT_HISTORY_TOKEN_BUDGET"
+    )
+    chat_context_token_budget: int = Field(
+        default=1500, validation_alias="CHAT_CONTEXT_TOKEN_BUDGET"
+    )
+    chat_summary_token_budget: int = Field(
+        default=400, validation_alias="CHAT_SUMMARY_TOKEN_BUDGET"
+    )
+
     prometheus_multiproc_dir: str = Field(
         default="/tmp/healthrag_prometheus", validation_alias="PROMETHEUS_MULTIPROC_DIR"
     )
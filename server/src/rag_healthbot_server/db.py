@@ -5,15 +5,25 @@ class Base(DeclarativeBase):
     pass
 
 
+import os
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import NullPool
 
 from .config import settings
+from .metrics import instrument_engine
 
 
 def _import_models() -> None:
     from rag_healthbot_server.Models import (
+        ChatResponseCache,
         Conversation,
+        ConversationMessage,
         Disease,
         Medication,
         Procedure,
@@ -25,7 +35,51 @@ def _import_models() -> None:
     )
 
 
-engine = create_engine(url=settings.database_url, echo=True)
+def _pool_kwargs() -> dict[str, Any]:
+    if settings.db_pgbouncer:
+        # PgBouncer already pools server connections; a second client-side
+        # pool would just pin them.
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _sync_connect_args() -> dict[str, Any]:
+    # psycopg2 never uses server-side prepared statements, so PgBouncer mode
+    # only needs the pool change above.
+    if settings.db_statement_timeout_ms > 0:
+        return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return {}
+
+
+def _async_connect_args() -> dict[str, Any]:
+    connect_args: dict[str, Any] = {}
+    if settings.db_statement_timeout_ms > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.db_statement_timeout_ms)
+        }
+    if settings.db_pgbouncer:
+        # asyncpg caches prepared statements per connection, which breaks
+        # under transaction pooling.  Disable the caches and use unique names
+        # for the statements asyncpg still has to prepare.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+engine = create_engine(
+    url=settings.database_url,
+    echo=settings.db_echo,
+    connect_args=_sync_connect_args(),
+    **_pool_kwargs(),
+)
+instrument_engine(engine)
 Session = sessionmaker(bind=engine)
 # scoped_session provides a thread-local session registry so that concurrent
 # requests (each handled in their own thread by Uvicorn/Starlette) each get
@@ -42,4 +96,42 @@ def remove_session() -> None:
     session.remove()
 
 
+def _async_database_url(url: str) -> str:
+    """Rewrite a psycopg2 URL to use the asyncpg driver."""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgres", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Async engine for FastAPI routes.  RQ workers keep using the sync engine
+# above; async sessions are never shared between requests, so each route
+# receives its own via the ``get_async_session`` dependency.
+async_engine = create_async_engine(
+    url=_async_database_url(settings.database_url),
+    echo=settings.db_echo,
+    connect_args=_async_connect_args(),
+    **_pool_kwargs(),
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+instrument_engine(async_engine.sync_engine)
+
+
+def _reset_pool_after_fork() -> None:
+    # RQ forks a work horse per job; pooled connections inherited from the
+    # parent must not be reused by the child.
+    engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding a request-scoped :class:`AsyncSession`."""
+    async with AsyncSessionLocal() as async_session:
+        yield async_session
+
+
 _import_models()
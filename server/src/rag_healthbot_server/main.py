@@ -1,26 +1,45 @@
+import os
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, APIRouter, Request
+from fastapi import FastAPI, APIRouter, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from rag_healthbot_server.clients import aclose_clients
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.metrics import (
+    HTTP_REQUEST_SECONDS,
+    clear_stale_metrics,
+    mark_process_dead,
+    render_metrics,
+)
 from rag_healthbot_server.routers.report import router as report_router
 from rag_healthbot_server.routers.conversations import router as conversations_router
 from rag_healthbot_server.routers.chat import router as chat_router
 from rag_healthbot_server.routers.review import router as review_router
+from rag_healthbot_server.routers.search import router as search_router
 from rag_healthbot_server.utilities.icd10_lookup import set_icd10_file
 from rag_healthbot_server.utilities.cpt_lookup import set_cpt_file
+from rag_healthbot_server.utilities.summary_stream import aclose_summary_streams
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    clear_stale_metrics()
     # Load local code files if configured
     if settings.icd10_file:
         set_icd10_file(settings.icd10_file)
     if settings.cpt_file:
         set_cpt_file(settings.cpt_file)
-    yield
+    try:
+        yield
+    finally:
+        # Close the shared LLM / embedding HTTP pools.
+        await aclose_clients()
+        await aclose_summary_streams()
+        mark_process_dead(os.getpid())
 
 
 class _DBSessionMiddleware(BaseHTTPMiddleware):
@@ -39,9 +58,46 @@ class _DBSessionMiddleware(BaseHTTPMiddleware):
             remove_session()
 
 
+class _RequestMetricsMiddleware:
+    """Record request latency per route template (not per concrete URL).
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``: the timer stops once the
+    response body is complete, so streamed (SSE) responses are timed to the
+    end of the stream rather than to their headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            ).observe(time.perf_counter() - start)
+
+
 app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(_DBSessionMiddleware)
+app.add_middleware(_RequestMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -55,5 +111,12 @@ api_router.include_router(report_router)
 api_router.include_router(conversations_router)
 api_router.include_router(chat_router)
 api_router.include_router(review_router)
+api_router.include_router(search_router)
 
 app.include_router(api_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
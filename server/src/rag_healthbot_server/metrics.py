@@ -0,0 +1,265 @@
+"""Prometheus instrumentation shared by the API and the RQ workers.
+
+All metrics are written through ``prometheus_client``'s multiprocess mode so
+that the API, every worker and every forked work horse share one view of the
+data.  ``PROMETHEUS_MULTIPROC_DIR`` must be set before ``prometheus_client``
+is imported anywhere, which is why it is exported at the top of this module.
+
+Each process writes its own ``<type>_<pid>.db`` files there.  The API and
+the worker supervisor call :func:`clear_stale_metrics` at boot so files of
+processes from earlier runs are not aggregated forever, and call
+:func:`mark_process_dead` for processes that exit.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from functools import wraps
+from typing import Any
+from uuid import UUID
+
+from .config import settings
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.prometheus_multiproc_dir)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.multiprocess import mark_process_dead  # noqa: E402
+from prometheus_client.core import GaugeMetricFamily  # noqa: E402
+
+# Long-running work (LLM calls, whole jobs) needs buckets well past the
+# client default of 10s.
+_SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+# ── Metric definitions ────────────────────────────────────────────
+
+JOB_DURATION_SECONDS = Histogram(
+    "rq_job_duration_seconds",
+    "Wall-clock duration of RQ jobs",
+    ["func", "outcome"],
+    buckets=_SLOW_BUCKETS,
+)
+JOBS_TOTAL = Counter("rq_jobs_total", "RQ jobs executed", ["func", "outcome"])
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Duration of each summary-orchestrator stage",
+    ["stage"],
+    buckets=_SLOW_BUCKETS,
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of chat-model calls",
+    ["model", "operation"],
+    buckets=_SLOW_BUCKETS,
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by chat-model calls",
+    ["model", "operation", "kind"],
+)
+EMBEDDING_REQUEST_SECONDS = Histogram(
+    "embedding_request_duration_seconds",
+    "Latency of Ollama embedding calls",
+    ["model", "operation"],
+    buckets=_SLOW_BUCKETS,
+)
+EMBEDDING_RETRIES_TOTAL = Counter(
+    "embedding_retries_total",
+    "Embedding batches retried after a transient Ollama failure",
+    ["host"],
+)
+
+UMLS_REQUESTS_TOTAL = Counter(
+    "umls_requests_total", "HTTP requests sent to the UMLS API", ["endpoint", "status"]
+)
+CACHE_LOOKUPS_TOTAL = Counter(
+    "cache_lookups_total", "Cache lookups", ["cache", "result"]
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements",
+    ["operation"],
+    buckets=_FAST_BUCKETS,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latency of API requests",
+    ["method", "route", "status"],
+    buckets=_FAST_BUCKETS + (10, 30, 60),
+)
+
+
+# ── Helpers ───────────────────────────────────────────────────────
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback recording latency and token usage per chat call.
+
+    Attach via ``ChatGroq(callbacks=[LLMMetricsCallback("summarize")])``.
+    Works for both ``invoke`` and ``stream``; ``on_llm_end`` fires once the
+    last chunk has been produced.
+    """
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self._started: dict[UUID, tuple[float, str]] = {}
+
+    def on_chat_model_start(
+        self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), str(model))
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, response)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._finish(run_id, None)
+
+    def _finish(self, run_id: UUID, response: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        start, model = started
+        LLM_REQUEST_SECONDS.labels(model=model, operation=self.operation).observe(
+            time.perf_counter() - start
+        )
+        if response is None:
+            return
+        for kind, count in _token_usage(response).items():
+            LLM_TOKENS_TOTAL.labels(
+                model=model, operation=self.operation, kind=kind
+            ).inc(count)
+
+
+def _token_usage(response: Any) -> dict[str, int]:
+    """Pull input/output token counts out of a LangChain ``LLMResult``."""
+    for generations in getattr(response, "generations", None) or []:
+        for gen in generations:
+            usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+            if usage:
+                return {
+                    "input": int(usage.get("input_tokens") or 0),
+                    "output": int(usage.get("output_tokens") or 0),
+                }
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "input": int(usage.get("prompt_tokens") or 0),
+            "output": int(usage.get("completion_tokens") or 0),
+        }
+    return {}
+
+
+def instrument_lru_cache(cache: str):
+    """Count hits/misses of a ``functools.lru_cache``-wrapped function.
+
+    Apply *above* ``@lru_cache`` so the wrapped function's ``cache_info`` can
+    be compared before and after each call.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            hits_before = fn.cache_info().hits
+            result = fn(*args, **kwargs)
+            hit = fn.cache_info().hits > hits_before
+            CACHE_LOOKUPS_TOTAL.labels(
+                cache=cache, result="hit" if hit else "miss"
+            ).inc()
+            return result
+
+        wrapper.cache_info = fn.cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = fn.cache_clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine(engine) -> None:
+    """Record per-statement SQL timings for a SQLAlchemy engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        operation = (statement or "").lstrip().split(None, 1)[0:1]
+        DB_QUERY_SECONDS.labels(
+            operation=operation[0].upper() if operation else "UNKNOWN"
+        ).observe(time.perf_counter() - starts.pop())
+
+
+class _QueueDepthCollector:
+    """Report RQ queue lengths at scrape time (live values, no files)."""
+
+    def collect(self):
+        from .Workers.queues import QUEUE_PRIORITY, get_queue
+
+        gauge = GaugeMetricFamily(
+            "rq_queue_depth", "Jobs waiting in each RQ queue", labels=["queue"]
+        )
+        for name in QUEUE_PRIORITY:
+            try:
+                gauge.add_metric([name], get_queue(name).count)
+            except Exception:
+                continue
+        yield gauge
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clear_stale_metrics(directory: str | None = None) -> None:
+    """Delete metric files of processes that are no longer running.
+
+    Call at boot, before this process records anything: its own PID may be
+    reused from a previous run (e.g. PID 1 in a container), so its files
+    are removed too instead of being counted on from old values.
+    """
+    path = Path(directory or os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    for db_file in path.glob("*.db"):
+        _, _, pid = db_file.stem.rpartition("_")
+        if not pid.isdigit():
+            continue
+        if int(pid) == os.getpid() or not _pid_running(int(pid)):
+            db_file.unlink(missing_ok=True)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Aggregate metrics from every process for a ``/metrics`` response."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_QueueDepthCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,23 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Iterable
+import re
+from typing import AsyncIterator
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse, StreamingResponse
 from langchain.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langchain_ollama import OllamaEmbeddings
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
+from rag_healthbot_server.clients import get_chat_model, get_embedder
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.db import AsyncSessionLocal, get_async_session
+from rag_healthbot_server.metrics import EMBEDDING_REQUEST_SECONDS
+from rag_healthbot_server.services.db.ChatResponseCacheRepo import (
+    create_cached_answer_async,
+    find_similar_cached_answer_async,
+    get_cached_answer_by_question_async,
+)
 from rag_healthbot_server.services.db.ConversationRepo import (
-    append_conversation_message_pair,
-    get_conversation,
+    append_conversation_message_pair_async,
+    get_conversation_async,
+    list_conversation_messages_async,
 )
 from rag_healthbot_server.services.db.ReportEmbeddingRepo import (
-    search_report_embeddings_by_cosine_distance,
+    has_report_embeddings_async,
+    search_report_embeddings_across_reports_async,
+    search_report_embeddings_hybrid_async,
+)
+from rag_healthbot_server.services.db.ReportRepo import (
+    get_report_summary_async,
+    search_report_text_async,
+)
+from rag_healthbot_server.utilities.chat_history import (
+    fit_to_budget,
+    history_window,
+    refresh_rolling_summary,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,9 +64,9 @@ def _make_llm() -> ChatGroq:
     if not settings.llm_model:
         raise ValueError("LLM_MODEL must be set")
 
-    return ChatGroq(
-        api_key=settings.groq_api_key,
+    return get_chat_model(
         model=settings.llm_model,
+        operation="chat",
         temperature=0.2,
         timeout=60,
         streaming=True,
@@ -50,17 +74,13 @@ def _make_llm() -> ChatGroq:
 
 
 def _make_embedder() -> OllamaEmbeddings:
-    if not settings.ollama_host or not settings.ollama_embed_model:
-        raise ValueError("OLLAMA_HOST and OLLAMA_MODEL must be set")
-    return OllamaEmbeddings(
-        base_url=settings.ollama_host,
-        model=settings.ollama_embed_model,
-    )
+    return get_embedder()
 
 
 def _build_messages(
     *,
     report_context: str | None,
+    summary: str | None = None,
     history: list[dict],
     user_message: str,
 ) -> list[SystemMessage | HumanMessage | AIMessage]:
@@ -85,6 +105,16 @@ def _build_messages(
             )
         )
 
+    if summary and summary.strip():
+        messages.append(
+            SystemMessage(
+                content=(
+                    "Summary of the earlier part of this conversation:\n\n"
+                    f"{summary.strip()}"
+                )
+            )
+        )
+
     for m in history or []:
         user = (m or {}).get("userContent")
         ai = (m or {}).get("aiContent")
@@ -107,8 +137,130 @@ def _format_report_context(chunks: list[str]) -> str:
     return "\n\n".join(lines)
 
 
+async def _embed_query(user_message: str) -> list[float]:
+    embedder = _make_embedder()
+    with EMBEDDING_REQUEST_SECONDS.labels(
+        model=settings.ollama_embed_model, operation="chat_query"
+    ).time():
+        return await embedder.aembed_query(user_message)
+
+
+async def _retrieve_unindexed_report_context(
+    session: AsyncSession, report_id: int, user_message: str
+) -> str:
+    """Context for a report whose embeddings job hasn't finished yet.
+
+    Full-text excerpts of the extracted text, or the report summary when
+    nothing matches.
+    """
+    excerpts = await search_report_text_async(
+        session, report_id, user_message, max_fragments=settings.rag_top_k
+    )
+    if excerpts:
+        return _format_report_context(
+            fit_to_budget(excerpts, settings.chat_context_token_budget)
+        )
+    summary = await get_report_summary_async(session, report_id)
+    if not summary:
+        return ""
+    return (
+        "[Report summary]\n"
+        + fit_to_budget([summary], settings.chat_context_token_budget)[0].strip()
+    )
+
+
+async def _retrieve_report_context(
+    session: AsyncSession,
+    report_id: int,
+    user_message: str,
+    query_vec: list[float] | None = None,
+) -> str:
+    if not await has_report_embeddings_async(session, report_id):
+        return await _retrieve_unindexed_report_context(
+            session, report_id, user_message
+        )
+    if query_vec is None:
+        query_vec = await _embed_query(user_message)
+    matches = await search_report_embeddings_hybrid_async(
+        session,
+        report_id=report_id,
+        query_text=user_message,
+        query_embedding=query_vec,
+        top_k=settings.rag_top_k,
+        candidate_k=settings.rag_candidate_k,
+        rrf_k=settings.rag_rrf_k,
+        vector_weight=settings.rag_vector_weight,
+        lexical_weight=settings.rag_lexical_weight,
+    )
+    return _format_report_context(
+        fit_to_budget([m.text for m in matches], settings.chat_context_token_budget)
+    )
+
+
+async def _retrieve_archive_context(
+    session: AsyncSession, report_ids: list[int], user_message: str
+) -> str:
+    """Excerpts across several reports, labelled with their source report."""
+    query_vec = await _embed_query(user_message)
+    rows = await search_report_embeddings_across_reports_async(
+        session,
+        query_embedding=query_vec,
+        report_ids=report_ids,
+        top_k=settings.rag_top_k * 2,
+        per_report_cap=settings.rag_per_report_cap,
+        ef_search=settings.rag_hnsw_ef_search,
+        iterative_scan=settings.rag_hnsw_iterative_scan,
+    )
+    return _format_report_context(
+        fit_to_budget(
+            [f"(from {row.file_name})\n{row.text}" for row in rows],
+            settings.chat_context_token_budget,
+        )
+    )
+
+
+# ── Semantic response cache ─────────────────────────────────────────
+
+_REPLAY_CHUNK_RE = re.compile(r"\S+\s*|\s+")
+
+
+def _normalize_question(text: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _replay_tokens(answer: str) -> list[str]:
+    """Split a cached answer into word-sized ``token`` events."""
+    return _REPLAY_CHUNK_RE.findall(answer)
+
+
+async def _lookup_cached_answer(
+    session: AsyncSession, report_id: int, question_norm: str
+) -> tuple[str | None, list[float] | None]:
+    """Return ``(answer, query_vec)``; the vector is reused for retrieval on a miss."""
+    hit = await get_cached_answer_by_question_async(
+        session, report_id, question_norm, settings.chat_cache_ttl_seconds
+    )
+    if hit is not None:
+        return hit.answer, None
+
+    query_vec = await _embed_query(question_norm)
+    hit = await find_similar_cached_answer_async(
+        session,
+        report_id,
+        query_vec,
+        min_similarity=settings.chat_cache_similarity,
+        ttl_seconds=settings.chat_cache_ttl_seconds,
+    )
+    return (hit.answer if hit is not None else None), query_vec
+
+
 @router.post("")
-def post_chat(payload: ChatRequest):
+async def post_chat(
+    payload: ChatRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
     try:
         conversation_id = int(payload.conversationId)
     except Exception:
@@ -116,7 +268,7 @@ def post_chat(payload: ChatRequest):
             status_code=404, content={"error": "Conversation not found"}
         )
 
-    conversation = get_conversation(conversation_id)
+    conversation = await get_conversation_async(session, conversation_id)
     if conversation is None:
         return JSONResponse(
             status_code=404, content={"error": "Conversation not found"}
@@ -126,50 +278,142 @@ def post_chat(payload: ChatRequest):
     if not user_message:
         return JSONResponse(status_code=400, content={"error": "message required"})
 
-    def event_stream() -> Iterable[str]:
+    metadata = getattr(conversation, "metadata_", None) or {}
+    summary = conversation.summary
+
+    async def event_stream() -> AsyncIterator[str]:
+        # The request-scoped session may be closed once the response starts,
+        # so the stream opens its own short-lived sessions and holds no
+        # connection while the LLM is generating.
         full_text_parts: list[str] = []
 
         try:
             report_context: str | None = None
-            metadata = getattr(conversation, "metadata_", None) or {}
             report_id_raw = metadata.get("reportId")
-            if report_id_raw is not None:
-                try:
-                    report_id = int(str(report_id_raw))
-                    embedder = _make_embedder()
-                    query_vec = embedder.embed_query(user_message)
-                    matches = search_report_embeddings_by_cosine_distance(
-                        report_id=report_id,
-                        query_embedding=query_vec,
-                        top_k=6,
+            report_ids_raw = metadata.get("reportIds")
+
+            async with AsyncSessionLocal() as stream_session:
+                recent = history_window(
+                    await list_conversation_messages_async(
+                        stream_session,
+                        conversation_id,
+                        limit=settings.chat_history_turns,
                     )
-                    report_context = _format_report_context([m.text for m in matches])
+                )
+
+            # The cache key is (report, question), so only the opening turn of
+            # a single-report chat is cached: later answers also depend on the
+            # earlier turns and the rolling summary, which the key doesn't hold.
+            cache_report_id = (
+                int(str(report_id_raw))
+                if settings.chat_cache_enabled
+                and report_id_raw is not None
+                and not report_ids_raw
+                and not recent
+                and not summary
+                else None
+            )
+            question_norm = _normalize_question(user_message)
+            query_vec: list[float] | None = None
+
+            if cache_report_id is not None and question_norm:
+                try:
+                    async with AsyncSessionLocal() as stream_session:
+                        cached, query_vec = await _lookup_cached_answer(
+                            stream_session, cache_report_id, question_norm
+                        )
+                except Exception as e:
+                    logger.warning("Chat cache lookup failed: %s", e)
+                    cached = None
+                if cached is not None:
+                    yield _sse_data({"type": "start"})
+                    for token in _replay_tokens(cached):
+                        yield _sse_data({"type": "token", "token": token})
+                    async with AsyncSessionLocal() as stream_session:
+                        await append_conversation_message_pair_async(
+                            stream_session,
+                            conversation_id=conversation_id,
+                            user_content=user_message,
+                            ai_content=cached,
+                        )
+                    yield _sse_data({"type": "end"})
+                    return
+
+            async with AsyncSessionLocal() as stream_session:
+                try:
+                    if report_ids_raw:
+                        # Multi-report conversation: search the whole set.
+                        report_context = await _retrieve_archive_context(
+                            stream_session,
+                            [int(str(r)) for r in report_ids_raw],
+                            user_message,
+                        )
+                    elif report_id_raw is not None:
+                        report_context = await _retrieve_report_context(
+                            stream_session,
+                            int(str(report_id_raw)),
+                            user_message,
+                            query_vec=query_vec,
+                        )
                 except Exception as e:
                     logger.warning("RAG retrieval failed: %s", e)
 
             llm = _make_llm()
             msgs = _build_messages(
                 report_context=report_context,
-                history=list(conversation.messages or []),
+                summary=summary,
+                history=[
+                    {"userContent": m.user_content, "aiContent": m.ai_content}
+                    for m in recent
+                ],
                 user_message=user_message,
             )
 
             yield _sse_data({"type": "start"})
 
-            for chunk in llm.stream(msgs):
-                token = getattr(chunk, "content", None)
-                if not token:
-                    continue
-                full_text_parts.append(token)
-                yield _sse_data({"type": "token", "token": token})
+            stream = llm.astream(msgs)
+            try:
+                async for chunk in stream:
+                    if await request.is_disconnected():
+                        logger.info(
+                            "Client disconnected; cancelling chat stream for "
+                            "conversation_id=%s",
+                            conversation_id,
+                        )
+                        return
+                    token = getattr(chunk, "content", None)
+                    if not token:
+                        continue
+                    full_text_parts.append(token)
+                    yield _sse_data({"type": "token", "token": token})
+            finally:
+                # Closes the upstream HTTP stream on disconnect/cancellation.
+                await stream.aclose()
 
             full_text = "".join(full_text_parts)
-            append_conversation_message_pair(
-                conversation_id=conversation_id,
-                user_content=user_message,
-                ai_content=full_text,
-            )
+            async with AsyncSessionLocal() as stream_session:
+                await append_conversation_message_pair_async(
+                    stream_session,
+                    conversation_id=conversation_id,
+                    user_content=user_message,
+                    ai_content=full_text,
+                )
+                if cache_report_id is not None and query_vec is not None and full_text:
+                    try:
+                        await create_cached_answer_async(
+                            stream_session,
+                            report_id=cache_report_id,
+                            question_norm=question_norm,
+                            embedding=query_vec,
+                            answer=full_text,
+                            ttl_seconds=settings.chat_cache_ttl_seconds,
+                        )
+                    except Exception as e:
+                        logger.warning("Chat cache store failed: %s", e)
             yield _sse_data({"type": "end"})
+        except asyncio.CancelledError:
+            logger.info("Chat stream cancelled for conversation_id=%s", conversation_id)
+            raise
         except Exception as e:
             logger.exception("Chat streaming failed")
             yield _sse_data({"type": "error", "error": str(e)})
@@ -182,4 +426,6 @@ def post_chat(payload: ChatRequest):
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
         },
+        # Runs once the stream has been fully sent, off the response path.
+        background=BackgroundTask(refresh_rolling_summary, conversation_id),
     )
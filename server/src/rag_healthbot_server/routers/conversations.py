@@ -3,25 +3,28 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from rag_healthbot_server.db import get_async_session
 from rag_healthbot_server.Models.Conversation import IConversation
 from rag_healthbot_server.services.db.ConversationRepo import (
-    create_conversation,
-    delete_conversation,
-    get_conversation,
-    list_conversations,
+    create_conversation_async,
+    delete_conversation_async,
+    get_conversation_async,
+    list_conversation_messages_async,
+    list_conversations_async,
+)
+from rag_healthbot_server.services.db.ReportRepo import get_report_async
+from rag_healthbot_server.services.db.ReportEmbeddingRepo import (
+    has_report_embeddings_async,
 )
-from rag_healthbot_server.services.db.ReportRepo import get_report
-from rag_healthbot_server.services.db.ReportEmbeddingRepo import list_report_embeddings
 from rag_healthbot_server.services.agents.embeddings_agent import (
-    IEmbeddingsAgentInput,
-    IInputData as EmbeddingsInputData,
-    run_embeddings_agent,
+    enqueue_report_embeddings,
 )
-from rag_healthbot_server.services.agents.common.contracts import AgentType
 
 import uuid
 
@@ -31,11 +34,12 @@ router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
 class MessageOut(BaseModel):
+    id: int | None = None
     userContent: str | None = None
     aiContent: str | None = None
 
 
-class ConversationDoc(BaseModel):
+class ConversationHeader(BaseModel):
     # Match Mongoose JSON shape used by the client.
     # Pydantic v2 treats underscore-prefixed fields as private, so we use
     # a regular field name with a serialization alias.
@@ -43,13 +47,22 @@ class ConversationDoc(BaseModel):
 
     id: str = Field(serialization_alias="_id")
     title: str
-    messages: list[MessageOut] = []
     metadata: dict[str, object] = {}
 
     createdAt: datetime
     updatedAt: datetime
 
 
+class ConversationDoc(ConversationHeader):
+    messages: list[MessageOut] = []
+
+
+class MessagePage(BaseModel):
+    messages: list[MessageOut]
+    # Pass as ``before`` to fetch the next (older) page; null when exhausted.
+    nextBefore: int | None = None
+
+
 class CreateConversationRequest(BaseModel):
     title: str = Field(..., min_length=1)
 
@@ -65,14 +78,46 @@ class CreateConversationFromReportRequest(BaseModel):
 
 class CreateConversationFromReportResponse(BaseModel):
     id: str
+    # "ready" when the report's embeddings exist, "indexing" while the
+    # embeddings job runs (chat falls back to full-text search meanwhile).
+    status: str = "ready"
+    jobId: str | None = None
+
+
+class CreateConversationFromReportsRequest(BaseModel):
+    reportIds: list[str] = Field(..., min_length=1)
+
+
+class CreateConversationFromReportsResponse(BaseModel):
+    id: str
+    # "indexing" while any report's embeddings job runs; those reports are
+    # not searchable until it finishes.
+    status: str = "ready"
+    jobIds: list[str] = []
+
+
+def _to_header(c) -> dict:
+    """Conversation without its messages (sidebar listing)."""
+    header = ConversationHeader(
+        id=str(c.id),
+        title=c.title,
+        metadata=getattr(c, "metadata_", None) or {},
+        createdAt=c.created_at,
+        updatedAt=c.updated_at,
+    )
+    return header.model_dump(by_alias=True, mode="json")
+
 
+def _to_message(m) -> MessageOut:
+    return MessageOut(id=m.id, userContent=m.user_content, aiContent=m.ai_content)
 
-def _to_doc(c) -> dict:
+
+def _to_doc(c, messages: list | None = None) -> dict:
     """Return a plain dict matching the Mongoose-like JSON shape the client expects."""
     doc = ConversationDoc(
         id=str(c.id),
         title=c.title,
-        messages=[MessageOut(**m) for m in (c.messages or [])],
+        messages=[_to_message(m) for m in messages or []],
         metadata=getattr(c, "metadata_", None) or {},
         createdAt=c.created_at,
         updatedAt=c.updated_at,
@@ -80,11 +125,18 @@ def _to_doc(c) -> dict:
     return doc.model_dump(by_alias=True, mode="json")
 
 
+def _parse_id(id: str) -> int | None:
+    try:
+        return int(id)
+    except Exception:
+        return None
+
+
 @router.get("")
-def get_conversations():
+async def get_conversations(session: AsyncSession = Depends(get_async_session)):
     try:
-        conversations = list_conversations()
-        return JSONResponse(content=[_to_doc(c) for c in conversations])
+        conversations = await list_conversations_async(session)
+        return JSONResponse(content=[_to_header(c) for c in conversations])
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -93,17 +145,21 @@ def get_conversations():
 
 
 @router.post("", status_code=201)
-def post_conversation(payload: CreateConversationRequest):
+async def post_conversation(
+    payload: CreateConversationRequest,
+    session: AsyncSession = Depends(get_async_session),
+):
     if not payload.title:
         return JSONResponse(status_code=400, content={"error": "Title is required"})
 
     try:
-        conv = create_conversation(
+        conv = await create_conversation_async(
+            session,
             IConversation(
                 title=payload.title,
                 messages=[],
                 metadata={},
-            )
+            ),
         )
         return JSONResponse(content=_to_doc(conv), status_code=201)
     except Exception as e:
@@ -113,18 +169,39 @@ def post_conversation(payload: CreateConversationRequest):
         )
 
 
+async def _ensure_report_embeddings(session: AsyncSession, report) -> str | None:
+    """Id of the embeddings job for *report*, or None if already embedded.
+
+    Never embeds inline: queues the job (or joins the one the upload pipeline
+    already queued) so creation latency doesn't grow with the document.
+    """
+    if await has_report_embeddings_async(session, report.id):
+        return None
+    job = await run_in_threadpool(
+        enqueue_report_embeddings,
+        report.id,
+        report.extracted_text or "",
+        rund_id=str(uuid.uuid4()),
+        file_name=report.file_name,
+    )
+    return job.id
+
+
 @router.post(
     "/from-report",
     response_model=CreateConversationFromReportResponse,
     status_code=200,
 )
-def post_conversation_from_report(payload: CreateConversationFromReportRequest):
+async def post_conversation_from_report(
+    payload: CreateConversationFromReportRequest,
+    session: AsyncSession = Depends(get_async_session),
+):
     try:
         report_id = int(payload.reportId)
     except Exception:
         return JSONResponse(status_code=400, content={"error": "reportId required"})
 
-    report = get_report(report_id)
+    report = await get_report_async(session, report_id)
     if report is None:
         return JSONResponse(status_code=404, content={"error": "not found"})
 
@@ -134,37 +211,92 @@ def post_conversation_from_report(payload: CreateConversationFromReportRequest):
             status_code=400, content={"error": "no text available for embeddings"}
         )
 
+    status, job_id = "ready", None
     try:
-        existing = list_report_embeddings(report_id)
-        if not existing:
-            run_embeddings_agent(
-                IEmbeddingsAgentInput(
-                    rund_id=str(uuid.uuid4()),
-                    agent_type=AgentType.REPORT_EMBEDDING,
-                    input=EmbeddingsInputData(texts=[extracted_text]),
-                    constraints={"report_id": report_id},
-                )
-            )
+        job_id = await _ensure_report_embeddings(session, report)
+        if job_id is not None:
+            status = "indexing"
     except Exception as e:
-        logger.exception("Embedding generation failed for report_id=%s", report_id)
+        logger.exception("Embedding enqueue failed for report_id=%s", report_id)
         return JSONResponse(status_code=500, content={"error": "server"})
 
     try:
-        conv = create_conversation(
+        conv = await create_conversation_async(
+            session,
             IConversation(
                 title=f"Chat — {report.file_name or 'Report'}",
                 messages=[],
                 metadata={"reportId": str(report_id)},
-            )
+            ),
+        )
+        return CreateConversationFromReportResponse(
+            id=str(conv.id), status=status, jobId=job_id
         )
-        return CreateConversationFromReportResponse(id=str(conv.id))
     except Exception as e:
         logger.exception("Conversation creation failed for report_id=%s", report_id)
         return JSONResponse(status_code=500, content={"error": "server"})
 
 
+@router.post(
+    "/from-reports",
+    response_model=CreateConversationFromReportsResponse,
+    status_code=200,
+)
+async def post_conversation_from_reports(
+    payload: CreateConversationFromReportsRequest,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Conversation over several reports; chat searches all of them."""
+    try:
+        report_ids = list(dict.fromkeys(int(r) for r in payload.reportIds))
+    except Exception:
+        return JSONResponse(status_code=400, content={"error": "reportIds required"})
+
+    reports = []
+    for report_id in report_ids:
+        report = await get_report_async(session, report_id)
+        if report is None:
+            return JSONResponse(status_code=404, content={"error": "not found"})
+        if len((report.extracted_text or "").strip()) >= 20:
+            reports.append(report)
+    if not reports:
+        return JSONResponse(
+            status_code=400, content={"error": "no text available for embeddings"}
+        )
+
+    job_ids: list[str] = []
+    try:
+        for report in reports:
+            job_id = await _ensure_report_embeddings(session, report)
+            if job_id is not None:
+                job_ids.append(job_id)
+    except Exception as e:
+        logger.exception("Embedding enqueue failed for report_ids=%s", report_ids)
+        return JSONResponse(status_code=500, content={"error": "server"})
+
+    try:
+        conv = await create_conversation_async(
+            session,
+            IConversation(
+                title=f"Chat — {len(reports)} reports",
+                messages=[],
+                metadata={"reportIds": [str(r.id) for r in reports]},
+            ),
+        )
+        return CreateConversationFromReportsResponse(
+            id=str(conv.id),
+            status="indexing" if job_ids else "ready",
+            jobIds=job_ids,
+        )
+    except Exception as e:
+        logger.exception("Conversation creation failed for report_ids=%s", report_ids)
+        return JSONResponse(status_code=500, content={"error": "server"})
+
+
 @router.delete("/{id}", response_model=DeleteConversationResponse)
-def delete_conversation_by_id(id: str):
+async def delete_conversation_by_id(
+    id: str, session: AsyncSession = Depends(get_async_session)
+):
     if not id:
         return JSONResponse(
             status_code=400,
@@ -179,7 +311,7 @@ def delete_conversation_by_id(id: str):
             status_code=404, content={"error": "Conversation not found"}
         )
 
-    deleted = delete_conversation(conv_id)
+    deleted = await delete_conversation_async(session, conv_id)
     if not deleted:
         return JSONResponse(
             status_code=404, content={"error": "Conversation not found"}
@@ -192,7 +324,9 @@ def delete_conversation_by_id(id: str):
 
 
 @router.get("/{id}")
-def get_conversation_by_id(id: str):
+async def get_conversation_by_id(
+    id: str, session: AsyncSession = Depends(get_async_session)
+):
     if not id:
         return JSONResponse(
             status_code=400,
@@ -206,10 +340,38 @@ def get_conversation_by_id(id: str):
             status_code=404, content={"error": "Conversation not found"}
         )
 
-    conv = get_conversation(conv_id)
+    conv = await get_conversation_async(session, conv_id)
     if conv is None:
         return JSONResponse(
             status_code=404, content={"error": "Conversation not found"}
         )
 
-    return JSONResponse(content=_to_doc(conv))
+    messages = await list_conversation_messages_async(session, conv_id)
+    return JSONResponse(content=_to_doc(conv, messages))
+
+
+@router.get("/{id}/messages", response_model=MessagePage)
+async def get_conversation_messages(
+    id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: int | None = Query(None, description="Return messages older than this id"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Page through a conversation's history, newest page first."""
+    conv_id = _parse_id(id)
+    if conv_id is None or await get_conversation_async(session, conv_id) is None:
+        return JSONResponse(
+            status_code=404, content={"error": "Conversation not found"}
+        )
+
+    # Fetch one extra row to know whether an older page exists.
+    messages = await list_conversation_messages_async(
+        session, conv_id, limit=limit + 1, before_id=before
+    )
+    has_more = len(messages) > limit
+    if has_more:
+        messages = messages[1:]
+    return MessagePage(
+        messages=[_to_message(m) for m in messages],
+        nextBefore=messages[0].id if has_more and messages else None,
+    )
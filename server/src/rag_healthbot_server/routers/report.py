@@ -1,28 +1,42 @@
+import json
 import uuid
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from redis import Redis
-from rq import Queue
 from rq.job import Job
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.db import get_async_session
+from rag_healthbot_server.Workers.queues import QUEUE_INGEST, get_queue
 from rag_healthbot_server.services.agents.common.contracts import AgentType
 from rag_healthbot_server.services.agents.summary_orchestrator import (
     run_summary_orchestrator,
     ISummaryOrchestratorInput,
     IInputData as IOrchestratorInputData,
+    duplicate_report_output,
 )
 from rag_healthbot_server.services.db.ReportRepo import (
-    list_reports,
-    get_report,
+    list_reports_async,
+    get_report_async,
+    get_report_by_content_hash_async,
 )
+from rag_healthbot_server.utilities.hashing import report_content_hash
+from rag_healthbot_server.utilities.report_lock import enqueue_or_coalesce
+from rag_healthbot_server.utilities.job_timing import (
+    TIMINGS_META_KEY,
+    percentile,
+    recent_job_timings,
+)
+from rag_healthbot_server.utilities.summary_stream import read_summary_events
 
 logger = logging.getLogger(__name__)
 
 redis = Redis.from_url(settings.redis_url)
-queue = Queue("default", connection=redis)
 
 router = APIRouter(prefix="/report", tags=["report"])
 
@@ -31,8 +45,12 @@ router = APIRouter(prefix="/report", tags=["report"])
 
 
 class JobEnqueued(BaseModel):
-    job_id: str
+    # None for duplicates: the existing report is returned in ``result``.
+    job_id: str | None
     file_name: str
+    status: str = "queued"  # "queued" | "coalesced" | "duplicate"
+    report_id: int | None = None
+    result: dict | None = None
 
 
 class UploadResponse(BaseModel):
@@ -88,14 +106,35 @@ class ProcedureOut(BaseModel):
     review_status: str = "pending_review"
 
 
+class StageTiming(BaseModel):
+    stage: str
+    detail: str | None = None  # e.g. "chunk 2/3 attempt 1"
+    started_at: str
+    ended_at: str
+    duration_s: float
+
+
 class JobStatusResponse(BaseModel):
     job_id: str
     status: str
     stage: str | None = None
+    timings: list[StageTiming] = []
     result: dict | None = None
     error: str | None = None
 
 
+class StageStats(BaseModel):
+    stage: str
+    count: int  # number of jobs that ran this stage
+    p50_s: float
+    p95_s: float
+
+
+class JobTimingStatsResponse(BaseModel):
+    jobs: int
+    stages: list[StageStats]
+
+
 class ReportOut(BaseModel):
     id: int
     file_name: str
@@ -113,11 +152,18 @@ class ReportOut(BaseModel):
 
 
 @router.post("", response_model=UploadResponse)
-async def upload_reports(payload: UploadRequest):
+async def upload_reports(
+    payload: UploadRequest, session: AsyncSession = Depends(get_async_session)
+):
     """
     Accept one or more PDF uploads.
     Each file is enqueued as a separate RQ job running the summary orchestrator.
     Returns the job IDs so the client can poll for status.
+
+    Files whose bytes match an existing report are not enqueued: the entry
+    has ``status="duplicate"``, no job id, and the existing report as
+    ``result``.  A file identical to one still being processed is
+    ``"coalesced"`` onto that upload's job id.
     """
     if not payload.files:
         raise HTTPException(status_code=400, detail="No files provided")
@@ -132,6 +178,26 @@ async def upload_reports(payload: UploadRequest):
 
         run_id = uuid.uuid4()
 
+        content_hash = await run_in_threadpool(report_content_hash, file_content)
+        if content_hash:
+            existing = await get_report_by_content_hash_async(session, content_hash)
+            if existing is not None:
+                logger.info(
+                    f"{file_name} duplicates report {existing.id}; not enqueued"
+                )
+                jobs.append(
+                    JobEnqueued(
+                        job_id=None,
+                        file_name=file_name,
+                        status="duplicate",
+                        report_id=existing.id,
+                        result=duplicate_report_output(run_id, existing).model_dump(
+                            mode="json"
+                        ),
+                    )
+                )
+                continue
+
         payload = ISummaryOrchestratorInput(
             rund_id=run_id,
             agent_type=AgentType.SUMMARIZATION,
@@ -143,18 +209,62 @@ async def upload_reports(payload: UploadRequest):
             ),
         )
 
-        rq_job = queue.enqueue(
+        job_id, coalesced = await run_in_threadpool(
+            enqueue_or_coalesce,
+            get_queue(QUEUE_INGEST),
             run_summary_orchestrator,
             payload,
+            content_hash or file_name,
             job_timeout=10 * 60,
         )
 
-        logger.info(f"Enqueued summary job {rq_job.id} for {file_name}")
-        jobs.append(JobEnqueued(job_id=rq_job.id, file_name=file_name))
+        if coalesced:
+            logger.info(f"Coalesced {file_name} onto in-flight summary job {job_id}")
+        else:
+            logger.info(f"Enqueued summary job {job_id} for {file_name}")
+        jobs.append(
+            JobEnqueued(
+                job_id=job_id,
+                file_name=file_name,
+                status="coalesced" if coalesced else "queued",
+            )
+        )
 
     return UploadResponse(jobs=jobs)
 
 
+# ── GET /api/report/jobs/stats — per-stage latency percentiles ────
+
+
+@router.get("/jobs/stats", response_model=JobTimingStatsResponse)
+def get_job_timing_stats(limit: int = Query(100, ge=1, le=1000)):
+    """
+    p50/p95 duration of each pipeline stage over the most recent *limit*
+    finished or failed upload jobs (up to the last 1000, kept by the worker
+    beyond the jobs' own result TTL).  Stages that run several times per job
+    (e.g. ``llm_extraction`` once per chunk) are summed per job first.
+    """
+    jobs = recent_job_timings(redis, QUEUE_INGEST, limit)
+
+    per_stage: dict[str, list[float]] = {}
+    for totals in jobs:
+        for stage, total in totals.items():
+            per_stage.setdefault(stage, []).append(total)
+
+    return JobTimingStatsResponse(
+        jobs=len(jobs),
+        stages=[
+            StageStats(
+                stage=stage,
+                count=len(durations),
+                p50_s=percentile(durations, 50),
+                p95_s=percentile(durations, 95),
+            )
+            for stage, durations in per_stage.items()
+        ],
+    )
+
+
 # ── GET /api/report/jobs/{job_id} — poll job status ────────────────
 
 
@@ -176,6 +286,7 @@ def get_job_status(job_id: str):
         job_id=job_id,
         status=status,
         stage=meta.get("stage"),
+        timings=meta.get(TIMINGS_META_KEY, []),
     )
 
     if status == "finished" and job.result is not None:
@@ -192,13 +303,70 @@ def get_job_status(job_id: str):
     return response
 
 
+# ── GET /api/report/jobs/{job_id}/summary/stream — summary tokens (SSE) ──
+
+_JOB_DONE_STATUSES = ("finished", "failed", "stopped", "canceled")
+
+
+def _sse_event(entry_id: str, payload: dict) -> str:
+    return f"id: {entry_id}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _terminal_event_for(job: Job) -> dict:
+    """``end``/``error`` event for a job that finished without publishing one."""
+    result = job.result if job.get_status() == "finished" else None
+    output = getattr(result, "output", None)
+    if output is not None:
+        return {"type": "end", "summary": output.summary}
+    error = (job.meta or {}).get("error") or "Summary not available"
+    return {"type": "error", "error": error}
+
+
+@router.get("/jobs/{job_id}/summary/stream")
+async def stream_job_summary(job_id: str, request: Request):
+    """
+    Relay the summary of an upload job as server-sent events while the
+    summarizer generates it: ``token`` events, then one ``end`` event with the
+    full summary (or ``error``).  Events already published are replayed first,
+    and ``Last-Event-ID`` resumes a dropped connection.
+    """
+    try:
+        job = await run_in_threadpool(Job.fetch, job_id, connection=redis)
+    except Exception:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    last_id = request.headers.get("last-event-id") or "0-0"
+
+    async def event_stream():
+        async for entry_id, event in read_summary_events(job_id, last_id=last_id):
+            if await request.is_disconnected():
+                return
+            if event is not None:
+                yield _sse_event(entry_id, event)
+                continue
+            # No new tokens: stop if the job ended without a terminal event
+            # (e.g. the work horse was killed), otherwise keep the line open.
+            status = await run_in_threadpool(job.get_status)
+            if status in _JOB_DONE_STATUSES:
+                terminal = await run_in_threadpool(_terminal_event_for, job)
+                yield _sse_event(entry_id, terminal)
+                return
+            yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ── GET /api/report — list all reports ──────────────────────────────
 
 
 @router.get("", response_model=list[ReportOut])
-def get_reports():
+async def get_reports(session: AsyncSession = Depends(get_async_session)):
     """Return all persisted reports (newest first)."""
-    reports = list_reports()
+    reports = await list_reports_async(session)
     out = []
     for r in reports:
         meds = []
@@ -274,9 +442,11 @@ def get_reports():
 
 
 @router.get("/{report_id}", response_model=ReportOut)
-def get_report_by_id(report_id: int):
+async def get_report_by_id(
+    report_id: int, session: AsyncSession = Depends(get_async_session)
+):
     """Return a single report with its linked medications, diseases, procedures."""
-    report = get_report(report_id)
+    report = await get_report_async(session, report_id)
     if report is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
@@ -13,35 +13,38 @@ import json
 import logging
 from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from rag_healthbot_server.db import get_async_session
 from rag_healthbot_server.services.db.DiseaseRepo import (
-    get_disease,
-    list_diseases,
-    update_disease,
+    get_disease_async,
+    update_disease_async,
 )
 from rag_healthbot_server.services.db.ProcedureRepo import (
-    get_procedure,
-    list_procedures,
-    update_procedure,
+    get_procedure_async,
+    update_procedure_async,
 )
 from rag_healthbot_server.services.db.MedicationRepo import (
-    get_medication,
-    list_medications,
-    update_medication,
+    get_medication_async,
+    update_medication_async,
 )
 from rag_healthbot_server.services.db.ReportDiseaseRepo import (
-    get_diseases_for_report,
-    update_report_disease_fields,
+    get_diseases_for_report_async,
+    update_report_disease_fields_async,
 )
 from rag_healthbot_server.services.db.ReportMedicationRepo import (
-    get_medications_for_report,
-    update_report_medication_fields,
+    get_medications_for_report_async,
+    update_report_medication_fields_async,
 )
 from rag_healthbot_server.services.db.ReportProcedureRepo import (
-    get_procedures_for_report,
-    update_report_procedure_fields,
+    get_procedures_for_report_async,
+    update_report_procedure_fields_async,
+)
+from rag_healthbot_server.services.db.ReviewRepo import (
+    count_review_statuses_async,
+    list_review_queue_async,
 )
 
 logger = logging.getLogger(__name__)
@@ -92,40 +95,22 @@ class ReviewAction(BaseModel):
 
 
 @router.get("/stats", response_model=ReviewStats)
-def get_review_stats():
+async def get_review_stats(session: AsyncSession = Depends(get_async_session)):
     """Summary counts of pending vs accepted entities."""
-    diseases = list_diseases()
-    procedures = list_procedures()
-    medications = list_medications()
-
-    pending_d = sum(
-        1 for d in diseases if getattr(d, "review_status", "") == "pending_review"
-    )
-    pending_p = sum(
-        1 for p in procedures if getattr(p, "review_status", "") == "pending_review"
-    )
-    pending_m = sum(
-        1 for m in medications if getattr(m, "review_status", "") == "pending_review"
-    )
+    counts = await count_review_statuses_async(session)
 
-    accepted_d = sum(
-        1 for d in diseases if getattr(d, "review_status", "") == "accepted"
-    )
-    accepted_p = sum(
-        1 for p in procedures if getattr(p, "review_status", "") == "accepted"
-    )
-    accepted_m = sum(
-        1 for m in medications if getattr(m, "review_status", "") == "accepted"
-    )
+    pending_d = counts.get(("disease", "pending_review"), 0)
+    pending_p = counts.get(("procedure", "pending_review"), 0)
+    pending_m = counts.get(("medication", "pending_review"), 0)
 
     return ReviewStats(
         pending_diseases=pending_d,
         pending_procedures=pending_p,
         pending_medications=pending_m,
         total_pending=pending_d + pending_p + pending_m,
-        accepted_diseases=accepted_d,
-        accepted_procedures=accepted_p,
-        accepted_medications=accepted_m,
+        accepted_diseases=counts.get(("disease", "accepted"), 0),
+        accepted_procedures=counts.get(("procedure", "accepted"), 0),
+        accepted_medications=counts.get(("medication", "accepted"), 0),
     )
 
 
@@ -133,81 +118,47 @@ def get_review_stats():
 
 
 @router.get("/queue", response_model=list[ReviewItem])
-def get_review_queue(
+async def get_review_queue(
     entity_type: EntityType | None = Query(None, description="Filter by entity type"),
     status: str = Query("pending_review", description="Filter by review_status"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    """Paginated list of entities matching the given review status."""
-    items: list[ReviewItem] = []
+    """Paginated list of entities matching the given review status.
 
-    if entity_type is None or entity_type == "disease":
-        for d in list_diseases():
-            if getattr(d, "review_status", "") == status:
-                cands = _parse_candidates(getattr(d, "candidates_json", None))
-                items.append(
-                    ReviewItem(
-                        id=d.id,
-                        entity_type="disease",
-                        name=d.name,
-                        cui=d.cui,
-                        code=d.icd10_code,
-                        confidence=getattr(d, "confidence", None),
-                        review_status=getattr(d, "review_status", "pending_review"),
-                        review_notes=getattr(d, "review_notes", None),
-                        candidates=cands,
-                    )
-                )
-
-    if entity_type is None or entity_type == "procedure":
-        for p in list_procedures():
-            if getattr(p, "review_status", "") == status:
-                cands = _parse_candidates(getattr(p, "candidates_json", None))
-                items.append(
-                    ReviewItem(
-                        id=p.id,
-                        entity_type="procedure",
-                        name=p.name,
-                        cui=p.cui,
-                        code=p.cpt_code,
-                        confidence=getattr(p, "confidence", None),
-                        review_status=getattr(p, "review_status", "pending_review"),
-                        review_notes=getattr(p, "review_notes", None),
-                        candidates=cands,
-                    )
-                )
-
-    if entity_type is None or entity_type == "medication":
-        for m in list_medications():
-            if getattr(m, "review_status", "") == status:
-                items.append(
-                    ReviewItem(
-                        id=m.id,
-                        entity_type="medication",
-                        name=m.name,
-                        cui=m.cui,
-                        code=None,
-                        confidence=getattr(m, "confidence", None),
-                        review_status=getattr(m, "review_status", "pending_review"),
-                        review_notes=getattr(m, "review_notes", None),
-                    )
-                )
-
-    # Sort by confidence ascending (least confident first)
-    items.sort(key=lambda x: x.confidence or 0.0)
-    return items[offset : offset + limit]
+    Filtering, ordering (least confident first) and pagination happen in SQL,
+    so candidate JSON is only parsed for the returned page.
+    """
+    rows = await list_review_queue_async(
+        session, status, entity_type=entity_type, limit=limit, offset=offset
+    )
+    return [
+        ReviewItem(
+            id=row.id,
+            entity_type=row.entity_type,
+            name=row.name,
+            cui=row.cui,
+            code=row.code,
+            confidence=row.confidence,
+            review_status=row.review_status,
+            review_notes=row.review_notes,
+            candidates=_parse_candidates(row.candidates_json),
+        )
+        for row in rows
+    ]
 
 
 # ── GET /api/review/by-report/{report_id} ─────────────────────────
 
 
 @router.get("/by-report/{report_id}", response_model=list[ReviewItem])
-def get_review_queue_for_report(
+async def get_review_queue_for_report(
     report_id: int,
     status: str | None = Query(
         None, description="Filter by review_status; omit for all"
     ),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Return all reviewable entity occurrences for a specific report.
 
@@ -216,7 +167,7 @@ def get_review_queue_for_report(
     """
     items: list[ReviewItem] = []
 
-    for link in get_diseases_for_report(report_id):
+    for link in await get_diseases_for_report_async(session, report_id):
         rs = getattr(link, "review_status", "pending_review")
         if status is not None and rs != status:
             continue
@@ -240,7 +191,7 @@ def get_review_queue_for_report(
             )
         )
 
-    for link in get_medications_for_report(report_id):
+    for link in await get_medications_for_report_async(session, report_id):
         rs = getattr(link, "review_status", "pending_review")
         if status is not None and rs != status:
             continue
@@ -263,7 +214,7 @@ def get_review_queue_for_report(
             )
         )
 
-    for link in get_procedures_for_report(report_id):
+    for link in await get_procedures_for_report_async(session, report_id):
         rs = getattr(link, "review_status", "pending_review")
         if status is not None and rs != status:
             continue
@@ -298,11 +249,12 @@ def get_review_queue_for_report(
 @router.patch(
     "/by-report/{report_id}/{entity_type}/{link_id}", response_model=ReviewItem
 )
-def review_entity_for_report(
+async def review_entity_for_report(
     report_id: int,
     entity_type: EntityType,
     link_id: int,
     body: ReviewAction,
+    session: AsyncSession = Depends(get_async_session),
 ):
     """Accept, reject, or update a single entity occurrence within a report.
 
@@ -336,16 +288,16 @@ def review_entity_for_report(
         join_updates["review_notes"] = body.review_notes
 
     # Update join row
-    updated_link = _update_join_row(entity_type, link_id, join_updates)
+    updated_link = await _update_join_row(session, entity_type, link_id, join_updates)
     if updated_link is None:
         raise HTTPException(404, f"{entity_type} link {link_id} not found")
 
     # Update canonical entity (code/cui only)
     entity_id = _entity_id_from_link(entity_type, updated_link)
     if entity_id is not None and canonical_updates:
-        _update_entity(entity_type, entity_id, canonical_updates)
+        await _update_entity(session, entity_type, entity_id, canonical_updates)
 
-    entity = _get_entity(entity_type, entity_id) if entity_id else None
+    entity = await _get_entity(session, entity_type, entity_id) if entity_id else None
 
     logger.info(
         "Review %s %s/link=%d report=%d: status=%s",
@@ -375,9 +327,13 @@ def review_entity_for_report(
 
 
 @router.get("/{entity_type}/{entity_id}", response_model=ReviewItem)
-def get_review_item(entity_type: EntityType, entity_id: int):
+async def get_review_item(
+    entity_type: EntityType,
+    entity_id: int,
+    session: AsyncSession = Depends(get_async_session),
+):
     """Retrieve a single entity with its candidate codes."""
-    entity = _get_entity(entity_type, entity_id)
+    entity = await _get_entity(session, entity_type, entity_id)
     if entity is None:
         raise HTTPException(404, f"{entity_type} {entity_id} not found")
 
@@ -407,9 +363,14 @@ def get_review_item(entity_type: EntityType, entity_id: int):
 
 
 @router.patch("/{entity_type}/{entity_id}", response_model=ReviewItem)
-def review_entity(entity_type: EntityType, entity_id: int, body: ReviewAction):
+async def review_entity(
+    entity_type: EntityType,
+    entity_id: int,
+    body: ReviewAction,
+    session: AsyncSession = Depends(get_async_session),
+):
     """Accept, reject, or update the code for an entity."""
-    entity = _get_entity(entity_type, entity_id)
+    entity = await _get_entity(session, entity_type, entity_id)
     if entity is None:
         raise HTTPException(404, f"{entity_type} {entity_id} not found")
 
@@ -438,7 +399,7 @@ def review_entity(entity_type: EntityType, entity_id: int, body: ReviewAction):
     if body.review_notes is not None:
         updates["review_notes"] = body.review_notes
 
-    updated = _update_entity(entity_type, entity_id, updates)
+    updated = await _update_entity(session, entity_type, entity_id, updates)
     if updated is None:
         raise HTTPException(500, "Update failed")
 
@@ -476,23 +437,25 @@ def review_entity(entity_type: EntityType, entity_id: int, body: ReviewAction):
 # ── Internal helpers ───────────────────────────────────────────────
 
 
-def _get_entity(entity_type: EntityType, entity_id: int):
+async def _get_entity(session: AsyncSession, entity_type: EntityType, entity_id: int):
     if entity_type == "disease":
-        return get_disease(entity_id)
+        return await get_disease_async(session, entity_id)
     elif entity_type == "procedure":
-        return get_procedure(entity_id)
+        return await get_procedure_async(session, entity_id)
     elif entity_type == "medication":
-        return get_medication(entity_id)
+        return await get_medication_async(session, entity_id)
     return None
 
 
-def _update_entity(entity_type: EntityType, entity_id: int, updates: dict):
+async def _update_entity(
+    session: AsyncSession, entity_type: EntityType, entity_id: int, updates: dict
+):
     if entity_type == "disease":
-        return update_disease(entity_id, updates)
+        return await update_disease_async(session, entity_id, updates)
     elif entity_type == "procedure":
-        return update_procedure(entity_id, updates)
+        return await update_procedure_async(session, entity_id, updates)
     elif entity_type == "medication":
-        return update_medication(entity_id, updates)
+        return await update_medication_async(session, entity_id, updates)
     return None
 
 
@@ -504,13 +467,15 @@ def _code_field(entity_type: EntityType) -> str:
     return "cui"  # medications use CUI as their primary code
 
 
-def _update_join_row(entity_type: EntityType, link_id: int, updates: dict):
+async def _update_join_row(
+    session: AsyncSession, entity_type: EntityType, link_id: int, updates: dict
+):
     if entity_type == "disease":
-        return update_report_disease_fields(link_id, updates)
+        return await update_report_disease_fields_async(session, link_id, updates)
     elif entity_type == "procedure":
-        return update_report_procedure_fields(link_id, updates)
+        return await update_report_procedure_fields_async(session, link_id, updates)
     elif entity_type == "medication":
-        return update_report_medication_fields(link_id, updates)
+        return await update_report_medication_fields_async(session, link_id, updates)
     return None
 
 
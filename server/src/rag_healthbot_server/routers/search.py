@@ -0,0 +1,104 @@
+"""Semantic search across a patient's report archive.
+
+Endpoints:
+    POST   /api/search   — nearest report excerpts over many (or all) reports
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from langchain_ollama import OllamaEmbeddings
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from rag_healthbot_server.clients import get_embedder
+from rag_healthbot_server.config import settings
+from rag_healthbot_server.db import get_async_session
+from rag_healthbot_server.metrics import EMBEDDING_REQUEST_SECONDS
+from rag_healthbot_server.services.db.ReportEmbeddingRepo import (
+    search_report_embeddings_across_reports_async,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# ── Request / response schemas ──────────────────────────────────────
+
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    # Omit to search every report.
+    reportIds: list[int] | None = None
+    topK: int = Field(10, ge=1, le=50)
+    perReportCap: int | None = Field(None, ge=1, le=20)
+
+
+class SearchHit(BaseModel):
+    reportId: int
+    fileName: str
+    reportCreatedAt: datetime | None = None
+    chunkIndex: int
+    text: str
+    score: float  # 1 - cosine_distance
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: list[SearchHit]
+
+
+def _make_embedder() -> OllamaEmbeddings:
+    return get_embedder()
+
+
+# ── POST /api/search ───────────────────────────────────────────────
+
+
+@router.post("", response_model=SearchResponse)
+async def search_reports(
+    payload: SearchRequest,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Scored excerpts with report provenance, capped per report."""
+    query = payload.query.strip()
+    if not query:
+        return JSONResponse(status_code=400, content={"error": "query required"})
+
+    try:
+        with EMBEDDING_REQUEST_SECONDS.labels(
+            model=settings.ollama_embed_model, operation="archive_query"
+        ).time():
+            query_vec = await _make_embedder().aembed_query(query)
+    except Exception:
+        logger.exception("Query embedding failed")
+        return JSONResponse(status_code=502, content={"error": "embedding failed"})
+
+    rows = await search_report_embeddings_across_reports_async(
+        session,
+        query_embedding=query_vec,
+        report_ids=payload.reportIds,
+        top_k=payload.topK,
+        per_report_cap=payload.perReportCap or settings.rag_per_report_cap,
+        ef_search=settings.rag_hnsw_ef_search,
+        iterative_scan=settings.rag_hnsw_iterative_scan,
+    )
+    return SearchResponse(
+        query=query,
+        results=[
+            SearchHit(
+                reportId=row.report_id,
+                fileName=row.file_name,
+                reportCreatedAt=row.report_created_at,
+                chunkIndex=row.chunk_index,
+                text=row.text,
+                score=round(1.0 - float(row.distance), 4),
+            )
+            for row in rows
+        ],
+    )
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+
+def split_chunks(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """Split *text* into overlapping chunks of at most *chunk_size* chars.
+
+    Each chunk (except the first) starts *overlap* chars before the end of
+    the previous chunk so entities straddling a boundary are not missed.
+    Chunks are cut at the last newline within the chunk to avoid splitting
+    mid-sentence when possible.
+    """
+    if len(text) <= chunk_size:
+        return [text]
+
+    chunks: list[str] = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            # Prefer cutting at a newline so we don't split mid-sentence
+            nl = text.rfind("\n", start + chunk_size // 2, end)
+            if nl != -1:
+                end = nl + 1
+        chunk = text[start:end]
+        chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = end - overlap
+    return chunks
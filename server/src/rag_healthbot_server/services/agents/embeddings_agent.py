@@ -1,19 +1,28 @@
 from __future__ import annotations
 
-from .common.contracts import IAgentInput, IAgentOutput
+from .common.contracts import IAgentInput, IAgentOutput, AgentType
 from pydantic import BaseModel
 import logging
 import coloredlogs
 
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.services.db.ChatResponseCacheRepo import (
+    delete_cached_answers_for_report,
+)
 from rag_healthbot_server.services.db.ReportEmbeddingRepo import (
-    create_report_embeddings,
-    delete_report_embeddings_by_report_id,
-    IReportEmbeddings,
+    apply_report_embedding_diff,
+    get_embeddings_by_content_hash,
+    get_report_chunk_hashes,
+    IReportChunk,
 )
+from rag_healthbot_server.utilities.hashing import chunk_content_hash
+from rag_healthbot_server.Workers.queues import QUEUE_EMBEDDINGS, get_queue
+
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
 
-from langchain_ollama import OllamaEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from rag_healthbot_server.services.embedding_service import embed_texts
+from rag_healthbot_server.utilities.report_chunking import chunk_report_text
 
 
 logger = logging.getLogger(__name__)
@@ -40,26 +49,13 @@ class IEmbeddingsAgentOutput(IAgentOutput):
     output: IOutputData | None = None
 
 
-def _make_embedder() -> OllamaEmbeddings:
-    if not settings.ollama_host or not settings.ollama_embed_model:
-        raise ValueError("OLLAMA_HOST and OLLAMA_MODEL must be set")
-    return OllamaEmbeddings(
-        base_url=settings.ollama_host, model=settings.ollama_embed_model
-    )
-
-
 def _chunk_texts(texts: list[str]) -> list[str]:
     joined = "\n\n".join(t for t in texts if t and t.strip())
     if not joined.strip():
         return []
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        separators=["\n\n", "\n", " ", ""],
-    )
-    chunks = splitter.split_text(joined)
-    return [c.strip() for c in chunks if c and c.strip()]
+    # Section-aligned chunks sized in the embedding model's tokens.
+    return chunk_report_text(joined)
 
 
 def _get_report_id(payload: IEmbeddingsAgentInput) -> int:
@@ -93,50 +89,94 @@ def run_embeddings_agent(payload: IEmbeddingsAgentInput) -> IEmbeddingsAgentOutp
         if not chunks:
             raise ValueError("No text available for embeddings")
 
-        embedder = _make_embedder()
-        logger.info(
-            "Generating embeddings for report_id=%s with %d chunks",
-            report_id,
-            len(chunks),
-        )
-        vectors = embedder.embed_documents(chunks)
-
-        if not vectors:
-            raise RuntimeError("Embedding model returned no vectors")
-
-        if len(vectors) != len(chunks):
-            raise RuntimeError(
-                f"Embedding count mismatch: got {len(vectors)} vectors for {len(chunks)} chunks"
-            )
-
-        embedding_dim = len(vectors[0])
         expected_dim = int(settings.vector_dimension or 0)
         if expected_dim <= 0:
             raise ValueError("VECTOR_DIMENSION must be set to a positive integer")
-        if expected_dim and embedding_dim != expected_dim:
-            raise ValueError(
-                f"Embedding dimension mismatch: expected {expected_dim}, got {embedding_dim}"
+
+        # Only chunks whose text changed since the last run need a vector;
+        # of those, text already embedded anywhere (shared headers, footers,
+        # disclaimers) reuses the stored one.  The hash covers the embedding
+        # model, so switching models re-embeds everything.
+        model = settings.ollama_embed_model
+        hashes = [chunk_content_hash(c, model) for c in chunks]
+        stored = get_report_chunk_hashes(report_id)
+        changed = [i for i, h in enumerate(hashes) if stored.get(i) != h]
+        stale = len([i for i in stored if i >= len(chunks)])
+        if not changed and not stale:
+            logger.info(
+                "Embeddings for report_id=%s are up to date (%d chunks)",
+                report_id,
+                len(chunks),
             )
+            return IEmbeddingsAgentOutput(
+                rund_id=payload.rund_id,
+                status="completed",
+                output=IOutputData(
+                    report_id=report_id,
+                    chunk_count=len(chunks),
+                    embedding_dim=expected_dim,
+                ),
+            )
+
+        known = get_embeddings_by_content_hash([hashes[i] for i in changed])
+        to_embed: dict[str, str] = {}
+        for i in changed:
+            if hashes[i] not in known:
+                to_embed.setdefault(hashes[i], chunks[i])
 
-        # Replace any previous embeddings for this report to avoid unique constraint collisions.
-        deleted = delete_report_embeddings_by_report_id(report_id)
-        if deleted:
+        if to_embed:
             logger.info(
-                "Deleted %d existing embeddings for report_id=%s", deleted, report_id
+                "Generating embeddings for report_id=%s: %d new of %d chunks",
+                report_id,
+                len(to_embed),
+                len(chunks),
+            )
+            vectors = embed_texts(
+                list(to_embed.values()), operation="report_chunks", model=model
             )
 
-        create_report_embeddings(
-            IReportEmbeddings(report_id=report_id, texts=chunks, embeddings=vectors)
+            if len(vectors) != len(to_embed):
+                raise RuntimeError(
+                    f"Embedding count mismatch: got {len(vectors)} vectors for {len(to_embed)} chunks"
+                )
+            for vector in vectors:
+                if len(vector) != expected_dim:
+                    raise ValueError(
+                        f"Embedding dimension mismatch: expected {expected_dim}, got {len(vector)}"
+                    )
+            known.update(zip(to_embed.keys(), vectors))
+
+        deleted = apply_report_embedding_diff(
+            report_id,
+            len(chunks),
+            [
+                IReportChunk(
+                    chunk_index=i,
+                    text=chunks[i],
+                    content_hash=hashes[i],
+                    embedding=known[hashes[i]],
+                )
+                for i in changed
+            ],
         )
+        # Cached chat answers were grounded in the old chunks.
+        delete_cached_answers_for_report(report_id)
 
-        logger.info("Stored %d embeddings for report_id=%s", len(chunks), report_id)
+        logger.info(
+            "Updated %d chunks (%d embedded, %d reused), removed %d for report_id=%s",
+            len(changed),
+            len(to_embed),
+            len([i for i in changed if hashes[i] not in to_embed]),
+            deleted,
+            report_id,
+        )
         return IEmbeddingsAgentOutput(
             rund_id=payload.rund_id,
             status="completed",
             output=IOutputData(
                 report_id=report_id,
                 chunk_count=len(chunks),
-                embedding_dim=embedding_dim,
+                embedding_dim=expected_dim,
             ),
         )
 
@@ -150,3 +190,50 @@ def run_embeddings_agent(payload: IEmbeddingsAgentInput) -> IEmbeddingsAgentOutp
             reason_code="processing_error",
             output=None,
         )
+
+
+# Statuses of a job that will still produce (or is producing) embeddings.
+_PENDING_STATUSES = {
+    JobStatus.QUEUED,
+    JobStatus.STARTED,
+    JobStatus.DEFERRED,
+    JobStatus.SCHEDULED,
+}
+
+
+def report_embeddings_job_id(report_id: int) -> str:
+    """Deterministic RQ job id, so callers can find a report's pending job."""
+    return f"report-embeddings-{report_id}"
+
+
+def enqueue_report_embeddings(
+    report_id: int,
+    text: str,
+    *,
+    rund_id: str,
+    file_name: str | None = None,
+) -> Job:
+    """Enqueue the embeddings job for *report_id*, reusing a pending one."""
+    queue = get_queue(QUEUE_EMBEDDINGS)
+    job_id = report_embeddings_job_id(report_id)
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+        if job.get_status() in _PENDING_STATUSES:
+            return job
+    except NoSuchJobError:
+        pass
+
+    constraints: dict[str, object] = {"report_id": report_id}
+    if file_name:
+        constraints["file_name"] = file_name
+    return queue.enqueue(
+        "rag_healthbot_server.services.agents.embeddings_agent.run_embeddings_agent",
+        IEmbeddingsAgentInput(
+            rund_id=rund_id,
+            agent_type=AgentType.REPORT_EMBEDDING,
+            input=IInputData(texts=[text]),
+            constraints=constraints,
+        ),
+        job_id=job_id,
+        job_timeout=10 * 60,
+    )
@@ -7,8 +7,16 @@ from pydantic import BaseModel
 from pydantic.config import ConfigDict
 import logging, coloredlogs
 from langchain.messages import HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
+from rag_healthbot_server.clients import get_chat_model
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.utilities.extraction_cache import (
+    cache_extraction,
+    extraction_cache_key,
+    get_cached_extraction,
+    names_in_chunk,
+)
+from rag_healthbot_server.utilities.report_chunking import section_chunks
+from rag_healthbot_server.utilities.job_timing import record_stage
 from rag_healthbot_server.services.agents.common.entities import (
     MedicationEntity,
     DiseaseEntity,
@@ -117,70 +125,57 @@ Rules:
 # Output is uncapped (None) — the model may emit as many entities as the
 # chunk contains without risk of mid-JSON truncation.  The input side is
 # already bounded by _CHUNK_SIZE_CHARS so context overflow is impossible.
+# Chunks follow section boundaries (one section per call, long sections
+# split with overlap) so a section repeated in another report is the same
+# chunk and hits the extraction cache.
 _CHUNK_SIZE_CHARS = 17_000  # document text per LLM call
-_CHUNK_OVERLAP_CHARS = 500  # overlap to catch entities near chunk boundaries
+_CHUNK_TOKENS = _CHUNK_SIZE_CHARS // 4  # report_chunking estimates ≥4 chars/token
 _MAX_TOKENS_RESPONSE: int | None = None  # no cap — emit all entities
 
 
-def _split_chunks(text: str, chunk_size: int, overlap: int) -> list[str]:
-    """Split *text* into overlapping chunks of at most *chunk_size* chars.
-
-    Each chunk (except the first) starts *overlap* chars before the end of
-    the previous chunk so entities straddling a boundary are not missed.
-    Chunks are cut at the last newline within the chunk to avoid splitting
-    mid-sentence when possible.
-    """
-    if len(text) <= chunk_size:
-        return [text]
-
-    chunks: list[str] = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        if end < len(text):
-            # Prefer cutting at a newline so we don't split mid-sentence
-            nl = text.rfind("\n", start + chunk_size // 2, end)
-            if nl != -1:
-                end = nl + 1
-        chunk = text[start:end]
-        chunks.append(chunk)
-        if end >= len(text):
-            break
-        start = end - overlap
-    return chunks
-
-
-def _prepare_messages(
-    text: str,
+def _ner_context(
+    chunk_text: str,
     classified: ClassifiedEntities | None = None,
     raw_entity_names: list[str] | None = None,
-    chunk_label: str | None = None,
-) -> list[SystemMessage | HumanMessage]:
+) -> str:
+    """NER hints for one chunk: only entities whose names occur in it."""
     ner_context = ""
+    medications: list[str] = []
+    diseases: list[str] = []
+    procedures: list[str] = []
+    if classified:
+        medications = names_in_chunk(classified.medication_names(), chunk_text)
+        diseases = names_in_chunk(classified.disease_names(), chunk_text)
+        procedures = names_in_chunk(classified.procedure_candidate_names(), chunk_text)
+    raw_names = names_in_chunk(raw_entity_names or [], chunk_text)
 
-    if classified and (
-        classified.medications or classified.diseases or classified.procedure_candidates
-    ):
+    if medications or diseases or procedures:
         sections: list[str] = []
-        if classified.medications:
-            sections.append("Medications: " + ", ".join(classified.medication_names()))
-        if classified.diseases:
-            sections.append("Diseases: " + ", ".join(classified.disease_names()))
-        if classified.procedure_candidates:
-            sections.append(
-                "Procedure candidates: "
-                + ", ".join(classified.procedure_candidate_names())
-            )
+        if medications:
+            sections.append("Medications: " + ", ".join(medications))
+        if diseases:
+            sections.append("Diseases: " + ", ".join(diseases))
+        if procedures:
+            sections.append("Procedure candidates: " + ", ".join(procedures))
         ner_context = "\nNER entities:\n" + "\n".join(sections) + "\n"
-    elif raw_entity_names:
-        ner_context = (
-            "\nNER entities (unclassified): " + ", ".join(raw_entity_names) + "\n"
-        )
+    elif raw_names:
+        ner_context = "\nNER entities (unclassified): " + ", ".join(raw_names) + "\n"
+    return ner_context
+
+
+def _system_prompt() -> str:
+    return f"{SYSTEM_PROMPT}\n\n{_FORMAT_INSTRUCTIONS}"
+
 
+def _prepare_messages(
+    text: str,
+    ner_context: str = "",
+    chunk_label: str | None = None,
+) -> list[SystemMessage | HumanMessage]:
     label = f" [{chunk_label}]" if chunk_label else ""
 
     return [
-        SystemMessage(content=f"{SYSTEM_PROMPT}\n\n{_FORMAT_INSTRUCTIONS}"),
+        SystemMessage(content=_system_prompt()),
         HumanMessage(content=(f"{ner_context}\nDocument text{label}:\n{text}")),
     ]
 
@@ -223,9 +218,9 @@ def _merge_outputs(results: list[IOutputData]) -> IOutputData:
 
 
 def _make_llm():
-    llm = ChatGroq(
-        api_key=settings.groq_api_key,
+    llm = get_chat_model(
         model=settings.llm_model,
+        operation="entity_extraction",
         temperature=0.0,
         timeout=30,
         max_tokens=_MAX_TOKENS_RESPONSE,
@@ -372,13 +367,14 @@ def run_medical_entity_extractor_agent(
     classified: ClassifiedEntities | None = None
     raw_entity_names: list[str] | None = None
     try:
-        ner_result = run_scispacy_ner_agent(
-            IScispaCyNERAgentInput(
-                rund_id=payload.rund_id,
-                agent_type=AgentType.MEDICAL_NER,
-                input=INERInputData(text=text),
+        with record_stage("ner"):
+            ner_result = run_scispacy_ner_agent(
+                IScispaCyNERAgentInput(
+                    rund_id=payload.rund_id,
+                    agent_type=AgentType.MEDICAL_NER,
+                    input=INERInputData(text=text),
+                )
             )
-        )
         if ner_result.status == "completed" and ner_result.output is not None:
             classified = ner_result.output.classified_entities
             raw_entity_names = ner_result.output.raw_entity_names
@@ -395,23 +391,47 @@ def run_medical_entity_extractor_agent(
 
     # ── Step 2: LLM classification + enrichment (chunked) ───────────
     llm = _make_llm()
-    chunks = _split_chunks(text, _CHUNK_SIZE_CHARS, _CHUNK_OVERLAP_CHARS)
+    chunks = section_chunks(text, _CHUNK_TOKENS) or [text]
     total_chunks = len(chunks)
     logger.info("Processing %d chunk(s) for entity extraction", total_chunks)
 
     chunk_results: list[IOutputData] = []
+    # The chunk label is left out of the cache key so repeated template
+    # content hits regardless of where it falls in the document.
+    system_prompt = _system_prompt()
 
     for chunk_idx, chunk_text in enumerate(chunks, start=1):
         chunk_label = f"chunk {chunk_idx}/{total_chunks}" if total_chunks > 1 else None
-        messages = _prepare_messages(
-            chunk_text, classified, raw_entity_names, chunk_label=chunk_label
-        )
+        ner_hints = _ner_context(chunk_text, classified, raw_entity_names)
+        messages = _prepare_messages(chunk_text, ner_hints, chunk_label=chunk_label)
 
         chunk_result: IOutputData | None = None
 
+        cache_key = extraction_cache_key(
+            model=settings.llm_model,
+            system_prompt=system_prompt,
+            ner_hints=ner_hints,
+            chunk_text=chunk_text,
+        )
+        cached = get_cached_extraction(cache_key)
+        if cached is not None:
+            try:
+                chunk_result = IOutputData.model_validate_json(cached)
+                logger.info(
+                    "Chunk %d/%d: extraction served from cache", chunk_idx, total_chunks
+                )
+            except Exception as cache_err:
+                logger.warning(
+                    "Ignoring invalid cached extraction for chunk %d: %s",
+                    chunk_idx,
+                    cache_err,
+                )
+
         # Up to 2 attempts per chunk (second call may produce a
         # differently-truncated response that the repair can handle).
         for attempt in range(1, 3):
+            if chunk_result is not None:
+                break
             try:
                 logger.info(
                     "LLM call chunk %d/%d attempt %d (text_len=%d)",
@@ -420,7 +440,11 @@ def run_medical_entity_extractor_agent(
                     attempt,
                     len(chunk_text),
                 )
-                response = llm.invoke(messages)
+                with record_stage(
+                    "llm_extraction",
+                    f"chunk {chunk_idx}/{total_chunks} attempt {attempt}",
+                ):
+                    response = llm.invoke(messages)
                 raw = getattr(response, "content", "") or ""
 
                 # Strip markdown fences
@@ -434,6 +458,8 @@ def run_medical_entity_extractor_agent(
                 # ── Primary parse ──────────────────────────────
                 try:
                     chunk_result = IOutputData.model_validate_json(cleaned)
+                    # Repaired (truncated) outputs are not cached.
+                    cache_extraction(cache_key, chunk_result.model_dump_json())
                     break  # success — stop retrying this chunk
                 except Exception as parse_err:
                     logger.warning(
@@ -1,8 +1,8 @@
 from .common.contracts import IAgentInput, IAgentOutput
 from pydantic import BaseModel
-from langchain_groq import ChatGroq
 from langchain.messages import HumanMessage, SystemMessage
 import logging, coloredlogs
+from rag_healthbot_server.clients import get_chat_model
 from rag_healthbot_server.config import settings
 import base64
 import binascii
@@ -35,9 +35,9 @@ class IOCRAgentOutput(IAgentOutput):
 
 
 def _make_llm():
-    llm = ChatGroq(
-        api_key=settings.groq_api_key,
+    llm = get_chat_model(
         model=settings.groq_ocr_model,
+        operation="ocr",
         temperature=0.2,
         timeout=30,
     )
@@ -1,8 +1,10 @@
+from .common.chunking import split_chunks
 from .common.contracts import IAgentInput, IAgentOutput
 from langchain.messages import HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
+from rag_healthbot_server.clients import get_chat_model
 from rag_healthbot_server.config import settings
 from pydantic import BaseModel
+from typing import Callable
 import logging, coloredlogs
 
 logger = logging.getLogger(__name__)
@@ -10,6 +12,16 @@ coloredlogs.install(level="DEBUG", logger=logger)
 logging.basicConfig(level=logging.DEBUG)
 AGENT = "summarizer_agent"
 
+# Documents longer than this are summarized map-reduce style: the chunks are
+# summarized concurrently (at most SUMMARY_MAX_CONCURRENCY calls at a time),
+# then the partial summaries are merged in groups of at most
+# _REDUCE_INPUT_CHARS, level by level, until one call can merge them.  No
+# reduce prompt grows with the document.
+_MAP_REDUCE_THRESHOLD_CHARS = 24_000
+_CHUNK_SIZE_CHARS = 12_000
+_CHUNK_OVERLAP_CHARS = 300
+_REDUCE_INPUT_CHARS = 12_000
+
 
 class IInputData(BaseModel):
     text: str
@@ -47,28 +59,182 @@ def prepare_content(text: str) -> list[SystemMessage | HumanMessage]:
     ]
 
 
+def prepare_chunk_content(
+    text: str, index: int, total: int
+) -> list[SystemMessage | HumanMessage]:
+    system = SystemMessage(
+        content="You are a summarizer agent that summarizes part of a longer medical document. Summarize the given part concisely, keeping diagnoses, medications with doses, procedures, lab values, dates and follow-up instructions. Only return the summary without any additional commentary or formatting."
+    )
+    human = HumanMessage(
+        content=[
+            {
+                "type": "text",
+                "text": f"Summarize part {index} of {total} of the document.",
+            },
+            {"type": "text", "text": text},
+        ]
+    )
+    return [system, human]
+
+
+def prepare_reduce_content(partials: list[str]) -> list[SystemMessage | HumanMessage]:
+    system = SystemMessage(
+        content="You are a summarizer agent that summarizes medical documents. You receive summaries of consecutive parts of one document and return a single concise summary of the whole document, merging duplicates. Only return the summary without any additional commentary or formatting."
+    )
+    joined = "\n\n".join(
+        f"Part {i} of {len(partials)}:\n{p}" for i, p in enumerate(partials, start=1)
+    )
+    human = HumanMessage(
+        content=[
+            {
+                "type": "text",
+                "text": "Combine these part summaries into one summary of the document.",
+            },
+            {"type": "text", "text": joined},
+        ]
+    )
+    return [system, human]
+
+
+def _stream_summary(llm, messages, on_token: Callable[[str], None]) -> str:
+    """Stream the completion, passing each token to *on_token* as it arrives."""
+    parts: list[str] = []
+    for chunk in llm.stream(messages):
+        token = getattr(chunk, "content", None)
+        if not token or not isinstance(token, str):
+            continue
+        parts.append(token)
+        on_token(token)
+    return "".join(parts)
+
+
+def _complete_all(llm, prompts: list) -> list[str]:
+    """Run the prompts, at most SUMMARY_MAX_CONCURRENCY at a time; failed
+    calls get one retry.
+
+    Raises if a call still fails, so a summary never silently skips part of
+    the document.
+    """
+    results: list[str | None] = [None] * len(prompts)
+    pending = list(range(len(prompts)))
+    for _ in range(2):
+        responses = llm.batch(
+            [prompts[i] for i in pending],
+            config={"max_concurrency": max(1, settings.summary_max_concurrency)},
+            return_exceptions=True,
+        )
+        failed = []
+        for i, response in zip(pending, responses):
+            if isinstance(response, Exception):
+                logger.warning(
+                    f"Summary call {i + 1}/{len(prompts)} failed: {response}"
+                )
+                failed.append(i)
+            else:
+                results[i] = str(getattr(response, "content", "") or "").strip()
+        pending = failed
+        if not pending:
+            return [r or "" for r in results]
+    raise RuntimeError(
+        f"{len(pending)} of {len(prompts)} summary calls failed after a retry"
+    )
+
+
+def _reduce_groups(partials: list[str]) -> list[list[str]]:
+    """Consecutive groups within _REDUCE_INPUT_CHARS, at least two per group
+    so every level shrinks."""
+    groups: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for partial in partials:
+        if len(current) >= 2 and used + len(partial) > _REDUCE_INPUT_CHARS:
+            groups.append(current)
+            current, used = [], 0
+        current.append(partial)
+        used += len(partial)
+    if len(current) == 1 and groups:
+        groups[-1].append(current[0])
+    elif current:
+        groups.append(current)
+    return groups
+
+
+def _map_reduce_summary(
+    llm, text: str, on_token: Callable[[str], None] | None = None
+) -> str | None:
+    chunks = split_chunks(text, _CHUNK_SIZE_CHARS, _CHUNK_OVERLAP_CHARS)
+    logger.info(f"Map-reduce summarization over {len(chunks)} chunks")
+
+    partials = _complete_all(
+        llm,
+        [prepare_chunk_content(c, i, len(chunks)) for i, c in enumerate(chunks, 1)],
+    )
+    partials = [p for p in partials if p]
+    if not partials:
+        raise RuntimeError("Every chunk summary was empty")
+
+    while len(partials) > 1 and sum(map(len, partials)) > _REDUCE_INPUT_CHARS:
+        groups = _reduce_groups(partials)
+        logger.info(
+            f"Reducing {len(partials)} partial summaries in {len(groups)} groups"
+        )
+        partials = [
+            p
+            for p in _complete_all(llm, [prepare_reduce_content(g) for g in groups])
+            if p
+        ]
+        if not partials:
+            raise RuntimeError("Every intermediate summary was empty")
+
+    if len(partials) == 1:
+        if on_token is not None:
+            on_token(partials[0])
+        return partials[0]
+
+    # Only the reduce step is streamed: partial summaries are not shown.
+    if on_token is not None:
+        return _stream_summary(llm, prepare_reduce_content(partials), on_token)
+    response = llm.invoke(prepare_reduce_content(partials))
+    return getattr(response, "content", None)
+
+
 def _make_llm():
-    llm = ChatGroq(
-        api_key=settings.groq_api_key,
+    llm = get_chat_model(
         model=settings.groq_ocr_model,
+        operation="summarize",
         temperature=0.2,
         timeout=30,
     )
     return llm
 
 
-def run_summarizer_agent(payload: ISummarizerAgentInput) -> ISummarizerAgentOutput:
+def run_summarizer_agent(
+    payload: ISummarizerAgentInput,
+    on_token: Callable[[str], None] | None = None,
+) -> ISummarizerAgentOutput:
+    """Summarize ``payload.input.text``.
+
+    With *on_token*, the completion is streamed and each token is passed to
+    it as it arrives; the returned summary is the same.
+    """
     text = payload.input.text
 
     logger.info(f"Running summarizer agent with input text of length: {len(text)}")
 
     llm = _make_llm()
-    content = prepare_content(text)
 
     try:
-        logger.info(f"Invoking LLM for summarization of text of length: {len(text)}")
-        response = llm.invoke(content)
-        summary = getattr(response, "content", None)
+        if len(text) > _MAP_REDUCE_THRESHOLD_CHARS:
+            summary = _map_reduce_summary(llm, text, on_token)
+        elif on_token is not None:
+            logger.info(f"Streaming LLM summarization of text of length: {len(text)}")
+            summary = _stream_summary(llm, prepare_content(text), on_token)
+        else:
+            logger.info(
+                f"Invoking LLM for summarization of text of length: {len(text)}"
+            )
+            response = llm.invoke(prepare_content(text))
+            summary = getattr(response, "content", None)
 
     except Exception as e:
         logger.error(f"Failed to summarize text: {e}")
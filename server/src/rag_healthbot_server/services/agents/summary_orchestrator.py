@@ -1,13 +1,19 @@
-from rq import get_current_job, Queue
+from rq import get_current_job
 from rq.job import Job
 from redis import Redis
-from typing import cast
+from contextlib import contextmanager
+from typing import Iterator, cast
+from uuid import UUID
 from pydantic import BaseModel
 import logging
 import time
 import coloredlogs
 
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.Workers.queues import (
+    QUEUE_CODING,
+    get_queue,
+)
 
 from rag_healthbot_server.utilities.report_persistence import (
     save_report_entities_fast,
@@ -28,10 +34,7 @@ from .medical_entity_extractor_agent import (
     IMedicalEntityExtractorAgentInput,
     IInputData as IEntityInputData,
 )
-from .embeddings_agent import (
-    IEmbeddingsAgentInput,
-    IInputData as IEmbeddingsInputData,
-)
+from .embeddings_agent import enqueue_report_embeddings
 from .report_coding_agent import (
     IReportCodingAgentInput,
     IInputData as IReportCodingInputData,
@@ -46,6 +49,7 @@ from rag_healthbot_server.utilities.hashing import (
     report_content_hash,
     extracted_text_hash,
 )
+from rag_healthbot_server.utilities.minhash import minhash_signature
 from rag_healthbot_server.utilities.medication_normalization import (
     normalize_medication_name,
     normalize_and_dedupe_medications,
@@ -56,6 +60,15 @@ from rag_healthbot_server.utilities.report_utils import (
     report_to_procedure_entities,
 )
 from rag_healthbot_server.utilities.report_dedup import find_existing_report
+from rag_healthbot_server.utilities.report_lock import (
+    lock_for_running_job,
+    release_report_lock,
+)
+from rag_healthbot_server.utilities.summary_stream import (
+    publish_summary_event,
+    summary_token_publisher,
+)
+from rag_healthbot_server.utilities.job_timing import record_stage
 
 from rag_healthbot_server.services.agents.common.contracts import (
     IAgentInput,
@@ -65,14 +78,12 @@ from rag_healthbot_server.services.agents.common.contracts import (
 
 
 redis = Redis.from_url(settings.redis_url)
-queue = Queue("default", connection=redis)
 
 logger = logging.getLogger(__name__)
 coloredlogs.install(level="DEBUG", logger=logger)
 logging.basicConfig(level=logging.DEBUG)
 
 AGENT = "summary_orchestrator"
-LOCK_PREFIX = "lock:report"
 
 
 class IInputData(BaseModel):
@@ -98,8 +109,13 @@ class ISummaryOrchestratorOutput(IAgentOutput):
     output: IOutputData | None = None
 
 
-def _lock_key(file_name: str) -> str:
-    return f"{LOCK_PREFIX}:{file_name}"
+@contextmanager
+def _stage(job: Job, name: str, state: str = "started") -> Iterator[None]:
+    """Publish *name* as the job's current stage and record its timing."""
+    job.meta["stage"] = f"{name}:{state}"
+    job.save_meta()
+    with record_stage(name):
+        yield
 
 
 def _maybe_return_duplicate_report(
@@ -108,10 +124,14 @@ def _maybe_return_duplicate_report(
     *,
     content_hash: str | None,
     extracted_text_hash_value: str | None,
+    minhash: list[int] | None = None,
+    extracted_text: str | None = None,
 ) -> ISummaryOrchestratorOutput | None:
     existing = find_existing_report(
         content_hash=content_hash,
         extracted_text_hash=extracted_text_hash_value,
+        minhash_signature=minhash,
+        extracted_text=extracted_text,
     )
 
     if existing is None:
@@ -120,9 +140,18 @@ def _maybe_return_duplicate_report(
     job.meta["stage"] = "duplicate:skipped"
     job.meta["existing_report_id"] = getattr(existing, "id", None)
     job.save_meta()
+    publish_summary_event(job.id, {"type": "end", "summary": existing.summary or ""})
+
+    return duplicate_report_output(payload.rund_id, existing)
+
 
+def duplicate_report_output(rund_id: UUID, existing) -> ISummaryOrchestratorOutput:
+    """Orchestrator result for an upload matching an already processed report.
+
+    *existing* must have its medication, disease and procedure links loaded.
+    """
     return ISummaryOrchestratorOutput(
-        rund_id=payload.rund_id,
+        rund_id=rund_id,
         status="completed",
         output=IOutputData(
             report_id=existing.id,
@@ -158,10 +187,14 @@ def run_summary_orchestrator(
     content_hash = report_content_hash(file_content)
 
     # ── Distributed lock (prevent duplicate processing) ─────────
-    lock_key = _lock_key(content_hash or file_name)
-    got = redis.set(lock_key, job.id, nx=True, ex=60 * 10)
-    if not got:
+    lock_name = content_hash or file_name
+    with _stage(job, "lock"):
+        holder = lock_for_running_job(lock_name, job.id)
+    if holder is not None:
         logger.info(f"Report processing already in progress for {file_name}")
+        publish_summary_event(
+            job.id, {"type": "error", "error": "Report is already being processed"}
+        )
         return ISummaryOrchestratorOutput(
             rund_id=payload.rund_id,
             status="failed",
@@ -169,31 +202,32 @@ def run_summary_orchestrator(
             output=None,
         )
 
-    # Fast-path: if we've already processed this exact file content, short-circuit.
-    dupe = _maybe_return_duplicate_report(
-        payload,
-        job,
-        content_hash=content_hash,
-        extracted_text_hash_value=None,
-    )
-    if dupe is not None:
-        return dupe
-
+    # Every return from here on must pass through the finally that releases
+    # the lock, or later identical uploads coalesce onto this finished job.
     try:
-        job.meta["stage"] = "ocr:started"
-        job.save_meta()
+        # Fast-path: if we've already processed this exact file content, short-circuit.
+        with _stage(job, "dedup"):
+            dupe = _maybe_return_duplicate_report(
+                payload,
+                job,
+                content_hash=content_hash,
+                extracted_text_hash_value=None,
+            )
+        if dupe is not None:
+            return dupe
 
-        ocr_result = run_ocr_agent(
-            IOCRAgentInput(
-                rund_id=payload.rund_id,
-                agent_type=AgentType.OCR,
-                input=IOcrInputData(
-                    file_name=file_name,
-                    file_content=file_content,
-                    mime_type=mime_type,
-                ),
+        with _stage(job, "ocr"):
+            ocr_result = run_ocr_agent(
+                IOCRAgentInput(
+                    rund_id=payload.rund_id,
+                    agent_type=AgentType.OCR,
+                    input=IOcrInputData(
+                        file_name=file_name,
+                        file_content=file_content,
+                        mime_type=mime_type,
+                    ),
+                )
             )
-        )
 
         if ocr_result.status != "completed" or ocr_result.output is None:
             raise RuntimeError(f"OCR agent failed: {ocr_result.reason_code}")
@@ -202,44 +236,47 @@ def run_summary_orchestrator(
         logger.info(f"OCR completed — extracted {len(extracted_text)} chars")
 
         extracted_text_hash_value = extracted_text_hash(extracted_text)
-
-        # Second fast-path: some older rows may not have content_hash but can be deduped by text.
-        dupe = _maybe_return_duplicate_report(
-            payload,
-            job,
-            content_hash=None,
-            extracted_text_hash_value=extracted_text_hash_value,
-        )
+        minhash = minhash_signature(extracted_text)
+
+        # Second fast-path: some older rows may not have content_hash but can be
+        # deduped by text; re-scans / re-exports match as near-duplicates.
+        with _stage(job, "dedup_text"):
+            dupe = _maybe_return_duplicate_report(
+                payload,
+                job,
+                content_hash=None,
+                extracted_text_hash_value=extracted_text_hash_value,
+                minhash=minhash,
+                extracted_text=extracted_text,
+            )
         if dupe is not None:
             return dupe
 
-        job.meta["stage"] = "summarizer:started"
-        job.save_meta()
-
-        summary_result = run_summarizer_agent(
-            ISummarizerAgentInput(
-                rund_id=payload.rund_id,
-                agent_type=AgentType.SUMMARIZATION,
-                input=ISummarizerInputData(text=extracted_text),
+        with _stage(job, "summarizer"), summary_token_publisher(job.id) as on_token:
+            summary_result = run_summarizer_agent(
+                ISummarizerAgentInput(
+                    rund_id=payload.rund_id,
+                    agent_type=AgentType.SUMMARIZATION,
+                    input=ISummarizerInputData(text=extracted_text),
+                ),
+                on_token=on_token,
             )
-        )
 
         if summary_result.status != "completed" or summary_result.output is None:
             raise RuntimeError(f"Summarizer agent failed: {summary_result.reason_code}")
 
         summary = summary_result.output.summary
+        publish_summary_event(job.id, {"type": "end", "summary": summary})
         logger.info(f"Summarizer completed — summary length {len(summary)}")
 
-        job.meta["stage"] = "entity_extractor:started"
-        job.save_meta()
-
-        entity_result = run_medical_entity_extractor_agent(
-            IMedicalEntityExtractorAgentInput(
-                rund_id=payload.rund_id,
-                agent_type=AgentType.MEDICATION_EXTRACTION,
-                input=IEntityInputData(text=extracted_text),
+        with _stage(job, "entity_extractor"):
+            entity_result = run_medical_entity_extractor_agent(
+                IMedicalEntityExtractorAgentInput(
+                    rund_id=payload.rund_id,
+                    agent_type=AgentType.MEDICATION_EXTRACTION,
+                    input=IEntityInputData(text=extracted_text),
+                )
             )
-        )
 
         if entity_result.status != "completed" or entity_result.output is None:
             raise RuntimeError(
@@ -264,20 +301,19 @@ def run_summary_orchestrator(
             len(procedures),
         )
 
-        job.meta["stage"] = "db_persist:started"
-        job.save_meta()
-
-        report_id = save_report_entities_fast(
-            file_name=file_name,
-            extracted_text=extracted_text,
-            summary=summary,
-            content_hash=content_hash,
-            extracted_text_hash=extracted_text_hash_value,
-            report_date=report_date,
-            medications=medications,
-            diseases=diseases,
-            procedures=procedures,
-        )
+        with _stage(job, "db_persist"):
+            report_id = save_report_entities_fast(
+                file_name=file_name,
+                extracted_text=extracted_text,
+                summary=summary,
+                content_hash=content_hash,
+                extracted_text_hash=extracted_text_hash_value,
+                report_date=report_date,
+                medications=medications,
+                diseases=diseases,
+                procedures=procedures,
+                minhash_signature=minhash,
+            )
 
         logger.info(
             "Persisted report id=%d with %d medications, %d diseases, %d procedures",
@@ -287,36 +323,26 @@ def run_summary_orchestrator(
             len(procedures),
         )
 
-        job.meta["stage"] = "coding:enqueued"
-        job.save_meta()
-
-        queue.enqueue(
-            "rag_healthbot_server.services.agents.report_coding_agent.run_report_coding_agent",
-            IReportCodingAgentInput(
-                rund_id=payload.rund_id,
-                agent_type=AgentType.REPORT_CODING,
-                input=IReportCodingInputData(report_id=report_id),
-            ),
-            job_timeout=10 * 60,
-        )
+        with _stage(job, "coding", "enqueued"):
+            get_queue(QUEUE_CODING).enqueue(
+                "rag_healthbot_server.services.agents.report_coding_agent.run_report_coding_agent",
+                IReportCodingAgentInput(
+                    rund_id=payload.rund_id,
+                    agent_type=AgentType.REPORT_CODING,
+                    input=IReportCodingInputData(report_id=report_id),
+                ),
+                job_timeout=10 * 60,
+            )
 
         logger.info("Enqueued report coding job for report id=%d", report_id)
 
-        job.meta["stage"] = "embeddings:enqueued"
-        job.save_meta()
-
-        queue.enqueue(
-            "rag_healthbot_server.services.agents.embeddings_agent.run_embeddings_agent",
-            IEmbeddingsAgentInput(
+        with _stage(job, "embeddings", "enqueued"):
+            enqueue_report_embeddings(
+                report_id,
+                extracted_text,
                 rund_id=payload.rund_id,
-                agent_type=AgentType.REPORT_EMBEDDING,
-                input=IEmbeddingsInputData(
-                    texts=[extracted_text],
-                ),
-                constraints={"report_id": report_id, "file_name": file_name},
-            ),
-            job_timeout=10 * 60,
-        )
+                file_name=file_name,
+            )
 
         logger.info(f"Enqueued embeddings job for report id={report_id}")
 
@@ -340,6 +366,7 @@ def run_summary_orchestrator(
         job.meta["stage"] = "failed"
         job.meta["error"] = str(e)
         job.save_meta()
+        publish_summary_event(job.id, {"type": "error", "error": str(e)})
         return ISummaryOrchestratorOutput(
             rund_id=payload.rund_id,
             status="failed",
@@ -348,6 +375,6 @@ def run_summary_orchestrator(
         )
 
     finally:
-        redis.delete(lock_key)
+        release_report_lock(lock_name, job.id)
         elapsed = time.time() - start_time
         logger.info(f"Summary orchestrator finished in {elapsed:.2f}s for {file_name}")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from rag_healthbot_server import db
+from rag_healthbot_server.Models.ChatResponseCache import ChatResponseCache
+
+from pydantic import validate_call
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _cutoff(ttl_seconds: int) -> datetime:
+    return datetime.now() - timedelta(seconds=ttl_seconds)
+
+
+@validate_call
+def delete_cached_answers_for_report(report_id: int) -> int:
+    stmt = delete(ChatResponseCache).where(ChatResponseCache.report_id == report_id)
+    try:
+        result = db.session.execute(stmt)
+        db.session.commit()
+        return int(result.rowcount or 0)
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_cached_answer_by_question_async(
+    session: AsyncSession, report_id: int, question_norm: str, ttl_seconds: int
+) -> ChatResponseCache | None:
+    stmt = (
+        select(ChatResponseCache)
+        .where(ChatResponseCache.report_id == report_id)
+        .where(ChatResponseCache.question_norm == question_norm)
+        .where(ChatResponseCache.created_at >= _cutoff(ttl_seconds))
+        .order_by(ChatResponseCache.created_at.desc())
+        .limit(1)
+    )
+    return await session.scalar(stmt)
+
+
+async def find_similar_cached_answer_async(
+    session: AsyncSession,
+    report_id: int,
+    query_embedding: list[float],
+    min_similarity: float,
+    ttl_seconds: int,
+) -> ChatResponseCache | None:
+    distance = ChatResponseCache.embedding.cosine_distance(query_embedding)
+    stmt = (
+        select(ChatResponseCache)
+        .where(ChatResponseCache.report_id == report_id)
+        .where(ChatResponseCache.created_at >= _cutoff(ttl_seconds))
+        .where(distance <= 1.0 - min_similarity)
+        .order_by(distance.asc())
+        .limit(1)
+    )
+    return await session.scalar(stmt)
+
+
+async def create_cached_answer_async(
+    session: AsyncSession,
+    report_id: int,
+    question_norm: str,
+    embedding: list[float],
+    answer: str,
+    ttl_seconds: int,
+) -> None:
+    """Store an answer, purging this report's expired entries in the same commit."""
+    try:
+        await session.execute(
+            delete(ChatResponseCache)
+            .where(ChatResponseCache.report_id == report_id)
+            .where(ChatResponseCache.created_at < _cutoff(ttl_seconds))
+        )
+        session.add(
+            ChatResponseCache(
+                report_id=report_id,
+                question_norm=question_norm,
+                embedding=embedding,
+                answer=answer,
+            )
+        )
+        await session.commit()
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
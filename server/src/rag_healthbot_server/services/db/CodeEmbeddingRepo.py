@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from rag_healthbot_server import db
 from rag_healthbot_server.Models.CodeEmbedding import CodeEmbedding
+from rag_healthbot_server.utilities.vector_storage import nearest_neighbours
 
 from sqlalchemy import select, delete
 from sqlalchemy.exc import SQLAlchemyError
@@ -55,12 +56,17 @@ def search_code_embeddings(
     if top_k <= 0:
         return []
 
-    distance = CodeEmbedding.embedding.cosine_distance(query_embedding)
+    nearest = nearest_neighbours(
+        CodeEmbedding.id,
+        CodeEmbedding.embedding,
+        query_embedding,
+        int(top_k),
+        CodeEmbedding.code_system == code_system,
+    ).subquery("nearest")
     stmt = (
-        select(CodeEmbedding, distance.label("distance"))
-        .where(CodeEmbedding.code_system == code_system)
-        .order_by(distance.asc())
-        .limit(int(top_k))
+        select(CodeEmbedding, nearest.c.distance)
+        .join(nearest, CodeEmbedding.id == nearest.c.id)
+        .order_by(nearest.c.distance.asc())
     )
     results = db.session.execute(stmt).all()
     return [(row[0], float(row[1])) for row in results]
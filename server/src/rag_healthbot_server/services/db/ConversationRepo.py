@@ -1,20 +1,63 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from rag_healthbot_server import db
 from rag_healthbot_server.Models.Conversation import Conversation, IConversation
+from rag_healthbot_server.Models.ConversationMessage import ConversationMessage
 
 from pydantic import validate_call
-from sqlalchemy import select
+from sqlalchemy import Select, or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-@validate_call
-def create_conversation(data: IConversation) -> Conversation:
+def _to_orm(data: IConversation) -> Conversation:
     # Ensure we use the API alias `metadata` while mapping to ORM attribute `metadata_`.
     payload = data.model_dump(by_alias=True)
     if "metadata" in payload and "metadata_" not in payload:
         payload["metadata_"] = payload.pop("metadata")
-    conversation = Conversation(**payload)
+    payload["messages"] = [
+        ConversationMessage(
+            user_content=m.get("userContent"), ai_content=m.get("aiContent")
+        )
+        for m in payload.get("messages") or []
+    ]
+    return Conversation(**payload)
+
+
+def _messages_stmt(
+    conversation_id: int,
+    limit: int | None,
+    before_id: int | None,
+    after_id: int | None = None,
+) -> Select:
+    # Newest first so LIMIT keeps the most recent page; callers reverse it.
+    stmt = select(ConversationMessage).where(
+        ConversationMessage.conversation_id == conversation_id
+    )
+    if before_id is not None:
+        stmt = stmt.where(ConversationMessage.id < before_id)
+    if after_id is not None:
+        stmt = stmt.where(ConversationMessage.id > after_id)
+    stmt = stmt.order_by(ConversationMessage.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _touch_stmt(conversation_id: int):
+    return (
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(updated_at=datetime.now())
+        .returning(Conversation.id)
+    )
+
+
+@validate_call
+def create_conversation(data: IConversation) -> Conversation:
+    conversation = _to_orm(data)
     try:
         db.session.add(conversation)
         db.session.commit()
@@ -50,29 +93,142 @@ def delete_conversation(conversation_id: int) -> bool:
         raise
 
 
+@validate_call
+def list_conversation_messages(
+    conversation_id: int,
+    limit: int | None = None,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> list[ConversationMessage]:
+    """Messages in chronological order; the latest *limit* in the id range."""
+    stmt = _messages_stmt(conversation_id, limit, before_id, after_id)
+    return list(reversed(db.session.scalars(stmt).all()))
+
+
 @validate_call
 def append_conversation_message_pair(
     conversation_id: int,
     user_content: str,
     ai_content: str,
-) -> Conversation | None:
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        return None
-
-    messages = list(conversation.messages or [])
-    messages.append(
-        {
-            "userContent": user_content,
-            "aiContent": ai_content,
-        }
-    )
-    conversation.messages = messages
+) -> ConversationMessage | None:
+    try:
+        if db.session.scalar(_touch_stmt(conversation_id)) is None:
+            db.session.rollback()
+            return None
+        message = ConversationMessage(
+            conversation_id=conversation_id,
+            user_content=user_content,
+            ai_content=ai_content,
+        )
+        db.session.add(message)
+        db.session.commit()
+        db.session.refresh(message)
+        return message
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
 
+
+@validate_call
+def update_conversation_summary(
+    conversation_id: int, summary: str, through_message_id: int
+) -> bool:
+    """Store a rolling summary, only ever moving ``summary_through_message_id`` forward."""
+    stmt = (
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .where(
+            or_(
+                Conversation.summary_through_message_id.is_(None),
+                Conversation.summary_through_message_id < through_message_id,
+            )
+        )
+        .values(summary=summary, summary_through_message_id=through_message_id)
+        .returning(Conversation.id)
+    )
     try:
+        updated = db.session.scalar(stmt) is not None
         db.session.commit()
-        db.session.refresh(conversation)
-        return conversation
+        return updated
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def create_conversation_async(
+    session: AsyncSession, data: IConversation
+) -> Conversation:
+    conversation = _to_orm(data)
+    try:
+        session.add(conversation)
+        await session.commit()
+        await session.refresh(conversation)
+        return conversation
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
+
+
+async def get_conversation_async(
+    session: AsyncSession, conversation_id: int
+) -> Conversation | None:
+    stmt = select(Conversation).where(Conversation.id == conversation_id)
+    return await session.scalar(stmt)
+
+
+async def list_conversations_async(session: AsyncSession) -> list[Conversation]:
+    stmt = select(Conversation).order_by(Conversation.created_at.desc())
+    return list((await session.scalars(stmt)).all())
+
+
+async def delete_conversation_async(
+    session: AsyncSession, conversation_id: int
+) -> bool:
+    conversation = await get_conversation_async(session, conversation_id)
+    if conversation is None:
+        return False
+    try:
+        await session.delete(conversation)
+        await session.commit()
+        return True
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
+
+
+async def list_conversation_messages_async(
+    session: AsyncSession,
+    conversation_id: int,
+    limit: int | None = None,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> list[ConversationMessage]:
+    stmt = _messages_stmt(conversation_id, limit, before_id, after_id)
+    return list(reversed((await session.scalars(stmt)).all()))
+
+
+async def append_conversation_message_pair_async(
+    session: AsyncSession,
+    conversation_id: int,
+    user_content: str,
+    ai_content: str,
+) -> ConversationMessage | None:
+    try:
+        if await session.scalar(_touch_stmt(conversation_id)) is None:
+            await session.rollback()
+            return None
+        message = ConversationMessage(
+            conversation_id=conversation_id,
+            user_content=user_content,
+            ai_content=ai_content,
+        )
+        session.add(message)
+        await session.commit()
+        await session.refresh(message)
+        return message
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -6,6 +6,7 @@ from rag_healthbot_server.Models.Disease import IDisease, Disease
 from pydantic import validate_call
 from sqlalchemy import select, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @validate_call
@@ -83,3 +84,44 @@ def update_disease(disease_id: int, updates: dict[str, str | None]) -> Disease |
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_disease_async(session: AsyncSession, disease_id: int) -> Disease | None:
+    stmt = select(Disease).where(Disease.id == disease_id)
+    return await session.scalar(stmt)
+
+
+async def list_diseases_async(session: AsyncSession) -> list[Disease]:
+    stmt = select(Disease).order_by(Disease.name.asc())
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_disease_async(
+    session: AsyncSession, disease_id: int, updates: dict[str, str | None]
+) -> Disease | None:
+    disease = await get_disease_async(session, disease_id)
+    if disease is None:
+        return None
+
+    for key in (
+        "name",
+        "cui",
+        "icd10_code",
+        "confidence",
+        "review_status",
+        "review_notes",
+        "candidates_json",
+    ):
+        if key in updates:
+            setattr(disease, key, updates[key])
+
+    try:
+        await session.commit()
+        await session.refresh(disease)
+        return disease
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
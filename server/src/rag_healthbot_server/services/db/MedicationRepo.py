@@ -6,6 +6,7 @@ from rag_healthbot_server.Models.Medication import IMedication, Medication
 from pydantic import validate_call
 from sqlalchemy import select, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @validate_call
@@ -111,3 +112,47 @@ def update_medication(
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_medication_async(
+    session: AsyncSession, medication_id: int
+) -> Medication | None:
+    stmt = select(Medication).where(Medication.id == medication_id)
+    return await session.scalar(stmt)
+
+
+async def list_medications_async(session: AsyncSession) -> list[Medication]:
+    stmt = select(Medication).order_by(Medication.name.asc())
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_medication_async(
+    session: AsyncSession, medication_id: int, updates: dict[str, str | None]
+) -> Medication | None:
+    medication = await get_medication_async(session, medication_id)
+    if medication is None:
+        return None
+
+    for key in (
+        "name",
+        "cui",
+        "rxnorm_code",
+        "ndc_code",
+        "confidence",
+        "review_status",
+        "review_notes",
+        "is_drug_class",
+    ):
+        if key in updates:
+            setattr(medication, key, updates[key])
+
+    try:
+        await session.commit()
+        await session.refresh(medication)
+        return medication
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -6,6 +6,7 @@ from rag_healthbot_server.Models.Procedure import IProcedure, Procedure
 from pydantic import validate_call
 from sqlalchemy import select, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @validate_call
@@ -85,3 +86,46 @@ def update_procedure(
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_procedure_async(
+    session: AsyncSession, procedure_id: int
+) -> Procedure | None:
+    stmt = select(Procedure).where(Procedure.id == procedure_id)
+    return await session.scalar(stmt)
+
+
+async def list_procedures_async(session: AsyncSession) -> list[Procedure]:
+    stmt = select(Procedure).order_by(Procedure.name.asc())
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_procedure_async(
+    session: AsyncSession, procedure_id: int, updates: dict[str, str | None]
+) -> Procedure | None:
+    procedure = await get_procedure_async(session, procedure_id)
+    if procedure is None:
+        return None
+
+    for key in (
+        "name",
+        "cui",
+        "cpt_code",
+        "confidence",
+        "review_status",
+        "review_notes",
+        "candidates_json",
+    ):
+        if key in updates:
+            setattr(procedure, key, updates[key])
+
+    try:
+        await session.commit()
+        await session.refresh(procedure)
+        return procedure
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -9,6 +9,8 @@ from rag_healthbot_server.Models.ReportDisease import (
 from pydantic import validate_call
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 
 @validate_call
@@ -73,3 +75,43 @@ def update_report_disease_fields(link_id: int, updates: dict) -> ReportDisease |
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_report_disease_async(
+    session: AsyncSession, report_disease_id: int
+) -> ReportDisease | None:
+    stmt = select(ReportDisease).where(ReportDisease.id == report_disease_id)
+    return await session.scalar(stmt)
+
+
+async def get_diseases_for_report_async(
+    session: AsyncSession, report_id: int
+) -> list[ReportDisease]:
+    stmt = (
+        select(ReportDisease)
+        .where(ReportDisease.report_id == report_id)
+        .options(selectinload(ReportDisease.disease))
+        .order_by(ReportDisease.created_at.desc())
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_report_disease_fields_async(
+    session: AsyncSession, link_id: int, updates: dict
+) -> ReportDisease | None:
+    """Patch arbitrary columns on a report_disease join row."""
+    link = await get_report_disease_async(session, link_id)
+    if link is None:
+        return None
+    for key, value in updates.items():
+        setattr(link, key, value)
+    try:
+        await session.commit()
+        await session.refresh(link)
+        return link
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -6,42 +6,23 @@ from rag_healthbot_server.Models.ReportEmbedding import (
     ReportEmbedding,
 )
 
+from rag_healthbot_server.Models.Report import Report
+from rag_healthbot_server.utilities.text_search import any_term_tsquery
+from rag_healthbot_server.utilities.vector_storage import nearest_neighbours
+
 from pydantic import validate_call, BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-class IReportEmbeddings(BaseModel):
-    report_id: int
-    texts: list[str]
-    embeddings: list[list[float]]
-
-
-@validate_call
-def create_report_embeddings(data: IReportEmbeddings) -> list[ReportEmbedding]:
-    payload = data.model_dump()
-    report_id = payload.pop("report_id")
-    embeddings = payload.pop("embeddings")
-    texts = payload.pop("texts")
-    created_links = []
-    try:
-        for chunk_index, (embedding, text) in enumerate(zip(embeddings, texts)):
-            link = ReportEmbedding(
-                report_id=report_id,
-                chunk_index=chunk_index,
-                embedding=embedding,
-                text=text,
-            )
-            db.session.add(link)
-            created_links.append(link)
-
-        db.session.commit()
-        for link in created_links:
-            db.session.refresh(link)
-        return created_links
-    except SQLAlchemyError:
-        db.session.rollback()
-        raise
+class IReportChunk(BaseModel):
+    chunk_index: int
+    text: str
+    content_hash: str
+    embedding: list[float]
 
 
 @validate_call
@@ -56,24 +37,11 @@ def list_report_embeddings(report_id: int) -> list[ReportEmbedding]:
     return list(db.session.scalars(stmt).all())
 
 
-@validate_call
-def search_report_embeddings_by_cosine_distance(
-    report_id: int,
-    query_embedding: list[float],
-    top_k: int = 6,
-) -> list[ReportEmbedding]:
-    if top_k <= 0:
-        return []
-
-    # pgvector SQLAlchemy comparator exposes cosine_distance.
-    distance = ReportEmbedding.embedding.cosine_distance(query_embedding)
-    stmt = (
-        select(ReportEmbedding)
-        .where(ReportEmbedding.report_id == report_id)
-        .order_by(distance.asc())
-        .limit(int(top_k))
+def _nearest_chunks(query_embedding: list[float], limit: int, *criteria) -> Select:
+    """``(id, distance)`` of the nearest chunks via the configured index."""
+    return nearest_neighbours(
+        ReportEmbedding.id, ReportEmbedding.embedding, query_embedding, limit, *criteria
     )
-    return list(db.session.scalars(stmt).all())
 
 
 @validate_call
@@ -90,22 +58,6 @@ def delete_report_embedding(report_embedding_id: int) -> bool:
         raise
 
 
-@validate_call
-def delete_report_embeddings_by_report_id(report_id: int) -> int:
-    stmt = select(ReportEmbedding).where(ReportEmbedding.report_id == report_id)
-    links = list(db.session.scalars(stmt).all())
-    if not links:
-        return 0
-    try:
-        for link in links:
-            db.session.delete(link)
-        db.session.commit()
-        return len(links)
-    except SQLAlchemyError:
-        db.session.rollback()
-        raise
-
-
 @validate_call
 def update_report_embedding(
     report_embedding_id: int, data: IReportEmbedding
@@ -129,3 +81,273 @@ def update_report_embedding(
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Incremental re-embedding ────────────────────────────────────────
+
+
+@validate_call
+def get_report_chunk_hashes(report_id: int) -> dict[int, str | None]:
+    """``{chunk_index: content_hash}`` for a report, without the vectors."""
+    stmt = select(ReportEmbedding.chunk_index, ReportEmbedding.content_hash).where(
+        ReportEmbedding.report_id == report_id
+    )
+    return {row.chunk_index: row.content_hash for row in db.session.execute(stmt)}
+
+
+@validate_call
+def get_embeddings_by_content_hash(content_hashes: list[str]) -> dict[str, list[float]]:
+    """One stored vector per known hash, from any report.
+
+    Hashes come from :func:`chunk_content_hash`, so only vectors made by the
+    same embedding model match.
+    """
+    if not content_hashes:
+        return {}
+    stmt = (
+        select(ReportEmbedding.content_hash, ReportEmbedding.embedding)
+        .where(ReportEmbedding.content_hash.in_(set(content_hashes)))
+        .distinct(ReportEmbedding.content_hash)
+    )
+    return {
+        row.content_hash: [float(x) for x in row.embedding]
+        for row in db.session.execute(stmt)
+    }
+
+
+@validate_call
+def apply_report_embedding_diff(
+    report_id: int, chunk_count: int, changed: list[IReportChunk]
+) -> int:
+    """Bring a report's chunks in line with a new chunking in one transaction.
+
+    Rows past *chunk_count* are deleted and *changed* chunks are upserted on
+    ``(report_id, chunk_index)``; unchanged rows are not touched.  Returns the
+    number of rows deleted.
+    """
+    try:
+        deleted = db.session.execute(
+            delete(ReportEmbedding).where(
+                ReportEmbedding.report_id == report_id,
+                ReportEmbedding.chunk_index >= chunk_count,
+            )
+        ).rowcount
+        if changed:
+            stmt = insert(ReportEmbedding)
+            db.session.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_report_chunk",
+                    set_={
+                        "text": stmt.excluded.text,
+                        "content_hash": stmt.excluded.content_hash,
+                        "embedding": stmt.excluded.embedding,
+                        "updated_at": func.now(),
+                    },
+                ),
+                [
+                    {
+                        "report_id": report_id,
+                        "chunk_index": chunk.chunk_index,
+                        "text": chunk.text,
+                        "content_hash": chunk.content_hash,
+                        "embedding": chunk.embedding,
+                    }
+                    for chunk in changed
+                ],
+            )
+        db.session.commit()
+        return int(deleted or 0)
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def list_report_embeddings_async(
+    session: AsyncSession, report_id: int
+) -> list[ReportEmbedding]:
+    stmt = select(ReportEmbedding).where(ReportEmbedding.report_id == report_id)
+    return list((await session.scalars(stmt)).all())
+
+
+async def has_report_embeddings_async(session: AsyncSession, report_id: int) -> bool:
+    stmt = select(
+        select(ReportEmbedding.id)
+        .where(ReportEmbedding.report_id == report_id)
+        .exists()
+    )
+    return bool(await session.scalar(stmt))
+
+
+def _hybrid_search_stmt(
+    report_id: int,
+    query_text: str,
+    query_embedding: list[float],
+    top_k: int,
+    candidate_k: int,
+    rrf_k: int,
+    vector_weight: float,
+    lexical_weight: float,
+) -> Select:
+    """Reciprocal-rank fusion of cosine and full-text rankings in one query.
+
+    Each side contributes ``weight / (rrf_k + rank)`` for its top
+    *candidate_k* chunks; a chunk found by only one side still scores.
+    """
+    nearest = _nearest_chunks(
+        query_embedding, candidate_k, ReportEmbedding.report_id == report_id
+    ).subquery("nearest")
+    vector_ranked = select(
+        nearest.c.id,
+        func.row_number().over(order_by=nearest.c.distance.asc()).label("rank"),
+    ).cte("vector_ranked")
+
+    tsquery = any_term_tsquery(query_text)
+    text_rank = func.ts_rank_cd(ReportEmbedding.text_tsv, tsquery)
+    lexical_ranked = (
+        select(
+            ReportEmbedding.id.label("id"),
+            func.row_number().over(order_by=text_rank.desc()).label("rank"),
+        )
+        .where(ReportEmbedding.report_id == report_id)
+        .where(ReportEmbedding.text_tsv.op("@@")(tsquery))
+        .order_by(text_rank.desc())
+        .limit(candidate_k)
+        .cte("lexical_ranked")
+    )
+
+    score = func.coalesce(vector_weight / (rrf_k + vector_ranked.c.rank), 0.0) + (
+        func.coalesce(lexical_weight / (rrf_k + lexical_ranked.c.rank), 0.0)
+    )
+    fused = (
+        select(
+            func.coalesce(vector_ranked.c.id, lexical_ranked.c.id).label("id"),
+            score.label("score"),
+        )
+        .select_from(
+            vector_ranked.join(
+                lexical_ranked,
+                vector_ranked.c.id == lexical_ranked.c.id,
+                full=True,
+            )
+        )
+        .subquery("fused")
+    )
+    return (
+        select(ReportEmbedding)
+        .join(fused, ReportEmbedding.id == fused.c.id)
+        .order_by(fused.c.score.desc(), ReportEmbedding.chunk_index.asc())
+        .limit(top_k)
+    )
+
+
+async def search_report_embeddings_hybrid_async(
+    session: AsyncSession,
+    report_id: int,
+    query_text: str,
+    query_embedding: list[float],
+    top_k: int = 4,
+    candidate_k: int = 20,
+    rrf_k: int = 60,
+    vector_weight: float = 1.0,
+    lexical_weight: float = 1.0,
+) -> list[ReportEmbedding]:
+    if top_k <= 0:
+        return []
+
+    stmt = _hybrid_search_stmt(
+        report_id,
+        query_text,
+        query_embedding,
+        int(top_k),
+        max(int(candidate_k), int(top_k)),
+        int(rrf_k),
+        float(vector_weight),
+        float(lexical_weight),
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+_ITERATIVE_SCAN_MODES = {"strict_order", "relaxed_order"}
+
+
+async def _tune_hnsw_scan(
+    session: AsyncSession, ef_search: int, iterative_scan: str
+) -> None:
+    # SET LOCAL only lasts for the current transaction and cannot take bind
+    # parameters, hence the validated literals.
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    if iterative_scan in _ITERATIVE_SCAN_MODES:
+        await session.execute(text(f"SET LOCAL hnsw.iterative_scan = {iterative_scan}"))
+
+
+async def search_report_embeddings_across_reports_async(
+    session: AsyncSession,
+    query_embedding: list[float],
+    report_ids: list[int] | None = None,
+    top_k: int = 10,
+    per_report_cap: int = 3,
+    ef_search: int = 100,
+    iterative_scan: str = "off",
+) -> list[Row]:
+    """Nearest chunks over *report_ids* (or every report), with provenance.
+
+    The HNSW index produces the candidates (``ef_search`` wide, plus an
+    iterative scan for the ``report_id`` filter on pgvector >= 0.8); capping per report and the final
+    exact ordering happen on that small candidate set.  Rows carry
+    ``id, report_id, chunk_index, text, distance, file_name,
+    report_created_at``.
+    """
+    if top_k <= 0 or report_ids == []:
+        return []
+
+    await _tune_hnsw_scan(session, ef_search, iterative_scan)
+
+    criteria = []
+    if report_ids is not None:
+        criteria.append(ReportEmbedding.report_id.in_(report_ids))
+    nearest = _nearest_chunks(
+        query_embedding,
+        max(int(ef_search), int(top_k) * int(per_report_cap)),
+        *criteria,
+    ).subquery("nearest")
+    candidates = (
+        select(
+            ReportEmbedding.id,
+            ReportEmbedding.report_id,
+            ReportEmbedding.chunk_index,
+            ReportEmbedding.text,
+            nearest.c.distance,
+        )
+        .join(nearest, ReportEmbedding.id == nearest.c.id)
+        .cte("candidates")
+    )
+
+    ranked = select(
+        candidates,
+        func.row_number()
+        .over(
+            partition_by=candidates.c.report_id,
+            order_by=candidates.c.distance.asc(),
+        )
+        .label("report_rank"),
+    ).subquery("ranked")
+
+    stmt = (
+        select(
+            ranked.c.id,
+            ranked.c.report_id,
+            ranked.c.chunk_index,
+            ranked.c.text,
+            ranked.c.distance,
+            Report.file_name,
+            Report.created_at.label("report_created_at"),
+        )
+        .join(Report, Report.id == ranked.c.report_id)
+        .where(ranked.c.report_rank <= int(per_report_cap))
+        .order_by(ranked.c.distance.asc())
+        .limit(int(top_k))
+    )
+    return list((await session.execute(stmt)).all())
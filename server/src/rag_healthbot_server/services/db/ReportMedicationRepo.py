@@ -9,6 +9,8 @@ from rag_healthbot_server.Models.ReportMedication import (
 from pydantic import validate_call
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 
 @validate_call
@@ -107,3 +109,43 @@ def update_report_medication(
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_report_medication_async(
+    session: AsyncSession, report_medication_id: int
+) -> ReportMedication | None:
+    stmt = select(ReportMedication).where(ReportMedication.id == report_medication_id)
+    return await session.scalar(stmt)
+
+
+async def get_medications_for_report_async(
+    session: AsyncSession, report_id: int
+) -> list[ReportMedication]:
+    stmt = (
+        select(ReportMedication)
+        .where(ReportMedication.report_id == report_id)
+        .options(selectinload(ReportMedication.medication))
+        .order_by(ReportMedication.created_at.desc())
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_report_medication_fields_async(
+    session: AsyncSession, link_id: int, updates: dict
+) -> ReportMedication | None:
+    """Patch arbitrary columns on a report_medication join row."""
+    link = await get_report_medication_async(session, link_id)
+    if link is None:
+        return None
+    for key, value in updates.items():
+        setattr(link, key, value)
+    try:
+        await session.commit()
+        await session.refresh(link)
+        return link
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -9,6 +9,8 @@ from rag_healthbot_server.Models.ReportProcedure import (
 from pydantic import validate_call
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 
 @validate_call
@@ -75,3 +77,43 @@ def update_report_procedure_fields(
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+
+
+async def get_report_procedure_async(
+    session: AsyncSession, report_procedure_id: int
+) -> ReportProcedure | None:
+    stmt = select(ReportProcedure).where(ReportProcedure.id == report_procedure_id)
+    return await session.scalar(stmt)
+
+
+async def get_procedures_for_report_async(
+    session: AsyncSession, report_id: int
+) -> list[ReportProcedure]:
+    stmt = (
+        select(ReportProcedure)
+        .where(ReportProcedure.report_id == report_id)
+        .options(selectinload(ReportProcedure.procedure))
+        .order_by(ReportProcedure.created_at.desc())
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def update_report_procedure_fields_async(
+    session: AsyncSession, link_id: int, updates: dict
+) -> ReportProcedure | None:
+    """Patch arbitrary columns on a report_procedure join row."""
+    link = await get_report_procedure_async(session, link_id)
+    if link is None:
+        return None
+    for key, value in updates.items():
+        setattr(link, key, value)
+    try:
+        await session.commit()
+        await session.refresh(link)
+        return link
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
@@ -3,11 +3,16 @@ from __future__ import annotations
 from rag_healthbot_server import db
 from rag_healthbot_server.Models.Report import IReport, Report
 from rag_healthbot_server.Models.ReportMedication import ReportMedication
+from rag_healthbot_server.Models.ReportDisease import ReportDisease
+from rag_healthbot_server.Models.ReportProcedure import ReportProcedure
 
 from pydantic import validate_call
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from rag_healthbot_server.utilities.text_search import any_term_tsquery
 
 
 def _sync_report_medications(report: Report, medication_ids: list[int]) -> None:
@@ -77,6 +82,51 @@ def get_report_by_extracted_text_hash(extracted_text_hash: str) -> Report | None
     return db.session.scalar(stmt)
 
 
+@validate_call
+def get_near_duplicate_candidates(
+    bands: list[int], limit: int = 50
+) -> list[tuple[int, list[int]]]:
+    """``(report_id, minhash_signature)`` of reports sharing an LSH band."""
+    stmt = (
+        select(Report.id, Report.minhash_signature)
+        .where(Report.minhash_bands.overlap(bands))
+        .order_by(Report.id.desc())
+        .limit(limit)
+    )
+    return [(row.id, list(row.minhash_signature)) for row in db.session.execute(stmt)]
+
+
+@validate_call
+def list_reports_missing_minhash(
+    after_id: int = 0, limit: int = 200
+) -> list[tuple[int, str]]:
+    """``(id, extracted_text)`` of reports without a MinHash fingerprint."""
+    stmt = (
+        select(Report.id, Report.extracted_text)
+        .where(
+            Report.id > after_id,
+            Report.minhash_signature.is_(None),
+            Report.extracted_text.is_not(None),
+        )
+        .order_by(Report.id)
+        .limit(limit)
+    )
+    return [(row.id, row.extracted_text) for row in db.session.execute(stmt)]
+
+
+@validate_call
+def set_report_minhash(rows: list[dict]) -> None:
+    """Bulk-set ``minhash_signature`` / ``minhash_bands`` by report ``id``."""
+    if not rows:
+        return
+    try:
+        db.session.execute(update(Report), rows)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
 def list_reports() -> list[Report]:
     stmt = select(Report).order_by(Report.created_at.desc())
     return list(db.session.scalars(stmt).all())
@@ -124,3 +174,73 @@ def update_report(report_id: int, data: IReport) -> Report | None:
     except SQLAlchemyError:
         db.session.rollback()
         raise
+
+
+# ── Async variants (API routes) ─────────────────────────────────────
+# Async sessions cannot lazy-load, so every entity link the API serialises
+# is eager-loaded up front.
+
+
+def _with_entity_links(stmt):
+    return stmt.options(
+        selectinload(Report.medications).selectinload(ReportMedication.medication),
+        selectinload(Report.diseases).selectinload(ReportDisease.disease),
+        selectinload(Report.procedures).selectinload(ReportProcedure.procedure),
+    )
+
+
+async def get_report_async(session: AsyncSession, report_id: int) -> Report | None:
+    stmt = _with_entity_links(select(Report).where(Report.id == report_id))
+    return await session.scalar(stmt)
+
+
+async def get_report_by_content_hash_async(
+    session: AsyncSession, content_hash: str
+) -> Report | None:
+    stmt = _with_entity_links(select(Report).where(Report.content_hash == content_hash))
+    return await session.scalar(stmt)
+
+
+async def list_reports_async(session: AsyncSession) -> list[Report]:
+    stmt = _with_entity_links(select(Report).order_by(Report.created_at.desc()))
+    return list((await session.scalars(stmt)).all())
+
+
+async def get_report_summary_async(session: AsyncSession, report_id: int) -> str | None:
+    return await session.scalar(select(Report.summary).where(Report.id == report_id))
+
+
+# Fragment separator passed to ts_headline; split back out in Python.
+_FRAGMENT_DELIMITER = " ... "
+
+
+async def search_report_text_async(
+    session: AsyncSession,
+    report_id: int,
+    query_text: str,
+    max_fragments: int = 4,
+) -> list[str]:
+    """Full-text excerpts of a report's extracted text matching *query_text*.
+
+    Used while a report's chunk embeddings are still being built: a single
+    document is small enough to search without an index.  Returns ``[]``
+    when nothing matches.
+    """
+    tsquery = any_term_tsquery(query_text)
+    document = func.coalesce(Report.extracted_text, "")
+    headline = func.ts_headline(
+        "english",
+        document,
+        tsquery,
+        f"MaxFragments={int(max_fragments)}, MinWords=30, MaxWords=80, "
+        f'StartSel="", StopSel="", FragmentDelimiter="{_FRAGMENT_DELIMITER}"',
+    )
+    stmt = (
+        select(headline)
+        .where(Report.id == report_id)
+        .where(func.to_tsvector("english", document).op("@@")(tsquery))
+    )
+    excerpts = await session.scalar(stmt)
+    if not excerpts:
+        return []
+    return [f.strip() for f in excerpts.split(_FRAGMENT_DELIMITER) if f.strip()]
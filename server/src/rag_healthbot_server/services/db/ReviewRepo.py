@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from rag_healthbot_server.Models.Disease import Disease
+from rag_healthbot_server.Models.Medication import Medication
+from rag_healthbot_server.Models.Procedure import Procedure
+
+from sqlalchemy import (
+    Select,
+    String,
+    Text,
+    func,
+    literal_column,
+    null,
+    select,
+    union_all,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ENTITY_TYPES = ("disease", "procedure", "medication")
+
+
+def _entity_type_column(entity_type: str):
+    # Rendered inline rather than bound: asyncpg cannot infer the type of a
+    # bare parameter inside a UNION.
+    return literal_column(f"'{entity_type}'", String).label("entity_type")
+
+
+def _queue_select(entity_type: str, status: str) -> Select:
+    """Project one entity table onto the common review-queue columns."""
+    if entity_type == "disease":
+        model, code, candidates = Disease, Disease.icd10_code, Disease.candidates_json
+    elif entity_type == "procedure":
+        model, code, candidates = (
+            Procedure,
+            Procedure.cpt_code,
+            Procedure.candidates_json,
+        )
+    else:
+        model, code, candidates = (
+            Medication,
+            null().cast(String),
+            null().cast(Text),
+        )
+
+    return select(
+        _entity_type_column(entity_type),
+        model.id.label("id"),
+        model.name.label("name"),
+        model.cui.label("cui"),
+        code.label("code"),
+        model.confidence.label("confidence"),
+        model.review_status.label("review_status"),
+        model.review_notes.label("review_notes"),
+        candidates.label("candidates_json"),
+    ).where(model.review_status == status)
+
+
+async def list_review_queue_async(
+    session: AsyncSession,
+    status: str,
+    entity_type: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> list[Row]:
+    """Entities in *status*, least confident first, paginated in SQL.
+
+    ``NULLS FIRST`` matches the old in-Python ``confidence or 0.0`` ordering
+    and the partial ``(confidence ASC NULLS FIRST)`` indexes on each table.
+    """
+    types = ENTITY_TYPES if entity_type is None else (entity_type,)
+    queue = union_all(*(_queue_select(t, status) for t in types)).subquery()
+    stmt = (
+        select(queue)
+        .order_by(
+            queue.c.confidence.asc().nullsfirst(),
+            queue.c.entity_type,
+            queue.c.id,
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    return list((await session.execute(stmt)).all())
+
+
+async def count_review_statuses_async(
+    session: AsyncSession,
+) -> dict[tuple[str, str], int]:
+    """``{(entity_type, review_status): count}`` from one grouped query."""
+    counts = union_all(
+        *(
+            select(
+                _entity_type_column(entity_type),
+                model.review_status.label("review_status"),
+                func.count().label("n"),
+            ).group_by(model.review_status)
+            for entity_type, model in (
+                ("disease", Disease),
+                ("procedure", Procedure),
+                ("medication", Medication),
+            )
+        )
+    )
+    rows = (await session.execute(counts)).all()
+    return {(row.entity_type, row.review_status): int(row.n) for row in rows}
@@ -0,0 +1,219 @@
+"""Batched, concurrent document embedding across one or more Ollama hosts.
+
+:func:`embed_texts` splits its input into batches bounded by
+``EMBED_BATCH_TOKENS`` (estimated) and ``EMBED_BATCH_MAX_TEXTS``, sends them
+concurrently and returns the vectors in input order.
+
+* Hosts — every server listed in ``OLLAMA_HOST`` (comma-separated) takes
+  batches in round-robin order, so throughput scales with embedding servers.
+* Backpressure — at most ``EMBED_MAX_IN_FLIGHT`` requests per host are in
+  flight across every API and worker process.  The slots are a Redis sorted
+  set per host (member = holder, score = lease expiry), so a holder that
+  dies frees its slot once the lease runs out.  If Redis is unreachable the
+  limit falls back to a per-process semaphore.
+* Retries — connection errors, timeouts, 429 and 5xx responses are retried
+  up to ``EMBED_MAX_RETRIES`` times with jittered exponential backoff, each
+  attempt on the next host.  Other errors propagate immediately.
+
+Single query embeddings on the request path keep using the shared client
+from :mod:`rag_healthbot_server.clients` directly.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+from redis import Redis
+from redis.exceptions import RedisError
+
+from rag_healthbot_server.clients import get_embedder, ollama_hosts
+from rag_healthbot_server.config import settings
+from rag_healthbot_server.metrics import (
+    EMBEDDING_REQUEST_SECONDS,
+    EMBEDDING_RETRIES_TOTAL,
+)
+from rag_healthbot_server.utilities.report_chunking import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 30.0
+
+SLOTS_KEY_PREFIX = "embed-slots"
+# Longest a slot is held: a request cannot outlive its own timeout.
+_SLOT_LEASE_MARGIN_SECONDS = 30.0
+_SLOT_POLL_SECONDS = (0.05, 0.5)
+
+redis = Redis.from_url(settings.redis_url)
+
+# KEYS[1] slot set; ARGV: limit, now, lease seconds, holder.
+_ACQUIRE_SLOT = redis.register_script("""
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+    if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+        redis.call('ZADD', KEYS[1], tonumber(ARGV[2]) + tonumber(ARGV[3]), ARGV[4])
+        redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])))
+        return 1
+    end
+    return 0
+    """)
+
+_slots_lock = threading.Lock()
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_next_host = itertools.count()
+
+
+def _local_slot(host: str) -> threading.BoundedSemaphore:
+    with _slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = threading.BoundedSemaphore(max(1, settings.embed_max_in_flight))
+            _host_slots[host] = slot
+        return slot
+
+
+def _acquire_shared_slot(key: str, holder: str) -> None:
+    limit = max(1, settings.embed_max_in_flight)
+    lease = settings.embed_timeout_seconds + _SLOT_LEASE_MARGIN_SECONDS
+    delay = _SLOT_POLL_SECONDS[0]
+    while not _ACQUIRE_SLOT(keys=[key], args=[limit, time.time(), lease, holder]):
+        time.sleep(delay * (0.5 + random.random()))
+        delay = min(_SLOT_POLL_SECONDS[1], delay * 2)
+
+
+@contextmanager
+def _slot(host: str) -> Iterator[None]:
+    """Hold one of *host*'s ``EMBED_MAX_IN_FLIGHT`` slots."""
+    key = f"{SLOTS_KEY_PREFIX}:{host}"
+    holder = uuid.uuid4().hex
+    try:
+        _acquire_shared_slot(key, holder)
+    except RedisError as e:
+        logger.warning("Embedding slot lookup failed (%s); limiting per process", e)
+        with _local_slot(host):
+            yield
+        return
+    try:
+        yield
+    finally:
+        try:
+            redis.zrem(key, holder)
+        except RedisError as e:
+            # The lease expires on its own.
+            logger.warning("Embedding slot release failed: %s", e)
+
+
+def make_batches(texts: list[str], max_tokens: int, max_texts: int) -> list[list[int]]:
+    """Group indices of *texts* into batches within both limits.
+
+    A single text over *max_tokens* still gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for i, text in enumerate(texts):
+        cost = count_tokens(text)
+        if current and (used + cost > max_tokens or len(current) >= max_texts):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def _embed_batch(texts: list[str], operation: str, model: str) -> list[list[float]]:
+    hosts = ollama_hosts()
+    first = next(_next_host)
+    retries = max(0, settings.embed_max_retries)
+    for attempt in range(retries + 1):
+        host = hosts[(first + attempt) % len(hosts)]
+        try:
+            embedder = get_embedder(
+                base_url=host, model=model, timeout=settings.embed_timeout_seconds
+            )
+            with _slot(host):
+                with EMBEDDING_REQUEST_SECONDS.labels(
+                    model=model, operation=operation
+                ).time():
+                    vectors = embedder.embed_documents(texts)
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"Embedding count mismatch: got {len(vectors)} vectors "
+                    f"for {len(texts)} texts"
+                )
+            return vectors
+        except Exception as e:
+            if attempt >= retries or not _is_transient(e):
+                raise
+            EMBEDDING_RETRIES_TOTAL.labels(host=host).inc()
+            delay = min(_MAX_BACKOFF_SECONDS, 0.5 * 2**attempt)
+            delay *= 0.5 + random.random()
+            logger.warning(
+                "Embedding batch of %d failed on %s (%s); retrying in %.1fs",
+                len(texts),
+                host,
+                e,
+                delay,
+            )
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def embed_texts(
+    texts: list[str], *, operation: str, model: str | None = None
+) -> list[list[float]]:
+    """Embed *texts* as documents; vectors are returned in input order."""
+    if not texts:
+        return []
+    model = model or settings.ollama_embed_model
+    hosts = ollama_hosts()
+    if not hosts or not model:
+        raise ValueError("OLLAMA_HOST and OLLAMA_MODEL must be set")
+
+    batches = make_batches(
+        texts,
+        max(1, settings.embed_batch_tokens),
+        max(1, settings.embed_batch_max_texts),
+    )
+    if len(batches) == 1:
+        return _embed_batch(texts, operation, model)
+
+    def run(indices: list[int]) -> list[list[float]]:
+        return _embed_batch([texts[i] for i in indices], operation, model)
+
+    workers = min(len(batches), len(hosts) * max(1, settings.embed_max_in_flight))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+        results = list(pool.map(run, batches))
+
+    vectors: list[list[float]] = [[] for _ in texts]
+    for indices, batch_vectors in zip(batches, results):
+        for i, vector in zip(indices, batch_vectors):
+            vectors[i] = vector
+    return vectors
+
+
+def _reset_after_fork() -> None:
+    # A semaphore held by another thread at fork time would never be released.
+    global _slots_lock
+    _slots_lock = threading.Lock()
+    _host_slots.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
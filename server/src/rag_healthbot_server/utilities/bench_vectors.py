@@ -0,0 +1,115 @@
+"""
+Compare recall and latency of the vector index forms on live data.
+
+Samples stored embeddings as queries, computes their exact top-k with a
+sequential scan, then runs the same queries through each ``VECTOR_STORAGE``
+mode (see ``utilities/vector_storage.py``) and reports recall@k, p50/p95
+latency and the size of every HNSW index on the table.
+
+Only the ``VECTOR_STORAGE`` index exists in a normal deployment, so the
+other modes run without an index; to compare them, build each in turn on a
+staging copy with ``uv run vector-indexes --mode <mode>``.
+
+Usage (via CLI entry-point defined in pyproject.toml):
+    uv run bench-vectors                      # report_embedding, 50 queries, k=10
+    uv run bench-vectors --table code         # code_embedding
+    uv run bench-vectors --queries 200 --k 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import func, select, text
+
+from rag_healthbot_server import db
+from rag_healthbot_server.Models.CodeEmbedding import CodeEmbedding
+from rag_healthbot_server.Models.ReportEmbedding import ReportEmbedding
+from rag_healthbot_server.utilities.job_timing import percentile
+from rag_healthbot_server.utilities.vector_storage import (
+    VECTOR_STORAGE_MODES,
+    nearest_neighbours,
+)
+
+_MODELS = {"report": ReportEmbedding, "code": CodeEmbedding}
+
+
+def _sample_queries(model, count: int) -> list[list[float]]:
+    stmt = select(model.embedding).order_by(func.random()).limit(count)
+    return [[float(x) for x in v] for v in db.session.scalars(stmt)]
+
+
+def _exact_top_k(model, query: list[float], k: int) -> set[int]:
+    # Force a sequential scan so the ground truth is not itself approximate.
+    db.session.execute(text("SET LOCAL enable_indexscan = off"))
+    distance = model.embedding.cosine_distance(query)
+    ids = set(db.session.scalars(select(model.id).order_by(distance).limit(k)))
+    db.session.rollback()
+    return ids
+
+
+def _index_sizes(table: str) -> list[tuple[str, str]]:
+    rows = db.session.execute(
+        text("""
+            SELECT indexrelid::regclass::text AS name,
+                   pg_size_pretty(pg_relation_size(indexrelid)) AS size
+            FROM pg_index
+            JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+            JOIN pg_am ON pg_am.oid = pg_class.relam
+            WHERE indrelid = CAST(:table AS regclass) AND pg_am.amname = 'hnsw'
+            ORDER BY pg_relation_size(indexrelid) DESC
+            """),
+        {"table": table},
+    )
+    return [(row.name, row.size) for row in rows]
+
+
+def bench_vectors(table: str = "report", queries: int = 50, k: int = 10) -> dict:
+    """Return ``{mode: {"recall": r, "p50_ms": ..., "p95_ms": ...}}``."""
+    model = _MODELS[table]
+    samples = _sample_queries(model, queries)
+    if not samples:
+        return {}
+    truth = [_exact_top_k(model, q, k) for q in samples]
+
+    results: dict[str, dict[str, float]] = {}
+    for mode in VECTOR_STORAGE_MODES:
+        latencies: list[float] = []
+        hits = 0
+        for query, expected in zip(samples, truth):
+            stmt = nearest_neighbours(model.id, model.embedding, query, k, mode=mode)
+            start = time.perf_counter()
+            found = {row.id for row in db.session.execute(stmt)}
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(found & expected)
+        db.session.rollback()
+        results[mode] = {
+            "recall": hits / sum(len(e) for e in truth) if any(truth) else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+        }
+    return results
+
+
+def bench_vectors_cli():
+    """CLI entry-point: benchmark float32 / halfvec / binary vector search."""
+    parser = argparse.ArgumentParser(prog="bench-vectors")
+    parser.add_argument("--table", choices=sorted(_MODELS), default="report")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    results = bench_vectors(args.table, args.queries, args.k)
+    if not results:
+        print("No embeddings stored; nothing to benchmark.")
+        return
+
+    print(f"{args.queries} queries, recall@{args.k} against exact search\n")
+    print(f"{'mode':<10}{'recall':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['recall']:>8.3f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+
+    print("\nHNSW index sizes:")
+    for name, size in _index_sizes(_MODELS[args.table].__tablename__):
+        print(f"  {name:<40}{size:>10}")
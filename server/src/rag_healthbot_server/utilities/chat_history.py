@@ -0,0 +1,215 @@
+"""Token-budgeted chat history with a rolling summary.
+
+Chat prompts carry the conversation's rolling summary plus only the most
+recent turns verbatim (:func:`history_window`: at most ``CHAT_HISTORY_TURNS``,
+trimmed to ``CHAT_HISTORY_TOKEN_BUDGET``).  After each turn
+:func:`refresh_rolling_summary` folds every turn older than the first one in
+that same window into ``conversation.summary``, so no turn is ever both
+missing from the prompt and missing from the summary, and prompt size — and
+time-to-first-token — stays flat as a chat grows.
+
+Token counts are estimated at ~4 characters per token, the same rule of thumb
+the entity extractor uses for its chunk budget.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Sequence
+
+from langchain.messages import HumanMessage, SystemMessage
+from langchain_groq import ChatGroq
+
+from rag_healthbot_server import db
+from rag_healthbot_server.clients import get_chat_model
+from rag_healthbot_server.config import settings
+from rag_healthbot_server.Models.ConversationMessage import ConversationMessage
+from rag_healthbot_server.services.db.ConversationRepo import (
+    get_conversation,
+    list_conversation_messages,
+    update_conversation_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4
+
+# Upper bound on the transcript folded into the summary per LLM call, so a
+# long backlog (e.g. a conversation that predates summaries) is caught up in
+# several bounded steps.
+_FOLD_BATCH_TOKENS = 3000
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and a "
+    "medical-information assistant. Merge the new exchanges into the current "
+    "summary. Keep facts the user stated about themselves (symptoms, "
+    "medications, conditions, dates), questions asked and the key points of "
+    "the answers. Drop pleasantries. Reply with the updated summary only, in "
+    "at most {max_words} words."
+)
+
+
+def estimate_tokens(text: str | None) -> int:
+    return -(-len(text or "") // _CHARS_PER_TOKEN)
+
+
+def _turn_tokens(message: ConversationMessage) -> int:
+    return estimate_tokens(message.user_content) + estimate_tokens(message.ai_content)
+
+
+def select_recent_turns(
+    messages: Sequence[ConversationMessage],
+    *,
+    max_turns: int,
+    token_budget: int,
+) -> list[ConversationMessage]:
+    """Newest *messages* (chronological input) that fit the window.
+
+    The latest turn is always kept so the model sees the immediate context
+    even when it alone exceeds the budget.
+    """
+    kept: list[ConversationMessage] = []
+    used = 0
+    for message in reversed(messages):
+        cost = _turn_tokens(message)
+        if kept and (len(kept) >= max_turns or used + cost > token_budget):
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    return kept
+
+
+def history_window(
+    messages: Sequence[ConversationMessage],
+) -> list[ConversationMessage]:
+    """The turns sent verbatim in the prompt, out of the newest *messages*.
+
+    The chat route and :func:`refresh_rolling_summary` must agree on this
+    window; anything older belongs in the rolling summary.
+    """
+    return select_recent_turns(
+        messages,
+        max_turns=settings.chat_history_turns,
+        token_budget=settings.chat_history_token_budget,
+    )
+
+
+def fit_to_budget(chunks: Sequence[str], token_budget: int) -> list[str]:
+    """Leading *chunks* (best match first) whose combined size fits the budget."""
+    kept: list[str] = []
+    used = 0
+    for chunk in chunks:
+        cost = estimate_tokens(chunk)
+        if used + cost > token_budget:
+            if not kept:
+                # Never return nothing just because the best excerpt is long.
+                kept.append(chunk[: token_budget * _CHARS_PER_TOKEN])
+            break
+        kept.append(chunk)
+        used += cost
+    return kept
+
+
+def _make_summary_llm() -> ChatGroq:
+    if not settings.groq_api_key:
+        raise ValueError("GROQ_API_KEY must be set")
+    if not settings.llm_model:
+        raise ValueError("LLM_MODEL must be set")
+
+    return get_chat_model(
+        model=settings.llm_model,
+        operation="chat_summary",
+        temperature=0,
+        timeout=60,
+        max_tokens=settings.chat_summary_token_budget * 2,
+    )
+
+
+def _format_transcript(messages: Sequence[ConversationMessage]) -> str:
+    lines: list[str] = []
+    for m in messages:
+        if m.user_content:
+            lines.append(f"User: {m.user_content.strip()}")
+        if m.ai_content:
+            lines.append(f"Assistant: {m.ai_content.strip()}")
+    return "\n".join(lines)
+
+
+def _fold_batches(
+    messages: Sequence[ConversationMessage],
+) -> list[list[ConversationMessage]]:
+    batches: list[list[ConversationMessage]] = []
+    current: list[ConversationMessage] = []
+    used = 0
+    for m in messages:
+        cost = _turn_tokens(m)
+        if current and used + cost > _FOLD_BATCH_TOKENS:
+            batches.append(current)
+            current, used = [], 0
+        current.append(m)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _extend_summary(
+    llm: ChatGroq, summary: str | None, messages: Sequence[ConversationMessage]
+) -> str:
+    # Rough words-per-token ratio for English prose.
+    max_words = max(50, int(settings.chat_summary_token_budget * 0.75))
+    response = llm.invoke(
+        [
+            SystemMessage(content=_SUMMARY_SYSTEM_PROMPT.format(max_words=max_words)),
+            HumanMessage(
+                content=(
+                    f"Current summary:\n{(summary or '').strip() or '(none)'}\n\n"
+                    f"New exchanges:\n{_format_transcript(messages)}"
+                )
+            ),
+        ]
+    )
+    return str(getattr(response, "content", "") or "").strip()
+
+
+def refresh_rolling_summary(conversation_id: int) -> None:
+    """Fold turns older than the verbatim window into the rolling summary.
+
+    Meant to run after a chat response has been sent (as a response
+    background task, in a threadpool thread); failures are logged and the next
+    turn retries.  The thread's scoped session is released afterwards.
+    """
+    try:
+        conversation = get_conversation(conversation_id)
+        if conversation is None:
+            return
+
+        recent = history_window(
+            list_conversation_messages(
+                conversation_id, limit=settings.chat_history_turns
+            )
+        )
+        if not recent:
+            return
+        pending = list_conversation_messages(
+            conversation_id,
+            before_id=recent[0].id,
+            after_id=conversation.summary_through_message_id,
+        )
+        if not pending:
+            return
+
+        llm = _make_summary_llm()
+        summary = conversation.summary
+        for batch in _fold_batches(pending):
+            summary = _extend_summary(llm, summary, batch)
+            update_conversation_summary(conversation_id, summary, batch[-1].id)
+    except Exception as e:
+        logger.warning(
+            "Rolling summary update failed for conversation_id=%s: %s",
+            conversation_id,
+            e,
+        )
+    finally:
+        db.remove_session()
@@ -0,0 +1,55 @@
+"""Bounded in-process cache of resolved entity ids for report persistence.
+
+:func:`save_report_entities_fast` resolves every extracted medication, disease
+and procedure to a canonical row.  Once a row is fully coded the resolution
+of the same input never changes (no further updates are needed), so its id is
+remembered here and the lookup query is skipped next time.
+
+Entries expire after ``_TTL_SECONDS`` so rows deleted or re-coded from another
+process are picked up again eventually.  Under the default forking RQ worker
+the cache lives for one work horse (one job), which still collapses repeated
+mentions within a report; long-lived processes share it across jobs.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from rag_healthbot_server.metrics import CACHE_LOOKUPS_TOTAL
+
+_MAX_ENTRIES = 8192
+_TTL_SECONDS = 600.0
+
+_entries: OrderedDict[Hashable, tuple[int, float]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_entity_id(key: Hashable) -> int | None:
+    """Cached id for *key*, or ``None`` on a miss / expired entry."""
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[1] > now:
+            _entries.move_to_end(key)
+            CACHE_LOOKUPS_TOTAL.labels(cache="entity_id", result="hit").inc()
+            return entry[0]
+        if entry is not None:
+            del _entries[key]
+    CACHE_LOOKUPS_TOTAL.labels(cache="entity_id", result="miss").inc()
+    return None
+
+
+def remember_entity_id(key: Hashable, entity_id: int) -> None:
+    with _lock:
+        _entries[key] = (entity_id, time.monotonic() + _TTL_SECONDS)
+        _entries.move_to_end(key)
+        while len(_entries) > _MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear_entity_id_cache() -> None:
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,94 @@
+"""Redis cache of per-chunk entity-extraction results.
+
+Standard lab panels, template sections and pages repeated across visits send
+identical chunks to the extraction LLM again and again.  The validated
+``IOutputData`` JSON of each chunk is stored under
+
+    entity-extraction:{model}:{md5(system prompt)}:{md5(NER hints)}:{md5(chunk)}
+
+so only cache misses reach the LLM.  For a repeated section to produce the
+same key in another report, the extractor chunks one section at a time
+(``report_chunking.section_chunks``) and sends only the NER hints that
+occur in the chunk (:func:`names_in_chunk`), not the whole report's.
+Changing the prompt, the model or the hints for a chunk changes the key, so
+stale results are never served.
+Entries expire after ``ENTITY_CACHE_TTL_SECONDS``; under memory pressure the
+server's ``maxmemory-policy`` (e.g. ``volatile-lru``) evicts them first.
+Lookups are best-effort: a Redis error counts as a miss.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from redis import Redis
+
+from rag_healthbot_server.config import settings
+from rag_healthbot_server.metrics import CACHE_LOOKUPS_TOTAL
+from rag_healthbot_server.utilities.hashing import md5_hex
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "entity-extraction"
+
+redis = Redis.from_url(settings.redis_url)
+
+
+def names_in_chunk(names: list[str], chunk_text: str) -> list[str]:
+    """The *names* that occur in *chunk_text* as whole words, ignoring case.
+
+    Each is returned as spelled in the chunk, deduplicated and sorted, so
+    the result depends only on the chunk and not on where else in the
+    report an entity was first found.
+    """
+    found: dict[str, str] = {}
+    for name in names:
+        name = name.strip()
+        if not name or name.casefold() in found:
+            continue
+        match = re.search(rf"(?<!\w){re.escape(name)}(?!\w)", chunk_text, re.I)
+        if match:
+            found[name.casefold()] = match.group(0)
+    return [found[key] for key in sorted(found)]
+
+
+def extraction_cache_key(
+    *, model: str, system_prompt: str, ner_hints: str, chunk_text: str
+) -> str:
+    def digest(value: str) -> str:
+        return md5_hex(value.encode("utf-8"))
+
+    return ":".join(
+        (
+            KEY_PREFIX,
+            model,
+            digest(system_prompt),
+            digest(ner_hints),
+            digest(chunk_text),
+        )
+    )
+
+
+def get_cached_extraction(key: str) -> str | None:
+    """Cached result JSON for *key*, or None on a miss."""
+    if not settings.entity_cache_enabled:
+        return None
+    try:
+        raw = redis.get(key)
+    except Exception as e:
+        logger.warning(f"Entity extraction cache lookup failed: {e}")
+        raw = None
+    CACHE_LOOKUPS_TOTAL.labels(
+        cache="entity_extraction", result="miss" if raw is None else "hit"
+    ).inc()
+    return raw.decode("utf-8") if raw is not None else None
+
+
+def cache_extraction(key: str, result_json: str) -> None:
+    if not settings.entity_cache_enabled:
+        return
+    try:
+        redis.set(key, result_json, ex=settings.entity_cache_ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Entity extraction cache write failed: {e}")
@@ -16,6 +16,12 @@ def report_content_hash(file_content_b64: str) -> str | None:
     return md5_hex(decoded)
 
 
+def chunk_content_hash(text: str, model: str) -> str:
+    # A vector is only reusable for the same text under the same embedding
+    # model, so the model is part of the hash.
+    return md5_hex(f"{model}\0{text}".encode("utf-8"))
+
+
 def extracted_text_hash(extracted_text: str) -> str:
     # Keep algorithm aligned with Postgres built-in `md5(text)` backfill.
     return md5_hex((extracted_text or "").encode("utf-8"))
@@ -20,9 +20,8 @@ import logging
 import sys
 import time
 
-from langchain_ollama import OllamaEmbeddings
-
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.services.embedding_service import embed_texts
 from rag_healthbot_server.services.db.CodeEmbeddingRepo import (
     count_code_embeddings,
     delete_all_code_embeddings,
@@ -31,7 +30,9 @@ from rag_healthbot_server.services.db.CodeEmbeddingRepo import (
 
 logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 128  # texts per Ollama call
+# Codes embedded and stored per progress step; the embedding service splits
+# each page into token-sized batches and spreads them across Ollama hosts.
+PAGE_SIZE = 1024
 
 
 # ── File readers ──────────────────────────────────────────────────────
@@ -74,14 +75,6 @@ def _read_cpt(path: str) -> list[tuple[str, str]]:
 # ── Embedding + storage ──────────────────────────────────────────────
 
 
-def _make_embedder() -> OllamaEmbeddings:
-    if not settings.ollama_host or not settings.ollama_embed_model:
-        raise ValueError("OLLAMA_HOST and OLLAMA_EMBED_MODEL must be set")
-    return OllamaEmbeddings(
-        base_url=settings.ollama_host, model=settings.ollama_embed_model
-    )
-
-
 def index_codes(
     code_system: str,
     pairs: list[tuple[str, str]],
@@ -113,17 +106,16 @@ def index_codes(
         logger.info("  Dropping %d existing %s embeddings", existing, code_system)
         delete_all_code_embeddings(code_system)
 
-    embedder = _make_embedder()
     total = len(pairs)
     stored = 0
     t0 = time.time()
 
-    for start in range(0, total, BATCH_SIZE):
-        batch = pairs[start : start + BATCH_SIZE]
+    for start in range(0, total, PAGE_SIZE):
+        batch = pairs[start : start + PAGE_SIZE]
         descs = [d for _, d in batch]
 
         try:
-            vectors = embedder.embed_documents(descs)
+            vectors = embed_texts(descs, operation="code_index")
         except Exception:
             logger.exception(
                 "  Embedding batch %d–%d failed", start, start + len(batch)
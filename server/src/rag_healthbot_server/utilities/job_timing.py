@@ -0,0 +1,104 @@
+"""Per-stage timing for RQ jobs.
+
+:func:`record_stage` appends ``{stage, detail, started_at, ended_at,
+duration_s}`` to ``job.meta["timings"]`` of the job currently running in this
+process and feeds the ``pipeline_stage_duration_seconds`` histogram.  Outside
+of an RQ job (e.g. agents called directly from an API route) only the
+histogram is updated.
+
+``job.meta`` only lives as long as the job itself (``result_ttl``, a few
+minutes), so when a job ends the worker also pushes its per-stage totals to
+the capped list ``job-timings:{queue}`` (:func:`store_job_timings`), which
+``GET /api/report/jobs/stats`` reads.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+from rq import get_current_job
+
+from rag_healthbot_server.metrics import PIPELINE_STAGE_SECONDS
+
+TIMINGS_META_KEY = "timings"
+TIMINGS_HISTORY_PREFIX = "job-timings"
+TIMINGS_HISTORY_MAX = 1000
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@contextmanager
+def record_stage(stage: str, detail: str | None = None) -> Iterator[None]:
+    """Time the enclosed block as *stage* (``detail`` e.g. ``"chunk 2/3"``)."""
+    started_at = _now_iso()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        PIPELINE_STAGE_SECONDS.labels(stage=stage).observe(duration)
+
+        job = get_current_job()
+        if job is not None:
+            job.meta.setdefault(TIMINGS_META_KEY, []).append(
+                {
+                    "stage": stage,
+                    "detail": detail,
+                    "started_at": started_at,
+                    "ended_at": _now_iso(),
+                    "duration_s": round(duration, 4),
+                }
+            )
+            job.save_meta()
+
+
+def stage_totals(timings: list[dict]) -> dict[str, float]:
+    """Seconds per stage; stages that ran several times (e.g. one
+    ``llm_extraction`` per chunk) are summed."""
+    totals: dict[str, float] = {}
+    for timing in timings:
+        stage = timing.get("stage")
+        if stage:
+            totals[stage] = totals.get(stage, 0.0) + timing.get("duration_s", 0.0)
+    return totals
+
+
+def _history_key(queue_name: str) -> str:
+    return f"{TIMINGS_HISTORY_PREFIX}:{queue_name}"
+
+
+def store_job_timings(connection, queue_name: str, job) -> None:
+    """Push *job*'s per-stage totals onto the queue's timing history."""
+    timings = (job.get_meta(refresh=True) or {}).get(TIMINGS_META_KEY)
+    if not timings:
+        return
+    entry = json.dumps(
+        {"job_id": job.id, "ended_at": _now_iso(), "stages": stage_totals(timings)}
+    )
+    key = _history_key(queue_name)
+    pipe = connection.pipeline(transaction=False)
+    pipe.lpush(key, entry)
+    pipe.ltrim(key, 0, TIMINGS_HISTORY_MAX - 1)
+    pipe.execute()
+
+
+def recent_job_timings(connection, queue_name: str, limit: int) -> list[dict]:
+    """Per-stage totals of the *limit* most recently ended jobs, newest first."""
+    raw = connection.lrange(_history_key(queue_name), 0, max(0, limit - 1))
+    return [json.loads(item)["stages"] for item in raw]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *values* (``pct`` in ``[0, 100]``)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -12,25 +12,16 @@ from dataclasses import dataclass
 
 from langchain_ollama import OllamaEmbeddings
 
+from rag_healthbot_server.clients import get_embedder
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.metrics import EMBEDDING_REQUEST_SECONDS
 from rag_healthbot_server.services.db.CodeEmbeddingRepo import search_code_embeddings
 
 logger = logging.getLogger(__name__)
 
-# ── Module-level singleton ────────────────────────────────────────────
-
-_embedder: OllamaEmbeddings | None = None
-
 
 def _get_embedder() -> OllamaEmbeddings:
-    global _embedder
-    if _embedder is None:
-        if not settings.ollama_host or not settings.ollama_embed_model:
-            raise ValueError("OLLAMA_HOST and OLLAMA_MODEL must be set")
-        _embedder = OllamaEmbeddings(
-            base_url=settings.ollama_host, model=settings.ollama_embed_model
-        )
-    return _embedder
+    return get_embedder()
 
 
 # ── Public API ────────────────────────────────────────────────────────
@@ -57,7 +48,10 @@ def kb_search(
 
     try:
         embedder = _get_embedder()
-        query_vec = embedder.embed_query(entity_name.strip())
+        with EMBEDDING_REQUEST_SECONDS.labels(
+            model=settings.ollama_embed_model, operation="kb_query"
+        ).time():
+            query_vec = embedder.embed_query(entity_name.strip())
     except Exception:
         logger.exception("Failed to embed query '%s'", entity_name)
         return []
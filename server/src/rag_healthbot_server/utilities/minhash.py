@@ -0,0 +1,99 @@
+"""MinHash fingerprints of extracted report text for near-duplicate detection.
+
+Text is normalised (case, punctuation, whitespace) and split into word
+3-shingles, so OCR differences between two scans of one report only disturb
+the shingles around them.  The signature keeps, for each of ``NUM_PERM``
+hash functions, the minimum over all shingles; the share of equal positions
+between two signatures estimates the Jaccard similarity of the shingle sets.
+
+For an indexed lookup the signature is cut into ``BANDS`` bands of ``ROWS``
+values (LSH banding) and each band is hashed, together with its position,
+into one signed 64-bit value stored in ``report.minhash_bands`` (GIN).
+Reports sharing any band are candidates: with 16 bands of 8 rows a pair at
+0.9 similarity collides with probability > 0.999, at 0.8 ≈ 0.95 and at 0.5
+≈ 0.06.  Candidates are then checked on the full signature.
+
+Similarity alone cannot tell a re-scan from the next report on the same
+template: a lab panel with a new date and two changed values still scores
+≈ 0.88.  :func:`numbers_match` compares the numbers (dates, values, IDs) of
+both texts, and only a pair that also agrees on those is a duplicate.
+
+The constants and the seed are part of the stored format: changing any of
+them requires recomputing every report's fingerprint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EED_2026
+
+_rng = random.Random(_SEED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _hash64(payload: bytes, *, signed: bool = False) -> int:
+    digest = hashlib.blake2b(payload, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=signed)
+
+
+def shingles(text: str) -> set[str]:
+    """Word ``SHINGLE_WORDS``-grams of the normalised text."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i : i + SHINGLE_WORDS])
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash_signature(text: str) -> list[int] | None:
+    """``NUM_PERM`` minimum hashes of *text*, or None for text without words."""
+    hashes = [_hash64(s.encode("utf-8")) % _PRIME for s in shingles(text)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_bands(signature: list[int]) -> list[int]:
+    """One signed 64-bit hash per band, tagged with the band position so
+    equal rows in different bands do not collide."""
+    bands = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        payload = f"{band}:" + ",".join(map(str, rows))
+        bands.append(_hash64(payload.encode("ascii"), signed=True))
+    return bands
+
+
+def estimated_similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def numbers(text: str) -> list[str]:
+    """Every number in *text*, leading zeros dropped, in sorted order."""
+    return sorted(
+        n.lstrip("0") or "0" for n in _NUMBER_RE.findall((text or "").replace(",", "."))
+    )
+
+
+def numbers_match(a: str, b: str) -> bool:
+    """Whether two texts contain exactly the same numbers."""
+    return numbers(a) == numbers(b)
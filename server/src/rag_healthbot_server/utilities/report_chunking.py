@@ -0,0 +1,230 @@
+"""Section-aware, token-budgeted chunking of report text for embeddings.
+
+Reports are split at detected section headings (medications, assessment,
+plan, labs, …) first, so a chunk never mixes the tail of one section with
+the head of the next.  Small neighbouring sections are packed together;
+sections over the budget are split at paragraph, line and then sentence
+boundaries, and each continuation chunk repeats the section heading.
+:func:`section_chunks` never packs sections, so a section repeated across
+reports always yields the same chunk (entity-extraction cache).
+
+Budgets are in embedding-model tokens.  No tokenizer is available for the
+Ollama models, so :func:`count_tokens` over-estimates (the larger of ~4
+characters per token and one token per word or symbol), which keeps chunks
+inside the model's context window instead of having Ollama truncate them.
+"""
+
+from __future__ import annotations
+
+import re
+
+from rag_healthbot_server.config import settings
+
+_CHARS_PER_TOKEN = 4
+_DEFAULT_CHUNK_TOKENS = 400
+
+# Context windows of common Ollama embedding models; a chunk is kept to 90%
+# of it.  Override per model with EMBED_CHUNK_TOKENS.
+_MODEL_CONTEXT_TOKENS = {
+    "mxbai-embed-large": 512,
+    "snowflake-arctic-embed": 512,
+    "all-minilm": 256,
+    "nomic-embed-text": 2048,
+    "bge-m3": 8192,
+    "bge-large": 512,
+}
+
+# Overlap between continuation chunks of one section: only a trailing
+# sentence/line that fits in this share of the budget is repeated.
+_MAX_OVERLAP_SHARE = 0.15
+
+_SECTION_NAMES = (
+    r"chief complaint|reason for (?:visit|referral)|"
+    r"history of present illness|hpi|"
+    r"past (?:medical|surgical) history|pmh|family history|social history|"
+    r"review of systems|ros|physical exam(?:ination)?|vital signs|vitals|"
+    r"(?:current |home |discharge )?medications?|meds|allerg(?:y|ies)|"
+    r"lab(?:oratory)?(?: results| data| values)?|labs|results|findings|"
+    r"imaging|radiology|impression|assessment(?: and plan| & plan)?|"
+    r"plan|diagnos(?:is|es)|problem list|procedures?|"
+    r"hospital course|discharge (?:summary|instructions)|follow[- ]up|"
+    r"recommendations?|conclusion|summary"
+)
+# A known section name alone on its line (optionally "#"/numbered, with a
+# colon), or followed by a colon and inline content.
+_KNOWN_HEADING_RE = re.compile(
+    rf"^[ \t]*(?:#+[ \t]*|\d+[.)][ \t]*)?(?P<title>{_SECTION_NAMES})[ \t]*"
+    rf"(?::[ \t]*(?P<rest>.*)|[ \t]*)$",
+    re.IGNORECASE,
+)
+# Short ALL-CAPS line ending in a colon, e.g. "CARDIAC ECHO:".  The colon is
+# required so lone result values ("NEGATIVE") are not taken for headings.
+_CAPS_HEADING_RE = re.compile(
+    r"^[ \t]*(?P<title>[A-Z][A-Z0-9 &/()\-]{2,48}?)[ \t]*:[ \t]*$"
+)
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+
+
+def count_tokens(text: str) -> int:
+    """Conservative token estimate for an embedding model."""
+    return max(-(-len(text) // _CHARS_PER_TOKEN), len(_WORD_RE.findall(text)))
+
+
+def chunk_tokens_for_model(model: str | None = None) -> int:
+    """Chunk budget for *model*: EMBED_CHUNK_TOKENS, else a known default."""
+    model = model if model is not None else settings.ollama_embed_model
+    base = (model or "").split(":", 1)[0]
+    for item in (settings.embed_chunk_tokens or "").split(","):
+        name, _, tokens = item.partition("=")
+        if tokens.strip() and name.strip() in (model, base):
+            return max(32, int(tokens))
+    if base in _MODEL_CONTEXT_TOKENS:
+        return min(_DEFAULT_CHUNK_TOKENS, int(_MODEL_CONTEXT_TOKENS[base] * 0.9))
+    return _DEFAULT_CHUNK_TOKENS
+
+
+def split_sections(text: str) -> list[tuple[str | None, str]]:
+    """``[(heading, body)]`` in document order; text before the first
+    heading has heading ``None``."""
+    sections: list[tuple[str | None, list[str]]] = [(None, [])]
+    for line in text.splitlines():
+        match = _KNOWN_HEADING_RE.match(line) or _CAPS_HEADING_RE.match(line)
+        if match:
+            rest = (match.groupdict().get("rest") or "").strip()
+            sections.append((match.group("title").strip(), [rest] if rest else []))
+        else:
+            sections[-1][1].append(line)
+    return [
+        (heading, "\n".join(lines).strip())
+        for heading, lines in sections
+        if heading or "\n".join(lines).strip()
+    ]
+
+
+def _hard_split(word: str, max_tokens: int) -> list[str]:
+    """Character slices of a word with no spaces (IDs, encoded blobs, long
+    dotted or dashed runs) that fit *max_tokens*."""
+    pieces: list[str] = []
+    while word:
+        size = min(len(word), max_tokens * _CHARS_PER_TOKEN)
+        while size > 1 and (tokens := count_tokens(word[:size])) > max_tokens:
+            size = min(size - 1, size * max_tokens // tokens)
+        pieces.append(word[:size])
+        word = word[size:]
+    return pieces
+
+
+def _units(body: str, max_tokens: int) -> list[str]:
+    """Paragraphs, then lines, then sentences, then words — each within budget."""
+    units: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", body):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if count_tokens(paragraph) <= max_tokens:
+            units.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if count_tokens(line) <= max_tokens:
+                units.append(line)
+                continue
+            for sentence in _SENTENCE_RE.split(line):
+                if count_tokens(sentence) <= max_tokens:
+                    units.append(sentence)
+                    continue
+                words = [
+                    part
+                    for word in sentence.split()
+                    for part in (
+                        [word]
+                        if count_tokens(word) <= max_tokens
+                        else _hard_split(word, max_tokens)
+                    )
+                ]
+                piece: list[str] = []
+                for word in words:
+                    if piece and count_tokens(" ".join(piece + [word])) > max_tokens:
+                        units.append(" ".join(piece))
+                        piece = []
+                    piece.append(word)
+                if piece:
+                    units.append(" ".join(piece))
+    return units
+
+
+def _split_section(heading: str | None, body: str, max_tokens: int) -> list[str]:
+    prefix = f"{heading}:\n" if heading else ""
+    budget = max(16, max_tokens - count_tokens(prefix))
+    overlap_budget = int(budget * _MAX_OVERLAP_SHARE)
+
+    def fits(units: list[str]) -> bool:
+        # Count the chunk as emitted: the "\n" joiners cost tokens too.
+        return count_tokens(prefix + "\n".join(units)) <= max_tokens
+
+    chunks: list[str] = []
+    current: list[str] = []
+    for unit in _units(body, budget):
+        if current and not fits(current + [unit]):
+            chunks.append(prefix + "\n".join(current))
+            # Adaptive overlap: carry the last unit only when it is short
+            # and still leaves room for the next one.
+            tail = current[-1]
+            if count_tokens(tail) <= overlap_budget and fits([tail, unit]):
+                current = [tail]
+            else:
+                current = []
+        current.append(unit)
+    if current:
+        chunks.append(prefix + "\n".join(current))
+    return chunks
+
+
+def chunk_report_text(text: str, max_tokens: int | None = None) -> list[str]:
+    """Split report text into section-aligned chunks of at most *max_tokens*."""
+    max_tokens = max_tokens or chunk_tokens_for_model()
+    chunks: list[str] = []
+    pending = ""
+    for heading, body in split_sections(text or ""):
+        # A heading with no content of its own carries nothing to embed.
+        if not body.strip():
+            continue
+        section = f"{heading}:\n{body}".strip() if heading else body
+        if count_tokens(section) > max_tokens:
+            if pending:
+                chunks.append(pending)
+                pending = ""
+            chunks.extend(_split_section(heading, body, max_tokens))
+            continue
+        # Pack small whole sections together while they fit.
+        merged = f"{pending}\n\n{section}" if pending else section
+        if count_tokens(merged) <= max_tokens:
+            pending = merged
+        else:
+            chunks.append(pending)
+            pending = section
+    if pending:
+        chunks.append(pending)
+    return [c.strip() for c in chunks if c.strip()]
+
+
+def section_chunks(text: str, max_tokens: int) -> list[str]:
+    """One chunk per section, split only when a section is over *max_tokens*.
+
+    Unlike :func:`chunk_report_text`, neighbouring sections are never packed
+    together, so a chunk depends only on its own section's text.
+    """
+    chunks: list[str] = []
+    for heading, body in split_sections(text or ""):
+        if not body.strip():
+            continue
+        section = f"{heading}:\n{body}".strip() if heading else body
+        if count_tokens(section) > max_tokens:
+            chunks.extend(_split_section(heading, body, max_tokens))
+        else:
+            chunks.append(section)
+    return [c.strip() for c in chunks if c.strip()]
@@ -1,17 +1,108 @@
 from __future__ import annotations
 
+import logging
+
+from rag_healthbot_server.config import settings
 from rag_healthbot_server.services.db.ReportRepo import (
+    get_near_duplicate_candidates,
+    get_report,
     get_report_by_content_hash,
     get_report_by_extracted_text_hash,
+    list_reports_missing_minhash,
+    set_report_minhash,
+)
+from rag_healthbot_server.utilities.minhash import (
+    estimated_similarity,
+    lsh_bands,
+    minhash_signature as compute_minhash_signature,
+    numbers_match,
 )
 
+logger = logging.getLogger(__name__)
+
 
-def find_existing_report(*, content_hash: str | None, extracted_text_hash: str | None):
-    """Return an existing Report matching hashes, or None."""
+def find_existing_report(
+    *,
+    content_hash: str | None,
+    extracted_text_hash: str | None,
+    minhash_signature: list[int] | None = None,
+    extracted_text: str | None = None,
+):
+    """Return an existing Report matching hashes, or None.
+
+    Exact matches are tried first; with *minhash_signature* and
+    *extracted_text* a near-duplicate (see :func:`find_near_duplicate_report`)
+    is accepted too.
+    """
 
     existing = None
     if content_hash:
         existing = get_report_by_content_hash(content_hash)
     if existing is None and extracted_text_hash:
         existing = get_report_by_extracted_text_hash(extracted_text_hash)
+    if existing is None and minhash_signature and extracted_text:
+        existing = find_near_duplicate_report(minhash_signature, extracted_text)
     return existing
+
+
+def find_near_duplicate_report(minhash_signature: list[int], extracted_text: str):
+    """Most similar report at or above ``NEAR_DUPLICATE_THRESHOLD`` that also
+    has the same numbers (dates, values) as *extracted_text*, or None.
+
+    Reports on one template — the same lab panel on a later date — are as
+    similar as two scans of one report; only the numbers tell them apart.
+    """
+    threshold = settings.near_duplicate_threshold
+    if threshold <= 0:
+        return None
+
+    scored = [
+        (estimated_similarity(minhash_signature, signature), report_id)
+        for report_id, signature in get_near_duplicate_candidates(
+            lsh_bands(minhash_signature)
+        )
+    ]
+    for similarity, report_id in sorted(scored, reverse=True):
+        if similarity < threshold:
+            break
+        report = get_report(report_id)
+        if report is None or not numbers_match(
+            extracted_text, report.extracted_text or ""
+        ):
+            logger.info(
+                f"Report {report_id} is similar ({similarity:.2f}) but its "
+                f"numbers differ; not a duplicate"
+            )
+            continue
+        logger.info(
+            f"Near-duplicate of report {report_id} (similarity {similarity:.2f})"
+        )
+        return report
+    return None
+
+
+def backfill_report_fingerprints(batch_size: int = 200) -> int:
+    """Compute MinHash fingerprints for reports stored without one.
+
+    Returns the number of reports updated.
+    """
+    updated = 0
+    after_id = 0
+    while True:
+        batch = list_reports_missing_minhash(after_id=after_id, limit=batch_size)
+        if not batch:
+            return updated
+        rows = []
+        for report_id, text in batch:
+            signature = compute_minhash_signature(text)
+            if signature is not None:
+                rows.append(
+                    {
+                        "id": report_id,
+                        "minhash_signature": signature,
+                        "minhash_bands": lsh_bands(signature),
+                    }
+                )
+        set_report_minhash(rows)
+        updated += len(rows)
+        after_id = batch[-1][0]
@@ -0,0 +1,148 @@
+"""Per-report processing lock shared by the upload route and the summary job.
+
+The lock key is an upload's content hash (else its file name) and its value
+is the id of the job processing it.  The upload route claims it before
+enqueueing (:func:`enqueue_or_coalesce`), so an identical upload arriving
+meanwhile is coalesced onto that job instead of processed twice.  The job
+re-claims it when it starts (:func:`lock_for_running_job`) and releases it
+when it finishes (:func:`release_report_lock`).
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any, Callable
+
+from redis import Redis
+from rq import Queue
+from rq.job import Job
+
+from rag_healthbot_server.config import settings
+
+LOCK_PREFIX = "lock:report"
+LOCK_TTL_SECONDS = 60 * 10
+_LOCK_WAIT_SECONDS = 2
+
+_DEAD_JOB_STATUSES = ("failed", "stopped", "canceled")
+
+redis = Redis.from_url(settings.redis_url)
+
+# Compare-and-set / compare-and-delete on the lock value (the holder's job id).
+_REPLACE_LOCK = redis.register_script("""
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """)
+_RELEASE_LOCK = redis.register_script("""
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """)
+
+
+def _lock_key(key: str) -> str:
+    return f"{LOCK_PREFIX}:{key}"
+
+
+def claim_report_lock(
+    key: str, job_id: str, *, replace: str | None = None
+) -> str | None:
+    """
+    Take the processing lock for *key* for *job_id*.  Returns None if
+    *job_id* now holds it, otherwise the id of the job that does.  *replace*
+    takes over a stale lock, but only while that job still holds it.
+    """
+    lock_key = _lock_key(key)
+    if replace is not None and replace != job_id:
+        if _REPLACE_LOCK(keys=[lock_key], args=[replace, job_id, LOCK_TTL_SECONDS]):
+            return None
+    while not redis.set(lock_key, job_id, nx=True, ex=LOCK_TTL_SECONDS):
+        holder = redis.get(lock_key)
+        # None: it expired between SET and GET, so try again.
+        if holder is not None:
+            holder = holder.decode()
+            return None if holder == job_id else holder
+    return None
+
+
+def release_report_lock(key: str, job_id: str) -> None:
+    """Drop the lock for *key* if *job_id* still holds it."""
+    _RELEASE_LOCK(keys=[_lock_key(key)], args=[job_id])
+
+
+def _job_status(job_id: str) -> str | None:
+    try:
+        return Job.fetch(job_id, connection=redis).get_status()
+    except Exception:
+        return None
+
+
+def _job_is_live(job_id: str) -> bool:
+    status = _job_status(job_id)
+    return status is not None and status not in _DEAD_JOB_STATUSES
+
+
+def enqueue_or_coalesce(
+    queue: Queue,
+    func: Callable[..., Any],
+    payload: Any,
+    key: str,
+    *,
+    job_timeout: int,
+) -> tuple[str, bool]:
+    """Enqueue ``func(payload)`` unless an identical upload is already being
+    processed; returns ``(job_id, coalesced)``.
+
+    The job is saved before the lock is claimed: an identical upload that
+    finds the lock can always fetch its holder, and coalesces onto it rather
+    than mistaking the not-yet-enqueued job for a dead one.
+    """
+    job = queue.create_job(
+        func, args=(payload,), job_id=str(uuid.uuid4()), timeout=job_timeout
+    )
+    job.save()
+    holder = claim_report_lock(key, job.id)
+    if holder is not None and not _job_is_live(holder):
+        # Left behind by a job that died without releasing it.
+        holder = claim_report_lock(key, job.id, replace=holder)
+    if holder is not None:
+        job.delete()
+        return holder, True
+
+    try:
+        queue.enqueue_job(job)
+    except Exception:
+        release_report_lock(key, job.id)
+        job.delete()
+        raise
+    return job.id, False
+
+
+def lock_for_running_job(key: str, job_id: str) -> str | None:
+    """
+    Claim the lock for *job_id*, which has just started.  Returns None once
+    it holds the lock, else the id of the running job that does.
+
+    The lock taken at enqueue time expires after ``LOCK_TTL_SECONDS`` even if
+    the job is still queued, and a later identical upload may then have
+    claimed it.  A lock held by a job that is not running (queued, or dead)
+    is taken over.  A lock held by a running job is waited for, up to
+    ``LOCK_TTL_SECONDS``; this job then finds that job's report through the
+    duplicate check.  The TTL restarts once the lock is held, so it covers
+    the run rather than the time spent queued.
+    """
+    deadline = time.monotonic() + LOCK_TTL_SECONDS
+    while True:
+        holder = claim_report_lock(key, job_id)
+        if holder is not None and _job_status(holder) != "started":
+            holder = claim_report_lock(key, job_id, replace=holder)
+        if holder is None:
+            redis.expire(_lock_key(key), LOCK_TTL_SECONDS)
+            return None
+        if time.monotonic() >= deadline:
+            return holder
+        time.sleep(_LOCK_WAIT_SECONDS)
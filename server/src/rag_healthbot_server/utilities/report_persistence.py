@@ -53,7 +53,9 @@ from rag_healthbot_server.services.db.ReportProcedureRepo import (
     get_procedures_for_report,
 )
 
+from .entity_id_cache import get_entity_id, remember_entity_id
 from .medication_normalization import normalize_medication_name
+from .minhash import lsh_bands
 from .report_dedup import find_existing_report
 from .temporal_parsing import normalize_temporal_value, parse_reference_datetime
 
@@ -69,6 +71,7 @@ def save_report_entities_fast(
     medications: list[MedicationEntity],
     diseases: list[DiseaseEntity] | None = None,
     procedures: list[ProcedureEntity] | None = None,
+    minhash_signature: list[int] | None = None,
 ) -> int:
     """Fast-path persistence for report + entities (no UMLS/KB resolution).
 
@@ -85,6 +88,10 @@ def save_report_entities_fast(
                 extracted_text=extracted_text,
                 content_hash=content_hash,
                 extracted_text_hash=extracted_text_hash,
+                minhash_signature=minhash_signature,
+                minhash_bands=(
+                    lsh_bands(minhash_signature) if minhash_signature else None
+                ),
             )
         )
     except IntegrityError:
@@ -126,39 +133,13 @@ def save_report_entities_fast(
             confidence = None
             review_status = "pending_review"
 
-        db_med = get_medication_by_name(normalized_name)
-        if db_med is None:
-            candidates = find_medications_name_startswith(normalized_name, limit=5)
-            if len(candidates) == 1:
-                try:
-                    renamed = rename_medication(candidates[0].id, normalized_name)
-                    if renamed is not None:
-                        db_med = renamed
-                except IntegrityError:
-                    db_med = None
-
-        if db_med is None:
-            try:
-                db_med = create_medication(
-                    IMedication(
-                        name=normalized_name,
-                        cui=cui,
-                        confidence=None,
-                        review_status="pending_review",
-                        is_drug_class=is_drug_class,
-                    )
-                )
-            except IntegrityError:
-                db_med = get_medication_by_name(normalized_name)
-                if db_med is None:
-                    raise
-        elif cui and not db_med.cui:
-            updates: dict[str, str | float | bool | None] = {"cui": cui}
-            if is_drug_class and not getattr(db_med, "is_drug_class", False):
-                updates["is_drug_class"] = True
-            updated = update_medication(db_med.id, updates)
-            if updated is not None:
-                db_med = updated
+        cache_key = ("medication", normalized_name)
+        med_id = get_entity_id(cache_key)
+        if med_id is None:
+            db_med = _resolve_medication(normalized_name, cui, is_drug_class)
+            med_id = db_med.id
+            if db_med.cui:
+                remember_entity_id(cache_key, med_id)
 
         start_date = normalize_temporal_value(
             med.start_date,
@@ -172,7 +153,7 @@ def save_report_entities_fast(
         create_report_medication(
             IReportMedication(
                 report_id=report_id,
-                medication_id=db_med.id,
+                medication_id=med_id,
                 dosage=med.dosage,
                 frequency=med.frequency,
                 start_date=start_date,
@@ -207,37 +188,13 @@ def save_report_entities_fast(
         review_status = "pending_review"
         candidates_json = None
 
-        db_dis = None
-        if cui:
-            db_dis = get_disease_by_cui(cui)
-        if db_dis is None:
-            db_dis = get_disease_by_name(name)
-        if db_dis is None:
-            try:
-                db_dis = create_disease(
-                    IDisease(
-                        name=name,
-                        cui=cui,
-                        icd10_code=icd10_code,
-                        confidence=None,
-                        review_status="pending_review",
-                        candidates_json=None,
-                    )
-                )
-            except IntegrityError:
-                db_dis = get_disease_by_name(name)
-                if db_dis is None:
-                    raise
-        elif not db_dis.cui or not db_dis.icd10_code:
-            updates: dict[str, str | float | None] = {}
-            if cui and not db_dis.cui:
-                updates["cui"] = cui
-            if icd10_code and not db_dis.icd10_code:
-                updates["icd10_code"] = icd10_code
-            if updates:
-                updated = update_disease(db_dis.id, updates)
-                if updated is not None:
-                    db_dis = updated
+        cache_key = ("disease", cui or "", name.lower())
+        dis_id = get_entity_id(cache_key)
+        if dis_id is None:
+            db_dis = _resolve_disease(name, cui, icd10_code)
+            dis_id = db_dis.id
+            if db_dis.cui and db_dis.icd10_code:
+                remember_entity_id(cache_key, dis_id)
 
         onset_date = normalize_temporal_value(
             dis.onset_date,
@@ -247,7 +204,7 @@ def save_report_entities_fast(
         create_report_disease(
             IReportDisease(
                 report_id=report_id,
-                disease_id=db_dis.id,
+                disease_id=dis_id,
                 severity=dis.severity,
                 status=dis.status,
                 onset_date=onset_date,
@@ -274,37 +231,13 @@ def save_report_entities_fast(
         review_status = "pending_review"
         candidates_json = None
 
-        db_proc = None
-        if cui:
-            db_proc = get_procedure_by_cui(cui)
-        if db_proc is None:
-            db_proc = get_procedure_by_name(name)
-        if db_proc is None:
-            try:
-                db_proc = create_procedure(
-                    IProcedure(
-                        name=name,
-                        cui=cui,
-                        cpt_code=cpt_code,
-                        confidence=None,
-                        review_status="pending_review",
-                        candidates_json=None,
-                    )
-                )
-            except IntegrityError:
-                db_proc = get_procedure_by_name(name)
-                if db_proc is None:
-                    raise
-        elif not db_proc.cui or not db_proc.cpt_code:
-            updates: dict[str, str | float | None] = {}
-            if cui and not db_proc.cui:
-                updates["cui"] = cui
-            if cpt_code and not db_proc.cpt_code:
-                updates["cpt_code"] = cpt_code
-            if updates:
-                updated = update_procedure(db_proc.id, updates)
-                if updated is not None:
-                    db_proc = updated
+        cache_key = ("procedure", cui or "", name.lower())
+        proc_id = get_entity_id(cache_key)
+        if proc_id is None:
+            db_proc = _resolve_procedure(name, cui, cpt_code)
+            proc_id = db_proc.id
+            if db_proc.cui and db_proc.cpt_code:
+                remember_entity_id(cache_key, proc_id)
 
         date_performed = normalize_temporal_value(
             proc.date_performed,
@@ -314,7 +247,7 @@ def save_report_entities_fast(
         create_report_procedure(
             IReportProcedure(
                 report_id=report_id,
-                procedure_id=db_proc.id,
+                procedure_id=proc_id,
                 date_performed=date_performed,
                 body_site=proc.body_site,
                 outcome=proc.outcome,
@@ -332,6 +265,118 @@ def save_report_entities_fast(
     return report_id
 
 
+# ── Canonical entity resolution ─────────────────────────────────
+# Each helper returns the canonical row for an extracted entity, creating it
+# or filling in a missing CUI / code as needed.
+
+
+def _resolve_medication(normalized_name: str, cui: str | None, is_drug_class: bool):
+    db_med = get_medication_by_name(normalized_name)
+    if db_med is None:
+        candidates = find_medications_name_startswith(normalized_name, limit=5)
+        if len(candidates) == 1:
+            try:
+                renamed = rename_medication(candidates[0].id, normalized_name)
+                if renamed is not None:
+                    db_med = renamed
+            except IntegrityError:
+                db_med = None
+
+    if db_med is None:
+        try:
+            db_med = create_medication(
+                IMedication(
+                    name=normalized_name,
+                    cui=cui,
+                    confidence=None,
+                    review_status="pending_review",
+                    is_drug_class=is_drug_class,
+                )
+            )
+        except IntegrityError:
+            db_med = get_medication_by_name(normalized_name)
+            if db_med is None:
+                raise
+    elif cui and not db_med.cui:
+        updates: dict[str, str | float | bool | None] = {"cui": cui}
+        if is_drug_class and not getattr(db_med, "is_drug_class", False):
+            updates["is_drug_class"] = True
+        updated = update_medication(db_med.id, updates)
+        if updated is not None:
+            db_med = updated
+    return db_med
+
+
+def _resolve_disease(name: str, cui: str | None, icd10_code: str | None):
+    db_dis = None
+    if cui:
+        db_dis = get_disease_by_cui(cui)
+    if db_dis is None:
+        db_dis = get_disease_by_name(name)
+    if db_dis is None:
+        try:
+            db_dis = create_disease(
+                IDisease(
+                    name=name,
+                    cui=cui,
+                    icd10_code=icd10_code,
+                    confidence=None,
+                    review_status="pending_review",
+                    candidates_json=None,
+                )
+            )
+        except IntegrityError:
+            db_dis = get_disease_by_name(name)
+            if db_dis is None:
+                raise
+    elif not db_dis.cui or not db_dis.icd10_code:
+        updates: dict[str, str | float | None] = {}
+        if cui and not db_dis.cui:
+            updates["cui"] = cui
+        if icd10_code and not db_dis.icd10_code:
+            updates["icd10_code"] = icd10_code
+        if updates:
+            updated = update_disease(db_dis.id, updates)
+            if updated is not None:
+                db_dis = updated
+    return db_dis
+
+
+def _resolve_procedure(name: str, cui: str | None, cpt_code: str | None):
+    db_proc = None
+    if cui:
+        db_proc = get_procedure_by_cui(cui)
+    if db_proc is None:
+        db_proc = get_procedure_by_name(name)
+    if db_proc is None:
+        try:
+            db_proc = create_procedure(
+                IProcedure(
+                    name=name,
+                    cui=cui,
+                    cpt_code=cpt_code,
+                    confidence=None,
+                    review_status="pending_review",
+                    candidates_json=None,
+                )
+            )
+        except IntegrityError:
+            db_proc = get_procedure_by_name(name)
+            if db_proc is None:
+                raise
+    elif not db_proc.cui or not db_proc.cpt_code:
+        updates: dict[str, str | float | None] = {}
+        if cui and not db_proc.cui:
+            updates["cui"] = cui
+        if cpt_code and not db_proc.cpt_code:
+            updates["cpt_code"] = cpt_code
+        if updates:
+            updated = update_procedure(db_proc.id, updates)
+            if updated is not None:
+                db_proc = updated
+    return db_proc
+
+
 def save_report_and_medications(
     *,
     file_name: str,
@@ -343,6 +388,7 @@ def save_report_and_medications(
     medications: list[MedicationEntity],
     diseases: list[DiseaseEntity] | None = None,
     procedures: list[ProcedureEntity] | None = None,
+    minhash_signature: list[int] | None = None,
 ) -> int:
     """Backward-compatible wrapper.
 
@@ -358,4 +404,5 @@ def save_report_and_medications(
         medications=medications,
         diseases=diseases,
         procedures=procedures,
+        minhash_signature=minhash_signature,
     )
@@ -0,0 +1,142 @@
+"""Per-job Redis stream of summary tokens.
+
+While the summarizer runs inside an upload job, the tokens the LLM produces
+are appended to ``summary-stream:{job_id}`` as events (the same shapes the
+chat SSE endpoint sends):
+
+* ``{"type": "token", "token": "..."}`` — tokens are buffered and published
+  every ``_FLUSH_TOKENS`` tokens or ``_FLUSH_SECONDS``, whichever comes
+  first, so the job pays one Redis round-trip per batch, not per token.
+* ``{"type": "end", "summary": "..."}`` — the final summary (or the summary of
+  the existing report, for duplicate uploads).
+* ``{"type": "error", "error": "..."}``
+
+``GET /api/report/jobs/{job_id}/summary/stream`` relays the stream as SSE.
+Streams are capped at ``_MAXLEN`` entries and expire ``_TTL_SECONDS`` after
+the last write, so a client connecting late still replays from the start.
+Publishing is best-effort: a Redis error never fails the summary.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Iterator
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from rag_healthbot_server.config import settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_PREFIX = "summary-stream"
+TERMINAL_EVENTS = ("end", "error")
+
+_MAXLEN = 10_000
+_TTL_SECONDS = 60 * 60
+_FLUSH_TOKENS = 32
+_FLUSH_SECONDS = 0.25
+
+redis = Redis.from_url(settings.redis_url)
+_async_redis: AsyncRedis | None = None
+
+
+def summary_stream_key(job_id: str) -> str:
+    return f"{STREAM_PREFIX}:{job_id}"
+
+
+def publish_summary_event(job_id: str, event: dict) -> None:
+    """Append *event* to the job's summary stream."""
+    key = summary_stream_key(job_id)
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.xadd(
+            key,
+            {"data": json.dumps(event, ensure_ascii=False)},
+            maxlen=_MAXLEN,
+            approximate=True,
+        )
+        pipe.expire(key, _TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to publish summary event for job {job_id}: {e}")
+
+
+class _TokenBuffer:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.parts: list[str] = []
+        self.flushed_at = time.monotonic()
+
+    def __call__(self, token: str) -> None:
+        self.parts.append(token)
+        if (
+            len(self.parts) >= _FLUSH_TOKENS
+            or time.monotonic() - self.flushed_at >= _FLUSH_SECONDS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            token = "".join(self.parts)
+            self.parts = []
+            publish_summary_event(self.job_id, {"type": "token", "token": token})
+        self.flushed_at = time.monotonic()
+
+
+@contextmanager
+def summary_token_publisher(job_id: str) -> Iterator[Callable[[str], None]]:
+    """``on_token`` callback for the summarizer that publishes to *job_id*.
+
+    Tokens are buffered; whatever is left is flushed when the block exits,
+    before the caller publishes the terminal event.
+    """
+    buffer = _TokenBuffer(job_id)
+    try:
+        yield buffer
+    finally:
+        buffer.flush()
+
+
+def _get_async_redis() -> AsyncRedis:
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = AsyncRedis.from_url(settings.redis_url)
+    return _async_redis
+
+
+async def read_summary_events(
+    job_id: str, *, last_id: str = "0-0", block_ms: int = 5000
+) -> AsyncIterator[tuple[str, dict | None]]:
+    """Yield ``(entry_id, event)`` from the job's stream, oldest first.
+
+    Yields ``(last_id, None)`` whenever *block_ms* passes without a new
+    entry, so the caller can send a keep-alive or check the job.  Stops
+    after a terminal event.
+    """
+    key = summary_stream_key(job_id)
+    client = _get_async_redis()
+    while True:
+        response = await client.xread({key: last_id}, count=100, block=block_ms)
+        if not response:
+            yield last_id, None
+            continue
+        for _stream, entries in response:
+            for entry_id, fields in entries:
+                last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                raw = fields.get(b"data") or fields.get("data") or b"{}"
+                event = json.loads(raw)
+                yield last_id, event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+
+
+async def aclose_summary_streams() -> None:
+    """Close the async Redis client used by :func:`read_summary_events`."""
+    global _async_redis
+    if _async_redis is not None:
+        client, _async_redis = _async_redis, None
+        await client.aclose()
@@ -0,0 +1,41 @@
+"""Full-text query construction for report search.
+
+``websearch_to_tsquery`` ANDs every word, so a natural-language question
+("what dose of metformin was I prescribed?") only matches chunks containing
+all of its terms and the lexical side of hybrid search almost never fires.
+:func:`any_term_tsquery` ORs the question's lexemes instead and leaves
+ranking to ``ts_rank_cd``, which scores chunks matching more (and closer)
+terms higher.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import cast, func, literal, select
+from sqlalchemy.dialects.postgresql import TSQUERY
+
+
+def _tsquery_operand(lexeme):
+    """*lexeme* as a quoted ``tsquery`` operand.
+
+    Backslashes and single quotes are doubled, which is how the ``tsquery``
+    input syntax escapes them (``quote_literal`` would add an ``E''`` prefix
+    instead, which ``tsquery`` rejects).
+    """
+    escaped = func.replace(func.replace(lexeme, "\\", "\\\\"), "'", "''")
+    return literal("'") + escaped + literal("'")
+
+
+def any_term_tsquery(query_text: str, config: str = "english"):
+    """``tsquery`` matching any of *query_text*'s lexemes.
+
+    Postgres does the parsing, stemming and stop-word removal
+    (``to_tsvector``); the lexemes are quoted, joined with ``|`` and cast
+    to ``tsquery`` as they are, since ``to_tsquery`` would parse (and split)
+    them again.  A question made only of stop words yields an empty query,
+    which matches nothing.
+    """
+    lexeme = func.unnest(
+        func.tsvector_to_array(func.to_tsvector(config, query_text))
+    ).column_valued("lexeme")
+    terms = select(func.string_agg(_tsquery_operand(lexeme), " | ")).scalar_subquery()
+    return cast(func.coalesce(terms, ""), TSQUERY)
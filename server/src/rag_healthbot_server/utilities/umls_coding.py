@@ -28,6 +28,7 @@ from functools import lru_cache
 import httpx
 
 from rag_healthbot_server.config import settings
+from rag_healthbot_server.metrics import UMLS_REQUESTS_TOTAL, instrument_lru_cache
 from rag_healthbot_server.utilities import cpt_lookup, icd10_lookup
 from rag_healthbot_server.utilities.confidence import (
     CandidateCode,
@@ -84,9 +85,29 @@ def _normalize_entity_name(name: str) -> str:
     return " ".join(cleaned.split()).strip()
 
 
+def _count_umls_response(response: httpx.Response) -> None:
+    path = response.request.url.path
+    if "/search/" in path:
+        endpoint = "search"
+    elif path.endswith("/atoms"):
+        endpoint = "atoms"
+    else:
+        endpoint = "concept"
+    UMLS_REQUESTS_TOTAL.labels(
+        endpoint=endpoint, status=str(response.status_code)
+    ).inc()
+
+
+def _umls_client() -> httpx.Client:
+    return httpx.Client(
+        timeout=_TIMEOUT, event_hooks={"response": [_count_umls_response]}
+    )
+
+
 # ── UMLS REST primitives ─────────────────────────────────────────
 
 
+@instrument_lru_cache("umls.search_umls")
 @lru_cache(maxsize=2048)
 def search_umls(term: str, sab: str | None = None) -> str | None:
     """Search UMLS for *term*; return the best CUI or ``None``.
@@ -108,7 +129,7 @@ def search_umls(term: str, sab: str | None = None) -> str | None:
     for strategy in ("exact", "words", "approximate"):
         try:
             params["searchType"] = strategy
-            with httpx.Client(timeout=_TIMEOUT) as client:
+            with _umls_client() as client:
                 resp = client.get(url, params=params)
             if resp.status_code in (401, 404):
                 continue
@@ -123,6 +144,7 @@ def search_umls(term: str, sab: str | None = None) -> str | None:
     return None
 
 
+@instrument_lru_cache("umls.get_atoms")
 @lru_cache(maxsize=2048)
 def _get_atoms(cui: str, sab: str) -> list[dict]:
     """Fetch atom dicts for *cui* from source vocabulary *sab*."""
@@ -131,7 +153,7 @@ def _get_atoms(cui: str, sab: str) -> list[dict]:
     url = f"{_UMLS_BASE}/content/current/CUI/{cui}/atoms"
     params = {"apiKey": settings.umls_api_key, "sabs": sab, "pageSize": 25}
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
+        with _umls_client() as client:
             resp = client.get(url, params=params)
         if resp.status_code == 200:
             return resp.json().get("result", [])
@@ -153,6 +175,7 @@ def _extract_code(atoms: list[dict]) -> str | None:
     return None
 
 
+@instrument_lru_cache("umls.cui_to_icd10")
 @lru_cache(maxsize=2048)
 def cui_to_icd10(cui: str) -> str | None:
     """CUI → raw ICD-10-CM code from UMLS atoms (may contain dots)."""
@@ -163,6 +186,7 @@ def cui_to_icd10(cui: str) -> str | None:
     return code
 
 
+@instrument_lru_cache("umls.cui_to_cpt")
 @lru_cache(maxsize=2048)
 def cui_to_cpt(cui: str) -> str | None:
     """CUI → CPT code from UMLS atoms."""
@@ -172,13 +196,14 @@ def cui_to_cpt(cui: str) -> str | None:
     return code
 
 
+@instrument_lru_cache("umls.cui_to_tuis")
 @lru_cache(maxsize=2048)
 def cui_to_tuis(cui: str) -> set[str]:
     """Fetch semantic types (TUIs) for a CUI.  Empty set on failure."""
     if not _has_api_key():
         return set()
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
+        with _umls_client() as client:
             resp = client.get(
                 f"{_UMLS_BASE}/content/current/CUI/{cui}",
                 params={"apiKey": settings.umls_api_key},
@@ -191,13 +216,14 @@ def cui_to_tuis(cui: str) -> set[str]:
     return set()
 
 
+@instrument_lru_cache("umls.cui_preferred_name")
 @lru_cache(maxsize=2048)
 def _cui_preferred_name(cui: str) -> str | None:
     """Fetch the UMLS preferred name for a CUI."""
     if not _has_api_key():
         return None
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
+        with _umls_client() as client:
             resp = client.get(
                 f"{_UMLS_BASE}/content/current/CUI/{cui}",
                 params={"apiKey": settings.umls_api_key},
@@ -209,13 +235,14 @@ def _cui_preferred_name(cui: str) -> str | None:
     return None
 
 
+@instrument_lru_cache("umls.cui_synonyms")
 @lru_cache(maxsize=512)
 def _cui_synonyms(cui: str) -> list[str]:
     """Fetch English atom names for a CUI (synonyms / alternative names)."""
     if not _has_api_key():
         return []
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
+        with _umls_client() as client:
             resp = client.get(
                 f"{_UMLS_BASE}/content/current/CUI/{cui}/atoms",
                 params={
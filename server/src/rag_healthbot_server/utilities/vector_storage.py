@@ -0,0 +1,159 @@
+"""Nearest-neighbour queries for the configured vector index form.
+
+``report_embedding.embedding`` and ``code_embedding.embedding`` always store
+full-precision vectors; ``VECTOR_STORAGE`` selects which single HNSW index
+is built on them and serves the approximate search:
+
+* ``float32`` — the original ``vector_cosine_ops`` index on the column.
+* ``halfvec`` — an expression index on ``embedding::halfvec(dim)``: half the
+  size of the float index, with near-identical recall.
+* ``binary`` — an expression index on ``binary_quantize(embedding)::bit(dim)``
+  (1/32 of the float index).  Hamming distance only shortlists
+  ``limit * VECTOR_RERANK_FACTOR`` candidates; they are re-ranked by exact
+  cosine distance on the stored vectors.
+
+Only the configured form is indexed — keeping all three would multiply the
+index size and the write cost of every insert.  Migrations pin the mode
+(``b4d8e1f6a9c2``: ``float32``); switching is a new revision plus a matching
+``VECTOR_STORAGE``.  ``uv run vector-indexes`` swaps the index in place for
+trying modes on a staging copy (see :func:`hnsw_index_statements`).  The
+casts below must match the indexed expressions for the planner to use them.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import Float, Select, cast, func, literal, select
+
+from rag_healthbot_server.config import settings
+
+VECTOR_STORAGE_MODES = ("float32", "halfvec", "binary")
+
+# HNSW index name of each mode, per embedding table.
+HNSW_INDEXES = {
+    "report_embedding": {
+        "float32": "idx_embedding_hnsw",
+        "halfvec": "idx_embedding_hnsw_halfvec",
+        "binary": "idx_embedding_hnsw_bit",
+    },
+    "code_embedding": {
+        "float32": "idx_code_embedding_hnsw",
+        "halfvec": "idx_code_embedding_hnsw_halfvec",
+        "binary": "idx_code_embedding_hnsw_bit",
+    },
+}
+
+
+def _indexed_expression(mode: str, dim: int) -> str:
+    if mode == "halfvec":
+        return f"(embedding::halfvec({dim})) halfvec_cosine_ops"
+    if mode == "binary":
+        return f"(binary_quantize(embedding)::bit({dim})) bit_hamming_ops"
+    return "embedding vector_cosine_ops"
+
+
+def hnsw_index_statements(mode: str, dim: int) -> list[str]:
+    """DDL leaving only *mode*'s HNSW index on each embedding table.
+
+    The new index is built before the others are dropped, so searches are
+    never left without one.
+    """
+    if mode not in VECTOR_STORAGE_MODES:
+        raise ValueError(f"Unknown VECTOR_STORAGE mode: {mode}")
+    if mode != "float32" and dim <= 0:
+        raise ValueError("VECTOR_DIMENSION must be set to a positive integer")
+    statements = []
+    for table, indexes in HNSW_INDEXES.items():
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {indexes[mode]} ON {table} "
+            f"USING hnsw ({_indexed_expression(mode, dim)})"
+        )
+        statements += [
+            f"DROP INDEX IF EXISTS {name}"
+            for other, name in indexes.items()
+            if other != mode
+        ]
+    return statements
+
+
+def _query_vector(query_embedding: list[float], dim: int):
+    # Explicit cast: binary_quantize() and the halfvec cast are overloaded,
+    # so an untyped parameter would be ambiguous.
+    return cast(literal(query_embedding, Vector(dim)), Vector(dim))
+
+
+def nearest_neighbours(
+    id_column,
+    embedding_column,
+    query_embedding: list[float],
+    limit: int,
+    *criteria,
+    mode: str | None = None,
+    rerank_factor: int | None = None,
+) -> Select:
+    """``SELECT id, distance`` of the *limit* nearest rows, closest first.
+
+    *criteria* are WHERE clauses on the embedding table.  ``distance`` is the
+    cosine distance (computed in half precision for ``halfvec``).
+    """
+    mode = mode or settings.vector_storage
+    if mode not in VECTOR_STORAGE_MODES:
+        raise ValueError(f"Unknown VECTOR_STORAGE mode: {mode}")
+    dim = int(settings.vector_dimension)
+    query = _query_vector(query_embedding, dim)
+
+    if mode == "binary":
+        hamming = cast(func.binary_quantize(embedding_column), BIT(dim)).op(
+            "<~>", return_type=Float
+        )(func.binary_quantize(query))
+        shortlist = (
+            select(
+                id_column.label("id"),
+                embedding_column.label("embedding"),
+            )
+            .where(*criteria)
+            .order_by(hamming)
+            .limit(int(limit) * int(rerank_factor or settings.vector_rerank_factor))
+            .subquery("shortlist")
+        )
+        distance = shortlist.c.embedding.cosine_distance(query)
+        return (
+            select(shortlist.c.id, distance.label("distance"))
+            .order_by(distance.asc())
+            .limit(int(limit))
+        )
+
+    if mode == "halfvec":
+        distance = cast(embedding_column, HALFVEC(dim)).op("<=>", return_type=Float)(
+            cast(query, HALFVEC(dim))
+        )
+    else:
+        distance = embedding_column.cosine_distance(query)
+    return (
+        select(id_column.label("id"), distance.label("distance"))
+        .where(*criteria)
+        .order_by(distance.asc())
+        .limit(int(limit))
+    )
+
+
+def vector_indexes_cli():
+    """CLI entry-point: rebuild the HNSW indexes for ``VECTOR_STORAGE``."""
+    from sqlalchemy import text
+
+    from rag_healthbot_server import db
+
+    parser = argparse.ArgumentParser(prog="vector-indexes")
+    parser.add_argument(
+        "--mode", choices=VECTOR_STORAGE_MODES, default=settings.vector_storage
+    )
+    args = parser.parse_args()
+
+    for statement in hnsw_index_statements(
+        args.mode, int(settings.vector_dimension or 0)
+    ):
+        print(statement)
+        db.session.execute(text(statement))
+    db.session.commit()
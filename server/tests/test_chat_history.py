@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rag_healthbot_server.utilities import chat_history
+from rag_healthbot_server.utilities.chat_history import (
+    history_window,
+    select_recent_turns,
+)
+
+
+def _turn(message_id: int, chars: int) -> SimpleNamespace:
+    return SimpleNamespace(id=message_id, user_content="u" * chars, ai_content="")
+
+
+def test_select_recent_turns_stops_at_token_budget():
+    messages = [_turn(i, 400) for i in range(1, 7)]  # 100 tokens each
+
+    kept = select_recent_turns(messages, max_turns=6, token_budget=250)
+
+    assert [m.id for m in kept] == [5, 6]
+
+
+def test_select_recent_turns_keeps_latest_turn_over_budget():
+    messages = [_turn(1, 40), _turn(2, 4000)]
+
+    kept = select_recent_turns(messages, max_turns=6, token_budget=100)
+
+    assert [m.id for m in kept] == [2]
+
+
+@pytest.fixture
+def conversation(monkeypatch):
+    """Six 100-token turns; the window fits 6 by count but only 2 by tokens."""
+    messages = [_turn(i, 400) for i in range(1, 7)]
+    folded: list[list[int]] = []
+
+    def list_messages(conversation_id, *, limit=None, before_id=None, after_id=None):
+        selected = [
+            m
+            for m in messages
+            if (before_id is None or m.id < before_id)
+            and (after_id is None or m.id > after_id)
+        ]
+        return selected[-limit:] if limit else selected
+
+    monkeypatch.setattr(chat_history.settings, "chat_history_turns", 6)
+    monkeypatch.setattr(chat_history.settings, "chat_history_token_budget", 250)
+    monkeypatch.setattr(
+        chat_history,
+        "get_conversation",
+        lambda _id: SimpleNamespace(summary=None, summary_through_message_id=None),
+    )
+    monkeypatch.setattr(chat_history, "list_conversation_messages", list_messages)
+    monkeypatch.setattr(chat_history, "_make_summary_llm", lambda: None)
+    monkeypatch.setattr(
+        chat_history,
+        "_extend_summary",
+        lambda llm, summary, batch: folded.append([m.id for m in batch]) or "s",
+    )
+    monkeypatch.setattr(
+        chat_history, "update_conversation_summary", lambda *args, **kwargs: None
+    )
+    monkeypatch.setattr(chat_history.db, "remove_session", lambda: None)
+    return messages, folded
+
+
+def test_rolling_summary_folds_turns_dropped_by_token_budget(conversation):
+    messages, folded = conversation
+
+    chat_history.refresh_rolling_summary(1)
+
+    window = [m.id for m in history_window(messages)]
+    summarized = [message_id for batch in folded for message_id in batch]
+    assert window == [5, 6]
+    # Every turn is either replayed verbatim or folded into the summary.
+    assert summarized == [1, 2, 3, 4]
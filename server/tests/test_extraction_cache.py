@@ -0,0 +1,87 @@
+import pytest
+
+from rag_healthbot_server.utilities import extraction_cache
+from rag_healthbot_server.utilities.extraction_cache import (
+    cache_extraction,
+    extraction_cache_key,
+    get_cached_extraction,
+    names_in_chunk,
+)
+from rag_healthbot_server.utilities.report_chunking import section_chunks
+
+LIPID_PANEL = """LABS:
+Total cholesterol 212 mg/dL
+LDL 138 mg/dL
+HDL 41 mg/dL
+Triglycerides 165 mg/dL"""
+
+VISIT_A = f"""CHIEF COMPLAINT:
+Follow-up of hypertension.
+
+{LIPID_PANEL}
+
+PLAN:
+Continue lisinopril 10 mg daily. Start atorvastatin 20 mg."""
+
+VISIT_B = f"""REASON FOR VISIT:
+Knee pain after a fall; suspected osteoarthritis.
+
+MEDICATIONS:
+Ibuprofen 400 mg as needed.
+
+{LIPID_PANEL}"""
+
+# Whole-document NER names, in the order each report first mentions them.
+NER_A = ["hypertension", "LDL", "lisinopril", "Triglycerides", "atorvastatin"]
+NER_B = ["osteoarthritis", "Ibuprofen", "triglycerides", "ldl"]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(extraction_cache, "redis", fake)
+    monkeypatch.setattr(extraction_cache.settings, "entity_cache_enabled", True)
+    return fake
+
+
+def _keys(text: str, ner_names: list[str]) -> dict[str, str]:
+    return {
+        chunk: extraction_cache_key(
+            model="test-model",
+            system_prompt="extract entities",
+            ner_hints=", ".join(names_in_chunk(ner_names, chunk)),
+            chunk_text=chunk,
+        )
+        for chunk in section_chunks(text, max_tokens=4000)
+    }
+
+
+def test_shared_section_hits_cache_across_documents(fake_redis):
+    keys_a = _keys(VISIT_A, NER_A)
+    for key in keys_a.values():
+        cache_extraction(key, '{"medications": []}')
+
+    keys_b = _keys(VISIT_B, NER_B)
+
+    assert LIPID_PANEL in keys_b
+    assert get_cached_extraction(keys_b[LIPID_PANEL]) == '{"medications": []}'
+    hits = [c for c, k in keys_b.items() if get_cached_extraction(k) is not None]
+    assert hits == [LIPID_PANEL]
+
+
+def test_names_in_chunk_matches_whole_words_only():
+    chunk = "Basal rate unchanged; ASA 81 mg daily."
+
+    assert names_in_chunk(["asa", "ASA", "insulin"], chunk) == ["ASA"]
+    assert names_in_chunk(["sal"], chunk) == []
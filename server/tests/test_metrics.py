@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from rag_healthbot_server.metrics import clear_stale_metrics
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_clear_stale_metrics_keeps_only_running_processes(tmp_path):
+    live, dead = os.getppid(), _dead_pid()
+    for name in (
+        f"counter_{live}.db",
+        f"histogram_{live}.db",
+        f"counter_{dead}.db",
+        f"gauge_livesum_{dead}.db",
+        f"histogram_{os.getpid()}.db",
+        "notes.txt",
+    ):
+        (tmp_path / name).write_bytes(b"")
+
+    clear_stale_metrics(str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"counter_{live}.db",
+        f"histogram_{live}.db",
+        "notes.txt",
+    ]
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rag_healthbot_server.config import settings
+from rag_healthbot_server.utilities import report_dedup
+from rag_healthbot_server.utilities.minhash import (
+    BANDS,
+    NUM_PERM,
+    estimated_similarity,
+    lsh_bands,
+    minhash_signature,
+    numbers_match,
+    shingles,
+)
+
+LAB_PANEL = """
+COMPREHENSIVE METABOLIC PANEL
+Patient: Jane Doe   MRN 0048213   Collected: 03/14/2026 08:15
+Ordering physician: Dr. A. Smith, Internal Medicine
+Test            Result   Units    Reference range
+Sodium          139      mmol/L   135 - 145
+Potassium       4.2      mmol/L   3.5 - 5.1
+Chloride        101      mmol/L   98 - 107
+CO2             25       mmol/L   22 - 29
+BUN             14       mg/dL    7 - 20
+Creatinine      0.9      mg/dL    0.6 - 1.2
+Glucose         96       mg/dL    70 - 99
+Calcium         9.4      mg/dL    8.5 - 10.2
+Total protein   7.0      g/dL     6.0 - 8.3
+Albumin         4.3      g/dL     3.5 - 5.0
+Bilirubin total 0.7      mg/dL    0.1 - 1.2
+ALP             72       U/L      44 - 147
+ALT             22       U/L      7 - 56
+AST             24       U/L      10 - 40
+Comment: All values within reference range. No critical results.
+Specimen received in good condition. Reviewed and released by the laboratory.
+"""
+
+# The same panel on a later visit: new collection date, two changed values.
+NEXT_PANEL = (
+    LAB_PANEL.replace("03/14/2026 08:15", "06/02/2026 08:40")
+    .replace("Glucose         96", "Glucose         104")
+    .replace("Potassium       4.2", "Potassium       4.6")
+)
+
+# A re-scan of the first panel: OCR changed case, spacing and punctuation.
+RESCAN = LAB_PANEL.upper().replace("  ", " ").replace(": ", " ")
+
+
+def test_signature_is_deterministic_and_sized():
+    signature = minhash_signature(LAB_PANEL)
+
+    assert signature == minhash_signature(LAB_PANEL)
+    assert len(signature) == NUM_PERM
+    assert len(lsh_bands(signature)) == BANDS
+    assert minhash_signature("  ...  ") is None
+
+
+def test_shingles_ignore_case_punctuation_and_spacing():
+    assert shingles("Sodium: 139 mmol/L") == shingles("SODIUM   139 mmol L")
+
+
+def test_rescan_is_identical_and_next_panel_is_only_similar():
+    original = minhash_signature(LAB_PANEL)
+
+    assert estimated_similarity(original, minhash_signature(RESCAN)) == 1.0
+    assert 0.7 < estimated_similarity(original, minhash_signature(NEXT_PANEL)) < 1.0
+
+
+def test_numbers_match_tells_rescans_from_new_results():
+    assert numbers_match(LAB_PANEL, RESCAN)
+    assert not numbers_match(LAB_PANEL, NEXT_PANEL)
+
+
+@pytest.fixture
+def stored_panel(monkeypatch):
+    stored = SimpleNamespace(id=7, extracted_text=LAB_PANEL)
+    monkeypatch.setattr(
+        report_dedup,
+        "get_near_duplicate_candidates",
+        lambda bands: [(stored.id, minhash_signature(LAB_PANEL))],
+    )
+    monkeypatch.setattr(report_dedup, "get_report", lambda report_id: stored)
+    return stored
+
+
+def _find(text):
+    return report_dedup.find_near_duplicate_report(minhash_signature(text), text)
+
+
+def test_near_duplicate_matches_a_rescan(monkeypatch, stored_panel):
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0.9)
+
+    assert _find(RESCAN) is stored_panel
+
+
+def test_later_panel_is_not_a_duplicate_even_at_a_low_threshold(
+    monkeypatch, stored_panel
+):
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0.5)
+
+    assert _find(NEXT_PANEL) is None
+
+
+def test_threshold_above_similarity_rejects_the_candidate(monkeypatch, stored_panel):
+    text = LAB_PANEL + "\nAddendum: specimen slightly hemolyzed, repeat advised.\n"
+    similarity = estimated_similarity(
+        minhash_signature(LAB_PANEL), minhash_signature(text)
+    )
+
+    monkeypatch.setattr(settings, "near_duplicate_threshold", similarity)
+    assert _find(text) is stored_panel
+
+    monkeypatch.setattr(settings, "near_duplicate_threshold", similarity + 0.01)
+    assert _find(text) is None
+
+
+def test_zero_threshold_disables_matching(monkeypatch, stored_panel):
+    monkeypatch.setattr(settings, "near_duplicate_threshold", 0)
+
+    assert _find(RESCAN) is None
@@ -0,0 +1,32 @@
+from rag_healthbot_server.utilities.report_chunking import (
+    chunk_report_text,
+    count_tokens,
+)
+
+
+def test_chunks_count_newline_joiners_against_budget():
+    # 24-char lines cost 6 tokens each, but every "\n" joiner adds a char.
+    body = "\n".join(f"line {i:03d} abcdefghijklmno" for i in range(200))
+
+    chunks = chunk_report_text(f"PLAN:\n{body}", max_tokens=400)
+
+    assert len(chunks) > 1
+    assert max(count_tokens(c) for c in chunks) <= 400
+
+
+def test_word_without_spaces_is_hard_split():
+    blob = "A1-" * 2000
+
+    chunks = chunk_report_text(f"FINDINGS:\n{blob}", max_tokens=100)
+
+    assert len(chunks) > 1
+    assert max(count_tokens(c) for c in chunks) <= 100
+    assert "".join(c.removeprefix("FINDINGS:\n") for c in chunks) == blob
+
+
+def test_heading_only_sections_are_dropped():
+    text = "MEDICATIONS:\n\nAssessment: stable angina\n\nFOLLOW-UP:\n"
+
+    chunks = chunk_report_text(text, max_tokens=400)
+
+    assert chunks == ["Assessment:\nstable angina"]
@@ -0,0 +1,130 @@
+import pytest
+
+from rag_healthbot_server.utilities import report_lock
+from rag_healthbot_server.utilities.report_lock import enqueue_or_coalesce
+
+
+class _FakeRedis:
+    """The subset of redis used by the lock: SET NX EX, GET and EXPIRE."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.after_set = None
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode()
+        if self.after_set is not None:
+            hook, self.after_set = self.after_set, None
+            hook()
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def expire(self, key, seconds):
+        return key in self.values
+
+
+class _FakeJob:
+    def __init__(self, jobs, job_id):
+        self.jobs, self.id, self.status = jobs, job_id, None
+
+    def save(self):
+        self.status = "deferred"
+        self.jobs[self.id] = self
+
+    def delete(self):
+        self.jobs.pop(self.id, None)
+
+    def get_status(self):
+        return self.status
+
+
+class _FakeQueue:
+    def __init__(self):
+        self.jobs: dict[str, _FakeJob] = {}
+        self.enqueued: list[str] = []
+        self.before_enqueue = None
+
+    def create_job(self, func, args, job_id, timeout):
+        return _FakeJob(self.jobs, job_id)
+
+    def enqueue_job(self, job):
+        if self.before_enqueue is not None:
+            hook, self.before_enqueue = self.before_enqueue, None
+            hook()
+        job.status = "queued"
+        self.enqueued.append(job.id)
+        return job
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    fake_redis, queue = _FakeRedis(), _FakeQueue()
+
+    def replace(keys, args):
+        if fake_redis.values.get(keys[0]) == args[0].encode():
+            fake_redis.values[keys[0]] = args[1].encode()
+            return 1
+        return 0
+
+    def release(keys, args):
+        if fake_redis.values.get(keys[0]) == args[0].encode():
+            return int(fake_redis.values.pop(keys[0]) is not None)
+        return 0
+
+    class _Job:
+        @staticmethod
+        def fetch(job_id, connection):
+            return queue.jobs[job_id]
+
+    monkeypatch.setattr(report_lock, "redis", fake_redis)
+    monkeypatch.setattr(report_lock, "_REPLACE_LOCK", replace)
+    monkeypatch.setattr(report_lock, "_RELEASE_LOCK", release)
+    monkeypatch.setattr(report_lock, "Job", _Job)
+    return queue
+
+
+def _upload(queue):
+    return enqueue_or_coalesce(queue, print, "payload", "hash", job_timeout=60)
+
+
+def test_concurrent_identical_uploads_share_one_job(queue):
+    results = []
+    # Upload B arrives right after A claimed the lock, before A is enqueued.
+    report_lock.redis.after_set = lambda: results.append(_upload(queue))
+
+    a_id, a_coalesced = _upload(queue)
+
+    assert not a_coalesced
+    assert results == [(a_id, True)]
+    assert queue.enqueued == [a_id]
+    assert list(queue.jobs) == [a_id]
+    assert report_lock.redis.get("lock:report:hash") == a_id.encode()
+
+
+def test_lock_left_by_a_dead_job_is_taken_over(queue):
+    dead_id, _ = _upload(queue)
+    queue.jobs[dead_id].status = "failed"
+
+    job_id, coalesced = _upload(queue)
+
+    assert not coalesced
+    assert job_id != dead_id
+    assert queue.enqueued == [dead_id, job_id]
+    assert report_lock.redis.get("lock:report:hash") == job_id.encode()
+
+
+def test_failed_enqueue_releases_the_lock(queue):
+    def fail():
+        raise ConnectionError("redis down")
+
+    queue.before_enqueue = fail
+
+    with pytest.raises(ConnectionError):
+        _upload(queue)
+
+    assert queue.jobs == {}
+    assert report_lock.redis.get("lock:report:hash") is None
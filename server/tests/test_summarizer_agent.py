@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+
+from rag_healthbot_server.services.agents import summarizer_agent
+from rag_healthbot_server.services.agents.summarizer_agent import _complete_all
+
+
+class _FakeLLM:
+    """``batch`` that fails each prompt in *fail_first* on its first call."""
+
+    def __init__(self, fail_first: tuple[str, ...] = ()):
+        self.fail_first = set(fail_first)
+        self.calls: list[tuple[list[str], int]] = []
+
+    def batch(self, prompts, config, return_exceptions):
+        self.calls.append((list(prompts), config["max_concurrency"]))
+        responses = []
+        for prompt in prompts:
+            if prompt in self.fail_first:
+                self.fail_first.discard(prompt)
+                responses.append(RuntimeError("429 Too Many Requests"))
+            else:
+                responses.append(SimpleNamespace(content=f"summary of {prompt}"))
+        return responses
+
+
+@pytest.fixture(autouse=True)
+def concurrency(monkeypatch):
+    monkeypatch.setattr(summarizer_agent.settings, "summary_max_concurrency", 3)
+
+
+def test_complete_all_caps_concurrency_and_retries_failures():
+    prompts = [f"part {i}" for i in range(10)]
+    llm = _FakeLLM(fail_first=("part 2", "part 7"))
+
+    results = _complete_all(llm, prompts)
+
+    assert results == [f"summary of {p}" for p in prompts]
+    assert llm.calls == [(prompts, 3), (["part 2", "part 7"], 3)]
+
+
+def test_complete_all_raises_when_a_retry_fails():
+    class _AlwaysFails(_FakeLLM):
+        def batch(self, prompts, config, return_exceptions):
+            return [RuntimeError("429 Too Many Requests") for _ in prompts]
+
+    with pytest.raises(RuntimeError, match="1 of 1 summary calls failed"):
+        _complete_all(_AlwaysFails(), ["part 0"])
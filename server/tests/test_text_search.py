@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import create_engine, literal, select
+
+from rag_healthbot_server.utilities.text_search import _tsquery_operand
+
+
+@pytest.fixture(scope="module")
+def conn():
+    # replace() and || are plain SQL; no Postgres needed to check the quoting.
+    with create_engine("sqlite://").connect() as connection:
+        yield connection
+
+
+@pytest.mark.parametrize(
+    "lexeme, operand",
+    [
+        ("metformin", "'metformin'"),
+        ("c:\\temp", "'c:\\\\temp'"),
+        ("o'brien", "'o''brien'"),
+        ("a\\'b", "'a\\\\''b'"),
+    ],
+)
+def test_tsquery_operand_escapes_backslashes_and_quotes(conn, lexeme, operand):
+    assert conn.scalar(select(_tsquery_operand(literal(lexeme)))) == operand